@@ -0,0 +1,655 @@
+"""Benchmarks for the job tracker's data layer.
+
+Run from the repo folder, e.g.:
+
+    python benchmark.py memory --records 100000
+    python benchmark.py import --records 100000
+    python benchmark.py stats --records 100000
+    python benchmark.py history --records 100000
+    python benchmark.py links --records 100000
+    python benchmark.py snapshot --records 1000000
+    python benchmark.py suite --sizes 1000 100000 1000000 --compare old_results.json
+
+`suite` times the everyday operations at each size, with peak memory, and
+saves the numbers to benchmark_results.json (see --output) so runs from
+different versions can be compared.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from tracker_core import (APPLICATION_FIELDS, APPLICATION_SEARCH_FIELDS, Application, CompanyIndex, Contact,
+                          HistoryLog, PipelineStats, RecordStore, SnapshotReader, apply_history_event,
+                          company_key, compute_pipeline_stats, export_records, generate_id,
+                          import_records, load_data, now_stamp, parse_timestamp, read_rows, save_data,
+                          write_rows)
+
+COMPANIES = ["Bentley Systems", "Cisco", "Amazon", "Google", "Microsoft", "Stripe",
+             "Datadog", "Shopify", "Atlassian", "Salesforce", "Intel", "Nvidia"]
+ROLES = ["Software Engineer", "Backend Developer", "Data Scientist", "Product Manager",
+         "QA Engineer", "DevOps Engineer", "Frontend Developer"]
+STATUSES = ["Applied", "Interviewing", "Offer", "Rejected", "Withdrawn"]
+RELATIONSHIPS = ["New Connection", "Had Coffee Chat", "Warm Contact", "Referral Source", "Close Contact"]
+SUITE_SIZES = [1000, 100000, 1000000]
+RESULTS_FILE = "benchmark_results.json"
+NOTE_WORDS = ["recruiter", "called", "follow", "up", "next", "week", "referral", "onsite",
+              "phone", "screen", "team", "remote", "hybrid", "visa", "benefits", "equity"]
+
+
+def synthetic_applications(count, seed=0):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    for record_id in range(1, count + 1):
+        applied = start + timedelta(days=rng.randrange(400))
+        updated = applied + timedelta(days=rng.randrange(60), minutes=rng.randrange(1440))
+        yield {
+            'id': record_id,
+            'company': rng.choice(COMPANIES),
+            'role': rng.choice(ROLES),
+            'salary_range': str(rng.randrange(60, 220) * 1000),
+            'date_applied': applied.strftime("%Y-%m-%d"),
+            'status': rng.choice(STATUSES),
+            'notes': " ".join(rng.choice(NOTE_WORDS) for _ in range(rng.randrange(8))),
+            'last_updated': updated.strftime("%Y-%m-%d %H:%M")
+        }
+
+
+def synthetic_contacts(count, seed=0):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    for record_id in range(1, count + 1):
+        updated = start + timedelta(days=rng.randrange(400), minutes=rng.randrange(1440))
+        yield {
+            'id': record_id,
+            'name': f"Contact {record_id}",
+            'company': rng.choice(COMPANIES),
+            'role': rng.choice(ROLES),
+            'relationship': rng.choice(RELATIONSHIPS),
+            'notes': " ".join(rng.choice(NOTE_WORDS) for _ in range(rng.randrange(8))),
+            'last_updated': updated.strftime("%Y-%m-%d %H:%M")
+        }
+
+
+def traced_bytes(build):
+    """Memory still allocated by the object build() returns."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def bench_memory(count):
+    """Bytes per record as JSON dicts vs the compact record classes."""
+    results = {}
+    for name, generate, record_class in (('applications', synthetic_applications, Application),
+                                         ('contacts', synthetic_contacts, Contact)):
+        # Parse from JSON text so the dicts look like what load_data returns.
+        text = json.dumps(list(generate(count)))
+        dicts, dict_bytes = traced_bytes(lambda: json.loads(text))
+        records, record_bytes = traced_bytes(lambda: [record_class.from_dict(d) for d in json.loads(text)])
+        results[name] = {
+            'records': count,
+            'dict_bytes_per_record': round(dict_bytes / count, 1),
+            'record_bytes_per_record': round(record_bytes / count, 1),
+        }
+        del dicts, records
+    return results
+
+
+def bench_import(count):
+    """Rows/sec for bulk import and export through the JSON backend, per file format."""
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        for fmt in ('csv', 'jsonl'):
+            source = os.path.join(folder, f"source.{fmt}")
+            # Unique roles so every row is new and gets imported.
+            rows = (dict(row, role=f"{row['role']} {row['id']}") for row in synthetic_applications(count))
+            write_rows(source, rows, APPLICATION_FIELDS)
+
+            # Streaming: reading the whole file should only hold one row at a time.
+            tracemalloc.start()
+            for _ in read_rows(source):
+                pass
+            read_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            store = RecordStore(os.path.join(folder, f"applications-{fmt}.json"),
+                                search_fields=APPLICATION_SEARCH_FIELDS, record_class=Application)
+            started = time.perf_counter()
+            summary = import_records(store, source, 'applications')
+            store.close()  # include the journal writes
+            import_seconds = time.perf_counter() - started
+            assert summary['imported'] + summary['duplicates'] == count, summary
+
+            started = time.perf_counter()
+            exported = export_records(store, os.path.join(folder, f"export.{fmt}"), 'applications')
+            export_seconds = time.perf_counter() - started
+
+            results[fmt] = {
+                'rows': count,
+                'imported': summary['imported'],
+                'duplicates': summary['duplicates'],
+                'import_rows_per_sec': round(count / import_seconds),
+                'export_rows_per_sec': round(exported / export_seconds),
+                'read_peak_bytes': read_peak,
+            }
+    return results
+
+
+def bench_stats(count, operations=2000, seed=0):
+    """Check PipelineStats against compute_pipeline_stats through random
+    adds, edits and deletes, and time reading one against the other."""
+    rng = random.Random(seed)
+    now = parse_timestamp("2026-06-01 12:00")
+    with tempfile.TemporaryDirectory() as folder:
+        filename = os.path.join(folder, "applications.json")
+        save_data(filename, list(synthetic_applications(count, seed)))
+        store = RecordStore(filename, record_class=Application)
+
+        started = time.perf_counter()
+        stats = PipelineStats(store)
+        build_seconds = time.perf_counter() - started
+
+        since = {}  # record id -> minute it entered its status, where that isn't last_updated
+        fresh = synthetic_applications(operations, seed + 1)
+        for step in range(operations):
+            record = store[rng.randrange(len(store))]
+            stamp = f"2026-0{rng.randrange(1, 6)}-1{rng.randrange(10)} 0{rng.randrange(10)}:00"
+            action = rng.random()
+            if action < 0.2:
+                store.add(dict(next(fresh), id=store.allocate_id()))
+            elif action < 0.3:
+                since.pop(record['id'], None)
+                store.delete(record['id'])
+            else:
+                changes = {'last_updated': stamp}
+                if action < 0.7:
+                    changes['status'] = rng.choice(STATUSES + ["Ghosted"])
+                else:
+                    changes['salary_range'] = f"{rng.randrange(50, 250)}k"
+                    changes['date_applied'] = f"2025-1{rng.randrange(3)}-0{rng.randrange(1, 10)}"
+                if changes.get('status', record['status']) == record['status']:
+                    # Status kept, so its clock keeps running from before this edit.
+                    since.setdefault(record['id'], parse_timestamp(record['last_updated']))
+                else:
+                    since.pop(record['id'], None)
+                store.update(record['id'], changes)
+            if step % 500 == 0 or step == operations - 1:
+                expected = compute_pipeline_stats(store, since, now)
+                assert stats.summary(now) == expected, f"stats differ from a full recompute after {step + 1} changes"
+
+        started = time.perf_counter()
+        for _ in range(100):
+            stats.summary(now)
+        summary_ms = (time.perf_counter() - started) * 10
+        started = time.perf_counter()
+        compute_pipeline_stats(store, since, now)
+        recompute_ms = (time.perf_counter() - started) * 1000
+        store.close()
+    return {
+        'records': count,
+        'changes_checked': operations,
+        'build_ms': round(build_seconds * 1000, 1),
+        'summary_ms': round(summary_ms, 3),
+        'recompute_ms': round(recompute_ms, 1),
+    }
+
+
+def bench_history(count, changes_per_record=5, queries=20, seed=0):
+    """Time-travel queries on a HistoryLog with checkpoints, checked against
+    replaying the whole log from the start."""
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as folder:
+        filename = os.path.join(folder, "applications.json")
+        save_data(filename, list(synthetic_applications(count, seed)))
+        store = RecordStore(filename, record_class=Application)
+        history = HistoryLog(filename + ".history", store)
+
+        started = time.perf_counter()
+        history.seed()
+        seed_seconds = time.perf_counter() - started
+        first = parse_timestamp("2026-06-01 00:00")
+        last = first
+        events = [(record['id'], {'status': rng.choice(STATUSES)}) for record in store
+                  for _ in range(changes_per_record)]
+        rng.shuffle(events)
+        started = time.perf_counter()
+        for batch_start in range(0, len(events), 1000):
+            last += 1
+            history.record_many(events[batch_start:batch_start + 1000], last)
+        record_seconds = time.perf_counter() - started
+
+        def full_replay(until):
+            state, totals = {}, {}
+            with open(history.filename, 'rb') as f:
+                for line in f:
+                    when, record_id, fields = json.loads(line)
+                    if when > until:
+                        break
+                    apply_history_event(state, totals, when, record_id, fields)
+            return state, totals
+
+        moments = [rng.randrange(first, last + 1) for _ in range(queries)]
+        started = time.perf_counter()
+        history.pipeline_as_of(last)  # the first query writes the checkpoints
+        checkpoint_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        answers = [history.replay(when) for when in moments]
+        query_ms = (time.perf_counter() - started) * 1000 / queries
+        started = time.perf_counter()
+        expected = [full_replay(when) for when in moments[:3]]
+        replay_ms = (time.perf_counter() - started) * 1000 / 3
+        assert answers[:3] == expected, "checkpointed replay differs from a full replay"
+
+        # One record's events, as an application's details show them.
+        lookups = [store[rng.randrange(len(store))]['id'] for _ in range(queries)]
+        started = time.perf_counter()
+        history.events(lookups[0])  # indexes the log
+        index_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        found = [history.events(record_id) for record_id in lookups]
+        events_ms = (time.perf_counter() - started) * 1000 / queries
+        with open(history.filename, 'rb') as f:
+            scanned = [(when, fields) for when, record_id, fields in map(json.loads, f) if record_id == lookups[0]]
+        assert found[0] == scanned, "indexed events differ from a scan of the log"
+        store.close()
+        return {
+            'records': count,
+            'events': len(events) + count,
+            'checkpoints': len(history.checkpoints),
+            'log_bytes': os.path.getsize(history.filename),
+            'checkpoint_bytes': os.path.getsize(history.checkpoint_file),
+            'seed_ms': round(seed_seconds * 1000, 1),
+            'record_events_per_sec': round(len(events) / record_seconds),
+            'first_query_ms': round(checkpoint_seconds * 1000, 1),
+            'as_of_query_ms': round(query_ms, 1),
+            'full_replay_ms': round(replay_ms, 1),
+            'events_index_ms': round(index_seconds * 1000, 1),
+            'record_events_ms': round(events_ms, 3),
+        }
+
+
+def company_spelling(rng, company):
+    """The same company the way people type it: any case, stray spaces."""
+    spelled = rng.choice([company, company.lower(), company.upper(), f"  {company} "])
+    return spelled.replace(" ", "  ") if rng.random() < 0.1 else spelled
+
+
+def bench_links(count, operations=2000, lookups=200, seed=0):
+    """Time a CompanyIndex lookup against a nested scan, after random company
+    edits (test_tracker_core checks the two agree)."""
+    rng = random.Random(seed)
+    aliases = {company_key("AWS"): company_key("Amazon")}
+    with tempfile.TemporaryDirectory() as folder:
+        apps_file, contacts_file = os.path.join(folder, "applications.json"), os.path.join(folder, "contacts.json")
+        save_data(apps_file, [dict(app, company=company_spelling(rng, app['company']))
+                              for app in synthetic_applications(count, seed)])
+        save_data(contacts_file, [dict(contact, company=company_spelling(rng, contact['company']))
+                                  for contact in synthetic_contacts(count // 10 or 1, seed)])
+        app_store = RecordStore(apps_file, record_class=Application)
+        contact_store = RecordStore(contacts_file, record_class=Contact)
+
+        started = time.perf_counter()
+        index = CompanyIndex(app_store, contact_store, aliases)
+        build_seconds = time.perf_counter() - started
+
+        def scan_applications(contact):
+            key = company_key(contact['company'], aliases)
+            return [app for app in app_store if company_key(app['company'], aliases) == key]
+
+        for _ in range(operations):
+            store = app_store if rng.random() < 0.5 else contact_store
+            record = store[rng.randrange(len(store))]
+            action = rng.random()
+            if action < 0.1:
+                store.delete(record['id'])
+            elif action < 0.2:
+                store.add(dict(record.to_dict(), id=store.allocate_id(),
+                               company=company_spelling(rng, rng.choice(COMPANIES + ["AWS", ""]))))
+            else:
+                store.update(record['id'], {'company': company_spelling(rng, rng.choice(COMPANIES + ["AWS"]))})
+
+        contacts = [contact_store[rng.randrange(len(contact_store))] for _ in range(lookups)]
+        started = time.perf_counter()
+        linked = sum(len(index.applications_for(contact)) for contact in contacts)
+        lookup_ms = (time.perf_counter() - started) * 1000 / lookups
+        started = time.perf_counter()
+        scanned = sum(len(scan_applications(contact)) for contact in contacts[:5])
+        scan_ms = (time.perf_counter() - started) * 1000 / 5
+        app_store.close()
+        contact_store.close()
+    return {
+        'applications': len(app_store),
+        'contacts': len(contact_store),
+        'changes': operations,
+        'build_ms': round(build_seconds * 1000, 1),
+        'applications_per_lookup': round(linked / lookups),
+        'lookup_ms': round(lookup_ms, 3),
+        'nested_scan_ms': round(scan_ms, 1),
+    }
+
+
+class StubTcl:
+    """Stands in for the Tcl interpreter behind a widget; every call returns ''."""
+
+    def call(self, *args):
+        return ''
+
+
+class StubTreeview:
+    """The parts of ttk.Treeview that VirtualTreeview uses, without a display."""
+
+    def __init__(self, height=20):
+        self.tk = StubTcl()  # read by ttk.Style(tree)
+        self.options = {'height': height}
+        self.rows = {}
+        self.selected = ()
+        self.idle = []
+
+
+    def configure(self, **options):
+        self.options.update(options)
+
+
+    def cget(self, option):
+        return self.options[option]
+
+
+    def bind(self, *args):
+        pass
+
+
+    def winfo_height(self):
+        return 1
+
+
+    def selection(self):
+        return self.selected
+
+
+    def selection_set(self, items):
+        self.selected = tuple(items)
+
+
+    def get_children(self, item=''):
+        return tuple(self.rows)
+
+
+    def delete(self, *items):
+        for item in items:
+            del self.rows[item]
+
+
+    def insert(self, parent, index, iid=None, values=()):
+        self.rows[str(iid)] = values
+        return str(iid)
+
+
+    def item(self, iid, values=None):
+        self.rows[str(iid)] = values
+
+
+    def exists(self, iid):
+        return str(iid) in self.rows
+
+
+    def yview_moveto(self, fraction):
+        pass
+
+
+    def after_idle(self, callback, *args):
+        self.idle.append((callback, args))
+
+
+    def run_idle(self):
+        while self.idle:
+            callback, args = self.idle.pop(0)
+            callback(*args)
+
+
+class StubScrollbar:
+    def configure(self, **options):
+        pass
+
+
+    def set(self, first, last):
+        pass
+
+
+class StubVar:
+    def __init__(self, value=''):
+        self.value = value
+
+
+    def get(self):
+        return self.value
+
+
+def headless_applications(store):
+    """An object with just enough of JobTrackerApp for its own
+    refresh_applications_list() to run against stub widgets, or None
+    without tkinter."""
+    try:
+        import tracker_gui
+    except ImportError:
+        return None
+
+    class HeadlessApplications:
+        refresh_applications_list = tracker_gui.JobTrackerApp.refresh_applications_list
+        application_filters = tracker_gui.JobTrackerApp.application_filters
+        sort_field = tracker_gui.JobTrackerApp.sort_field
+
+        def __init__(self):
+            self.app_store = store
+            self.app_sort = {'column': None, 'descending': False}
+            self.app_search_var = StubVar()
+            self.status_filter_vars = {}
+            self.date_from_var, self.date_to_var = StubVar(), StubVar()
+            self.salary_min_var, self.salary_max_var = StubVar(), StubVar()
+            self.company_filter_var = StubVar()
+            self.app_tree = StubTreeview()
+            self.app_view = tracker_gui.VirtualTreeview(self.app_tree, StubScrollbar(), tracker_gui.application_row)
+            store.subscribe(self.app_view.record_changed)
+
+    return HeadlessApplications()
+
+
+def measure(run, repeat=1, memory=True):
+    """Time run() (per call, over `repeat` calls), then call it once more
+    under tracemalloc for its peak memory so tracing doesn't skew the time.
+    Returns (step result, first call's return value)."""
+    gc.collect()
+    started = time.perf_counter()
+    result = run()
+    for _ in range(repeat - 1):
+        run()
+    step = {'ms': float(f"{(time.perf_counter() - started) * 1000 / repeat:.4g}")}
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        spare = run()
+        step['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        if hasattr(spare, 'close'):
+            spare.close()  # a second store opened just to be measured
+    return step, result
+
+
+def bench_suite_size(count, folder, memory=True, seed=0):
+    """Every suite step at one data size; files are written to `folder`."""
+    rng = random.Random(seed)
+    apps_file = os.path.join(folder, "applications.json")
+    contacts_file = os.path.join(folder, "contacts.json")
+    snapshot_file = os.path.join(folder, "applications.snap")
+    for path in (apps_file, contacts_file, snapshot_file):
+        for suffix in ("", ".journal", ".meta"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    steps = {}
+    # One list in memory at a time, so 1M records fit.
+    for name, path, generate in (('save_data', apps_file, synthetic_applications),
+                                 ('save_data_contacts', contacts_file, synthetic_contacts)):
+        records = list(generate(count, seed))
+        steps[name], _ = measure(lambda: save_data(path, records), memory=memory)
+        if path == apps_file:
+            steps['save_data_binary'], _ = measure(lambda: save_data(snapshot_file, records), memory=memory)
+        del records
+    steps['load_data'], loaded = measure(lambda: load_data(apps_file), memory=memory)
+    steps['load_data_contacts'], _ = measure(lambda: load_data(contacts_file), memory=memory)
+    steps['load_data_binary'], _ = measure(lambda: load_data(snapshot_file), memory=memory)
+    steps['generate_id'], _ = measure(lambda: generate_id(loaded), memory=memory)
+    del loaded
+
+    steps['open_store'], store = measure(
+        lambda: RecordStore(apps_file, search_fields=APPLICATION_SEARCH_FIELDS, record_class=Application),
+        memory=memory)
+    steps['allocate_id'], _ = measure(lambda: store.allocate_id(), repeat=1000, memory=memory)
+
+    app = headless_applications(store)
+    if app is not None:
+        steps['refresh_applications_list'], _ = measure(app.refresh_applications_list, repeat=5, memory=memory)
+        app.app_sort['column'] = 'company'
+        steps['refresh_sorted_first'], _ = measure(app.refresh_applications_list, memory=False)
+        steps['refresh_sorted'], _ = measure(app.refresh_applications_list, repeat=5, memory=memory)
+        app.app_sort['column'] = None
+        app.app_search_var.value = "engineer remote"
+        steps['refresh_search_first'], _ = measure(app.refresh_applications_list, memory=False)  # builds the index
+        steps['refresh_search'], _ = measure(app.refresh_applications_list, repeat=5, memory=memory)
+        app.app_search_var.value = ""
+        app.refresh_applications_list()
+
+    ids = [store[rng.randrange(len(store))]['id'] for _ in range(1000)]
+    lookups = iter(ids * 3)
+    steps['detail_lookup'], _ = measure(lambda: store.get(next(lookups)), repeat=1000, memory=memory)
+
+    def edit_round_trip():
+        """What pressing Update does: a checked save, written to disk, shown in the list."""
+        record = store.get(rng.choice(ids))
+        base = record.to_dict()
+        store.update(record['id'], {'status': rng.choice(STATUSES), 'last_updated': now_stamp()}, base=base)
+        store.journal.flush()
+        if app is not None:
+            app.app_tree.run_idle()
+
+    steps['edit_round_trip'], _ = measure(edit_round_trip, repeat=20, memory=memory)
+    store.close()
+    steps['files_bytes'] = os.path.getsize(apps_file) + os.path.getsize(contacts_file)
+    steps['snapshot_bytes'] = os.path.getsize(snapshot_file)
+    return steps
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_suite(sizes=SUITE_SIZES, folder=None, memory=True):
+    """Time load_data, save_data, generate_id, the list refresh, a detail
+    lookup and an edit round-trip at each size."""
+    results = {
+        'commit': git_commit(),
+        'date': now_stamp(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'sizes': {},
+    }
+    with tempfile.TemporaryDirectory() as scratch:
+        for count in sizes:
+            results['sizes'][str(count)] = bench_suite_size(count, folder or scratch, memory)
+    return results
+
+
+def compare_results(old, new):
+    """Lines of 'size step old_ms -> new_ms (ratio)' for steps in both runs."""
+    lines = []
+    for size, steps in new['sizes'].items():
+        for name, step in steps.items():
+            before = old.get('sizes', {}).get(size, {}).get(name)
+            if isinstance(step, dict) and isinstance(before, dict) and before['ms']:
+                lines.append(f"{size:>8} {name:<26} {before['ms']:>10.3f} -> {step['ms']:>10.3f} ms "
+                             f"({step['ms'] / before['ms']:.2f}x)")
+    return lines
+
+
+def bench_snapshot(count, lookups=1000, seed=0):
+    """save_data/load_data in JSON vs the binary snapshot format (test_tracker_core
+    checks both round-trip the records exactly)."""
+    rng = random.Random(seed)
+    records = list(synthetic_applications(count, seed))
+    results = {'records': count}
+    with tempfile.TemporaryDirectory() as folder:
+        for name, path in (('json', os.path.join(folder, "applications.json")),
+                           ('binary', os.path.join(folder, "applications.snap"))):
+            gc.collect()
+            started = time.perf_counter()
+            save_data(path, records)
+            save_seconds = time.perf_counter() - started
+            gc.collect()
+            started = time.perf_counter()
+            loaded = load_data(path)
+            load_seconds = time.perf_counter() - started
+            del loaded
+            results[name] = {'save_ms': round(save_seconds * 1000, 1), 'load_ms': round(load_seconds * 1000, 1),
+                             'file_bytes': os.path.getsize(path)}
+
+        wanted = [rng.randrange(count) for _ in range(lookups)]
+        started = time.perf_counter()
+        with SnapshotReader(os.path.join(folder, "applications.snap")) as snapshot:
+            for index in wanted:
+                snapshot[index]
+        results['binary']['record_lookup_ms'] = round((time.perf_counter() - started) * 1000 / lookups, 4)
+    results['save_speedup'] = round(results['json']['save_ms'] / results['binary']['save_ms'], 1)
+    results['load_speedup'] = round(results['json']['load_ms'] / results['binary']['load_ms'], 1)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('benchmark', choices=['memory', 'import', 'stats', 'history', 'links', 'snapshot',
+                                                  'suite'])
+    parser.add_argument('--records', type=int, default=100000)
+    parser.add_argument('--sizes', type=int, nargs='+', default=SUITE_SIZES, help="suite: record counts")
+    parser.add_argument('--folder', help="suite: keep the generated files here instead of a temp folder")
+    parser.add_argument('--no-memory', action='store_true', help="suite: skip the peak memory runs")
+    parser.add_argument('--output', default=RESULTS_FILE, help="suite: where to save the results")
+    parser.add_argument('--compare', metavar='FILE', help="suite: earlier results to compare against")
+    args = parser.parse_args()
+
+    if args.benchmark == 'memory':
+        results = bench_memory(args.records)
+    elif args.benchmark == 'import':
+        results = bench_import(args.records)
+    elif args.benchmark == 'stats':
+        results = bench_stats(args.records)
+    elif args.benchmark == 'history':
+        results = bench_history(args.records)
+    elif args.benchmark == 'links':
+        results = bench_links(args.records)
+    elif args.benchmark == 'snapshot':
+        results = bench_snapshot(args.records)
+    elif args.benchmark == 'suite':
+        results = bench_suite(args.sizes, args.folder, not args.no_memory)
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        if args.compare:
+            with open(args.compare) as f:
+                print("\n".join(compare_results(json.load(f), results)))
+            return
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,584 @@
+"""Tests for tracker_core. Run with `python -m pytest`.
+
+Two RecordStores on the same file stand in for two processes: each has its
+own JournalStore, with its own token and its own lock on the shared files.
+"""
+import os
+import queue
+import random
+import threading
+
+import pytest
+
+from tracker_core import (APPLICATIONS_FILE, CONVERTED_SUFFIX, SNAPSHOT_BLOCK, SNAPSHOT_SUFFIX, Application,
+                          CompanyIndex, Contact, HistoryLog, PipelineStats, RecordStore, SnapshotReader,
+                          UpdateConflict, adopt_snapshot, company_key, compute_pipeline_stats, convert_snapshot,
+                          load_data, merge_changes, new_application, new_contact, open_stores, parse_timestamp,
+                          pipeline_stats, save_data)
+
+STATUSES = ["Applied", "Interview", "Offer", "Rejected", "Withdrawn", "Ghosted", ""]
+
+
+def open_store(path):
+    return RecordStore(str(path), record_class=Application)
+
+
+def add(store, company, **values):
+    record = new_application(store.allocate_id(), dict(values, company=company, role="Engineer"))
+    return store.add(record)
+
+
+def open_backend(tmp_path, monkeypatch, backend):
+    """(applications, contacts) stores on the JSON or SQLite backend."""
+    if backend == 'sqlite':
+        monkeypatch.chdir(tmp_path)
+        return open_stores('sqlite')
+    return (open_store(tmp_path / "applications.json"),
+            RecordStore(str(tmp_path / "contacts.json"), record_class=Contact))
+
+
+def close_backend(apps, contacts):
+    apps.close()
+    contacts.close()
+    if hasattr(apps, 'conn'):
+        apps.conn.close()
+
+
+def saved(path):
+    """{id: record} as another process opening the files would see them."""
+    return {record['id']: record for record in load_data(str(path))}
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "applications.json"
+
+
+@pytest.mark.parametrize('values', [
+    {'date_applied': "2026-02-09", 'last_updated': "2026-02-09 17:24"},
+    {'date_applied': "2026-2-9", 'last_updated': "2026-02-09T17:24"},  # not the app's format
+    {'date_applied': "2026-02-30", 'last_updated': "2026-02-09 17:24:05"},
+    {'date_applied': "", 'last_updated': "soon"},
+    {'date_applied': 5, 'last_updated': 7},  # ints that aren't packed values
+    {'date_applied': None, 'last_updated': 2.5},
+    {'date_applied': True, 'last_updated': [2026, 2, 9]},
+])
+def test_record_round_trips_exactly(values):
+    data = dict(new_application(1, {'company': "Acme", 'role': "Engineer"}), **values)
+    record = Application.from_dict(data)
+    assert record.to_dict() == data
+    assert [type(record[field]) for field in data] == [type(value) for value in data.values()]
+    assert Application(data) == data
+
+    edited = Application.from_dict(new_application(2, {'company': "Acme", 'role': "Engineer"}))
+    edited.update(values)
+    assert {field: edited[field] for field in values} == values
+
+
+def test_record_keeps_missing_and_extra_fields():
+    data = {'id': 1, 'company': "Acme", 'date_applied': "2026-02-09", 'recruiter': {'name': "Sam"}}
+    record = Application.from_dict(data)
+    assert record.to_dict() == data
+    assert 'status' not in record and record.get('status') is None
+    with pytest.raises(KeyError):
+        record['status']
+
+
+def test_journal_replay(path):
+    store = open_store(path)
+    for company in ("Acme", "Globex", "Initech"):
+        add(store, company)
+    store.update(2, {'status': 'Interview'})
+    store.delete(3)
+    store.close()
+
+    records = saved(path)
+    assert sorted(records) == [1, 2]
+    assert records[2]['status'] == 'Interview'
+    assert records[2]['version'] == 2
+    assert open_store(path).next_id == 4  # the deleted id isn't handed out again
+
+
+def test_refresh_reads_other_process_entries(path):
+    mine, theirs = open_store(path), open_store(path)
+    add(theirs, "Acme")
+    add(theirs, "Globex")
+    theirs.journal.flush()
+
+    events = []
+    mine.subscribe(lambda event, record: events.append((event, record and record['id'])))
+    assert mine.refresh()
+    assert [record['company'] for record in mine] == ["Acme", "Globex"]
+
+    theirs.update(1, {'status': 'Offer'})
+    theirs.delete(2)
+    theirs.journal.flush()
+    assert mine.refresh()
+    assert mine.get(1)['status'] == 'Offer'
+    assert mine.get(2) is None
+    assert events == [('insert', 1), ('insert', 2), ('update', 1), ('delete', 2)]
+    assert not mine.refresh()  # nothing new, and our own entries are skipped
+    mine.close()
+    theirs.close()
+
+
+def test_merge_changes_merges_different_fields():
+    base = {'id': 1, 'version': 0, 'status': 'Applied', 'notes': ''}
+    current = dict(base, version=1, notes='called back')
+    assert merge_changes(current, {'status': 'Interview', 'notes': ''}, base) == {'status': 'Interview'}
+    # Nobody else saved: the changes go through as they are.
+    assert merge_changes(base, {'status': 'Interview', 'notes': ''}, base) == {'status': 'Interview', 'notes': ''}
+
+
+def test_merge_changes_conflict_on_same_field():
+    base = {'id': 1, 'version': 0, 'status': 'Applied'}
+    current = dict(base, version=1, status='Rejected')
+    with pytest.raises(UpdateConflict) as caught:
+        merge_changes(current, {'status': 'Interview'}, base)
+    assert caught.value.fields == ['status']
+    assert caught.value.current is current
+    # Both sides picked the same value: no conflict.
+    assert merge_changes(current, {'status': 'Rejected'}, base) == {'status': 'Rejected'}
+
+
+def test_update_merges_edits_to_different_fields(path):
+    mine, theirs = open_store(path), open_store(path)
+    add(mine, "Acme")
+    mine.journal.flush()
+    theirs.refresh()
+
+    base = mine.get(1).to_dict()
+    their_events = []
+    theirs.subscribe(lambda event, record: their_events.append(event))
+    theirs.update(1, {'notes': 'called back'}, base=theirs.get(1).to_dict())
+    mine.update(1, {'status': 'Interview'}, base=base)
+    mine.close()
+    theirs.close()
+
+    record = saved(path)[1]
+    assert (record['status'], record['notes'], record['version']) == ('Interview', 'called back', 3)
+
+
+def test_update_conflict_on_same_field(path):
+    mine, theirs = open_store(path), open_store(path)
+    add(mine, "Acme")
+    mine.journal.flush()
+    theirs.refresh()
+
+    base = mine.get(1).to_dict()
+    theirs.update(1, {'status': 'Rejected'}, base=theirs.get(1).to_dict())
+    with pytest.raises(UpdateConflict) as caught:
+        mine.update(1, {'status': 'Offer'}, base=base)
+    assert caught.value.fields == ['status']
+    assert mine.get(1)['status'] == 'Rejected'  # their save was read in, ours wasn't applied
+    mine.close()
+    theirs.close()
+    assert saved(path)[1]['status'] == 'Rejected'
+
+
+def test_update_of_record_deleted_elsewhere(path):
+    mine, theirs = open_store(path), open_store(path)
+    add(mine, "Acme")
+    mine.journal.flush()
+    theirs.refresh()
+
+    base = mine.get(1).to_dict()
+    theirs.delete(1)
+    theirs.journal.flush()
+    with pytest.raises(UpdateConflict) as caught:
+        mine.update(1, {'status': 'Offer'}, base=base)
+    assert caught.value.current is None
+    assert mine.get(1) is None
+    mine.close()
+    theirs.close()
+    assert saved(path) == {}
+
+
+def test_refresh_after_other_process_compacts(path):
+    mine, theirs = open_store(path), open_store(path)
+    theirs.journal.compact_threshold = 4  # counting our entry they read
+    add(mine, "Acme")
+    mine.journal.flush()
+    theirs.refresh()
+
+    for company in ("Globex", "Initech", "Umbrella"):
+        add(theirs, company)
+    theirs.journal.flush()
+    theirs.journal.finish_compaction()  # the third save compacted the journal away
+    assert not path.with_name(path.name + ".journal").exists()
+
+    events = []
+    mine.subscribe(lambda event, record: events.append(event))
+    assert mine.refresh()
+    assert events == ['reload']
+    assert sorted(record['company'] for record in mine) == ["Acme", "Globex", "Initech", "Umbrella"]
+    add(mine, "Hooli")
+    assert mine.get(5)['company'] == "Hooli"
+    mine.close()
+    theirs.close()
+    assert len(saved(path)) == 5
+
+
+def test_compaction_keeps_other_process_entries(path):
+    mine, theirs = open_store(path), open_store(path)
+    mine.journal.compact_threshold = 4
+    add(mine, "Acme")
+    add(theirs, "Globex")
+    add(mine, "Initech")
+    theirs.update(2, {'status': 'Offer'})
+    theirs.journal.flush()
+    add(mine, "Umbrella")
+    add(mine, "Hooli")  # compacts, with their entries still unread by us
+    mine.journal.flush()
+    mine.journal.finish_compaction()
+
+    records = saved(path)
+    assert sorted(records) == [1, 2, 3, 4, 5]
+    assert records[2]['status'] == 'Offer'
+    # Their entries went into the snapshot; we still get told about them.
+    assert mine.refresh()
+    assert mine.get(2)['status'] == 'Offer'
+    add(theirs, "Wayne")  # goes into the journal started after the compaction
+    theirs.journal.flush()
+    mine.refresh()
+    assert mine.get(6)['company'] == "Wayne"
+    mine.close()
+    theirs.close()
+    assert len(saved(path)) == 6
+
+
+def test_saves_and_checked_updates_run_during_compaction(path):
+    mine, theirs = open_store(path), open_store(path)
+    mine.journal.compact_threshold = 3
+    add(mine, "Acme")
+    mine.journal.flush()
+    theirs.refresh()
+
+    # Hold the compaction after it has moved the journal aside, while it
+    # rebuilds the snapshot without the lock.
+    rebuilding, release = threading.Event(), threading.Event()
+    replay = mine.journal._replay
+
+    def held_replay(loaded, changes):
+        if threading.current_thread() is mine.journal.compactor:
+            rebuilding.set()
+            release.wait(5)
+        return replay(loaded, changes)
+
+    mine.journal._replay = held_replay
+    add(mine, "Globex")
+    add(mine, "Initech")
+    assert rebuilding.wait(5)
+
+    record_id = mine.allocate_id()
+    mine.add(new_application(record_id, {'company': "Umbrella", 'role': "Engineer"}))
+    mine.update(1, {'status': 'Offer'}, base=mine.get(1).to_dict())
+    their_events = []
+    theirs.subscribe(lambda event, record: their_events.append(event))
+    theirs.update(1, {'notes': 'called back'}, base=theirs.get(1).to_dict())
+    assert sorted(record['company'] for record in theirs) == ["Acme", "Globex", "Initech", "Umbrella"]
+    assert mine.journal.compacting  # none of that waited for it
+    assert 'reload' not in their_events  # they read on into the moved journal
+
+    release.set()
+    mine.journal.finish_compaction()
+    assert not path.with_name(path.name + ".journal.old").exists()
+    events = []
+    mine.subscribe(lambda event, record: events.append(event))
+    mine.refresh()
+    assert 'reload' not in events  # the snapshot it swapped in matches what it has
+    assert (mine.get(1)['status'], mine.get(1)['notes']) == ('Offer', 'called back')
+    mine.close()
+    theirs.close()
+    records = saved(path)
+    assert sorted(records) == [1, 2, 3, 4]
+    assert (records[1]['status'], records[1]['notes'], records[1]['version']) == ('Offer', 'called back', 3)
+
+
+def random_stamp(rng):
+    return f"2026-0{rng.randrange(1, 6)}-1{rng.randrange(10)} 0{rng.randrange(10)}:{rng.randrange(60):02d}"
+
+
+def random_application(rng):
+    return {'status': rng.choice(STATUSES),
+            'date_applied': rng.choice([f"2025-1{rng.randrange(3)}-0{rng.randrange(1, 10)}", "", "soon"]),
+            'salary_range': rng.choice([f"${rng.randrange(50, 250)}k", str(rng.randrange(40000, 250000)), "", "DOE"]),
+            'last_updated': rng.choice([random_stamp(rng), "yesterday"])}
+
+
+@pytest.mark.parametrize('backend', ['json', 'sqlite'])
+@pytest.mark.parametrize('seed', range(3))
+def test_pipeline_stats_match_full_recompute(tmp_path, monkeypatch, backend, seed):
+    rng = random.Random(seed)
+    now = parse_timestamp("2026-06-01 12:00")
+    store, contacts = open_backend(tmp_path, monkeypatch, backend)
+    for _ in range(50):
+        add(store, rng.choice(["Acme", "Globex"]), **random_application(rng))
+    stats = pipeline_stats(store)
+
+    since = {}  # record id -> minute it entered its status, where that isn't last_updated
+    for step in range(500):
+        action = rng.random()
+        if action < 0.25 or not len(store):
+            add(store, "Initech", **random_application(rng))
+            continue
+        record = store[rng.randrange(len(store))]
+        if action < 0.4:
+            since.pop(record['id'], None)
+            store.delete(record['id'])
+        else:
+            changes = {'last_updated': random_stamp(rng)}
+            if action < 0.7:
+                changes['status'] = rng.choice(STATUSES)
+            else:
+                changes.update(random_application(rng))
+                changes['status'] = record['status']
+            if changes['status'] == record['status']:
+                # Status kept, so its clock keeps running from before this edit
+                # (from this edit, if the record's last_updated wasn't a time).
+                if since.get(record['id']) is None:
+                    since[record['id']] = parse_timestamp(record['last_updated'])
+            else:
+                since.pop(record['id'], None)
+            store.update(record['id'], changes)
+        if step % 25 == 0:
+            assert stats.summary(now) == compute_pipeline_stats(store, since, now), f"after {step + 1} changes"
+    assert stats.summary(now) == compute_pipeline_stats(store, since, now)
+
+    if backend == 'json':
+        assert isinstance(stats, PipelineStats)
+        store.reload()  # a rebuild starts every clock from last_updated again
+        assert stats.summary(now) == compute_pipeline_stats(store, {}, now)
+        close_backend(store, contacts)
+    else:
+        close_backend(store, contacts)
+        store, contacts = open_stores('sqlite')  # the clocks are stored, so they carry on
+        assert pipeline_stats(store).summary(now) == compute_pipeline_stats(store, since, now)
+        close_backend(store, contacts)
+
+
+def test_history_is_not_seeded_from_a_partly_loaded_store(path):
+    save_data(str(path), [new_application(record_id, {'company': "Acme", 'role': "Engineer"})
+                          for record_id in range(1, 1001)])
+    store = RecordStore(str(path), lazy=True, record_class=Application)
+    store.history = HistoryLog(str(path) + ".history", store)
+    # What start_loading's reader thread does, a page at a time.
+    store.pages = queue.Queue()
+    pages = store.journal.iter_load()
+    store.pages.put(store.convert(next(pages)))
+    store.load_pending()
+    assert store.loading and len(store) == 100
+    with pytest.raises(RuntimeError):
+        store.update(1, {'status': 'Offer'})
+    assert store.get(1)['status'] == 'Applied'
+
+    for page in pages:
+        store.pages.put(store.convert(page))
+    store.pages.put(None)
+    assert store.load_pending()
+    store.update(1, {'status': 'Offer'})
+    statuses = store.history.statuses_as_of(parse_timestamp("2100-01-01"))
+    assert len(statuses) == 1000
+    assert statuses[1] == 'Offer'
+    store.close()
+
+
+def test_history_seeding_on_a_thread_holds_back_changes(path):
+    store = open_store(path)
+    for company in ("Acme", "Globex"):
+        add(store, company, last_updated="2026-03-01 09:00")
+    store.history = HistoryLog(str(path) + ".history", store)
+    with store.history.lock:  # keeps the seeding thread from finishing
+        store.history.start_seeding()
+        store.update(1, {'status': 'Offer', 'last_updated': "2026-03-05 09:00"})
+        add(store, "Initech")
+        assert store.history.seeder.is_alive()  # and logging didn't wait for it
+    store.history.seeder.join()
+
+    assert [fields.get('status') for when, fields in store.history.events(1)] == ['Applied', 'Offer']
+    assert store.history.events(3)[0][1]['company'] == "Initech"
+    assert len(store.history.statuses_as_of(parse_timestamp("2100-01-01"))) == 3
+    store.close()
+
+
+def test_history_events_follow_appends(path):
+    store = open_store(path)
+    add(store, "Acme", last_updated="2026-03-01 09:00")
+    add(store, "Globex", last_updated="2026-03-01 09:00")
+    history = HistoryLog(str(path) + ".history", store)  # seeded with both, as of last_updated
+    history.record(1, {'status': 'Interview'}, when=parse_timestamp("2026-03-05 09:00"))
+    assert [fields.get('status') for when, fields in history.events(1)] == ['Applied', 'Interview']
+
+    # Appended after the index was built, by this process and by another one.
+    history.record(2, {'notes': 'called'}, when=parse_timestamp("2026-03-06 09:00"))
+    other = HistoryLog(history.filename, store)
+    other.seeded = True
+    other.record(1, {'status': 'Offer'}, when=parse_timestamp("2026-03-10 09:00"))
+    other.record(1, None, when=parse_timestamp("2026-03-12 09:00"))
+    assert [fields for when, fields in history.events(2)][1:] == [{'notes': 'called'}]
+    assert history.status_periods(1) == [
+        ('Applied', parse_timestamp("2026-03-01 09:00"), parse_timestamp("2026-03-05 09:00")),
+        ('Interview', parse_timestamp("2026-03-05 09:00"), parse_timestamp("2026-03-10 09:00")),
+        ('Offer', parse_timestamp("2026-03-10 09:00"), parse_timestamp("2026-03-12 09:00")),
+    ]
+    assert history.events(3) == []
+    store.close()
+
+
+def odd_records(count, seed=0):
+    """Applications with fields missing, extra fields and values of every JSON type."""
+    rng = random.Random(seed)
+    records = []
+    for record_id in range(1, count + 1):
+        record = new_application(record_id, {'company': rng.choice(["Acme", "Globex", "Ünïcode ☃"]), 'role': "Engineer"})
+        record.update(random_application(rng))
+        for field in rng.sample(list(record)[1:], rng.randrange(3)):
+            del record[field]
+        if rng.random() < 0.3:
+            record[rng.choice(['recruiter', 'links', 'score'])] = rng.choice(
+                [{'name': "Sam", 'tags': [1, None]}, ["a", 2.5], 7, None, True])
+        if rng.random() < 0.2:
+            record['date_applied'] = rng.choice([5, None, 2.5, ""])
+        records.append(record)
+    return records
+
+
+@pytest.mark.parametrize('suffix', [".json", SNAPSHOT_SUFFIX])
+def test_snapshot_round_trips_records(tmp_path, suffix):
+    records = odd_records(SNAPSHOT_BLOCK * 2 + 17)
+    path = str(tmp_path / ("applications" + suffix))
+    save_data(path, records)
+    assert load_data(path) == records
+    if suffix == SNAPSHOT_SUFFIX:
+        with SnapshotReader(path) as snapshot:
+            assert len(snapshot) == len(records)
+            for index in (0, SNAPSHOT_BLOCK - 1, SNAPSHOT_BLOCK, len(records) - 1):
+                assert snapshot[index] == records[index]
+
+
+def test_convert_snapshot_both_ways(tmp_path):
+    json_file, snap_file = str(tmp_path / "applications.json"), str(tmp_path / "applications.snap")
+    records = odd_records(300, seed=1)
+    save_data(json_file, records)
+    store = RecordStore(json_file)  # plain dicts, so the odd records are journaled as they are
+    store.delete(3)
+    store.update(4, {'status': 'Offer', 'extra_field': [1, 2]})
+    added = store.add(dict(records[0], id=store.allocate_id()))
+    store.allocate_id()  # handed out, never saved
+    store.close()
+    expected = saved(json_file)
+
+    assert convert_snapshot(json_file, snap_file) == len(expected)
+    assert {record['id']: record for record in load_data(snap_file)} == expected
+    os.remove(json_file)
+    assert convert_snapshot(snap_file, json_file) == len(expected)
+    assert load_data(json_file) == load_data(snap_file)
+    assert not os.path.exists(json_file + ".journal")  # the old journal doesn't replay over it
+    store = RecordStore(json_file)
+    assert store.allocate_id() == added['id'] + 2  # the id counter came along both times
+    store.close()
+
+
+def test_switching_snapshot_format_moves_the_old_files_aside(tmp_path):
+    json_file, snap_file = str(tmp_path / "applications.json"), str(tmp_path / "applications.snap")
+    save_data(json_file, odd_records(50, seed=2))
+    store = RecordStore(json_file)
+    store.update(4, {'status': 'Offer'})
+    store.close()
+    expected = saved(json_file)
+
+    adopt_snapshot(snap_file, json_file)
+    assert {record['id']: record for record in load_data(snap_file)} == expected
+    assert not os.path.exists(json_file) and not os.path.exists(json_file + ".journal")
+    assert os.path.exists(json_file + CONVERTED_SUFFIX)
+
+    store = RecordStore(snap_file)
+    store.update(5, {'status': 'Rejected'})
+    store.close()
+    expected = saved(snap_file)
+    adopt_snapshot(json_file, snap_file)  # switched back: the changes made since come along
+    assert saved(json_file) == expected
+    assert os.path.exists(snap_file + CONVERTED_SUFFIX)
+
+    # Both formats on disk and the one not in use was changed last: refuse
+    # rather than open the stale side.
+    convert_snapshot(json_file, snap_file)
+    store = RecordStore(snap_file)
+    store.update(6, {'status': 'Offer'})
+    store.close()
+    os.utime(snap_file + ".journal", (os.path.getmtime(json_file) + 10,) * 2)
+    with pytest.raises(ValueError, match="newer changes"):
+        adopt_snapshot(json_file, snap_file)
+    adopt_snapshot(snap_file, json_file)  # the other way round is fine
+
+
+COMPANY_SPELLINGS = ["Amazon", "  amazon ", "AWS", "aws", "Acme  Corp", "ACME corp", "Globex", ""]
+
+
+def linked_by_scan(store, company, aliases):
+    key = company_key(company, aliases)
+    return [record['id'] for record in store if key and company_key(record['company'], aliases) == key]
+
+
+@pytest.mark.parametrize('backend', ['json', 'sqlite'])
+def test_company_index_matches_a_scan(tmp_path, monkeypatch, backend):
+    rng = random.Random(0)
+    aliases = {company_key("AWS"): company_key("Amazon")}
+    apps, contacts = open_backend(tmp_path, monkeypatch, backend)
+    for _ in range(40):
+        add(apps, rng.choice(COMPANY_SPELLINGS))
+        contacts.add(new_contact(contacts.allocate_id(), {'name': "Sam", 'company': rng.choice(COMPANY_SPELLINGS)}))
+    index = CompanyIndex(apps, contacts, aliases)
+
+    for step in range(300):
+        store = rng.choice([apps, contacts])
+        record = store[rng.randrange(len(store))]
+        action = rng.random()
+        if action < 0.15:
+            store.delete(record['id'])
+        elif action < 0.3:
+            store.add(dict(record, id=store.allocate_id(), company=rng.choice(COMPANY_SPELLINGS)))
+        else:
+            store.update(record['id'], {'company': rng.choice(COMPANY_SPELLINGS)})
+        if step == 150 and backend == 'json':
+            contacts.reload()
+        for company in COMPANY_SPELLINGS:
+            probe = {'company': company}
+            assert [c['id'] for c in index.contacts_for(probe)] == linked_by_scan(contacts, company, aliases)
+            assert [a['id'] for a in index.applications_for(probe)] == linked_by_scan(apps, company, aliases)
+    # The alias joins the two spellings into one company.
+    assert index.contacts_for({'company': "aws"}) == index.contacts_for({'company': "AMAZON"})
+    index.close()
+    close_backend(apps, contacts)
+
+
+def test_sqlite_migration_runs_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    save_data(APPLICATIONS_FILE, [new_application(record_id, {'company': "Acme", 'role': "Engineer"})
+                                  for record_id in (1, 2)])
+    apps, contacts = open_stores('sqlite')
+    assert [record['id'] for record in apps] == [1, 2]
+    record_id = apps.allocate_id()
+    apps.add(new_application(record_id, {'company': "Globex", 'role': "Engineer"}))
+    for record in list(apps):
+        apps.delete(record['id'])
+    apps.conn.close()
+
+    apps, contacts = open_stores('sqlite')
+    assert len(apps) == 0  # the JSON records don't come back
+    assert apps.allocate_id() == record_id + 1  # and no id is handed out twice
+    apps.conn.close()
+
+
+def test_sqlite_date_bounds_match_json(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    apps, contacts = open_stores('sqlite')
+    store = open_store(tmp_path / "other.json")
+    for date_applied in ("2025-12-01", "2026-01-10"):
+        for target in (apps, store):
+            add(target, "Acme", date_applied=date_applied, last_updated=f"{date_applied} 09:00")
+    for filters in ([('date_applied', '>=', "20260105")], [('date_applied', '<=', "20251231")],
+                    [('last_updated', '>=', "2026-01-10")], [('last_updated', '<=', "20251201 09:00")]):
+        assert [record['id'] for record in apps.query(filters)] == [record['id'] for record in store.query(filters)]
+    apps.conn.close()
+    store.close()
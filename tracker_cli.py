@@ -0,0 +1,299 @@
+"""Job Tracker command line.
+
+    python job_tracker.py                                   open the window
+    python job_tracker.py add applications company=Acme role="QA Engineer"
+    python job_tracker.py update applications 12 status=Offer
+    python job_tracker.py list contacts --limit 20
+    python job_tracker.py query applications --where status = Offer --sort date_applied --desc
+    python job_tracker.py stats
+    python job_tracker.py history --as-of 2026-03-01
+    python job_tracker.py history --id 12
+    python job_tracker.py import applications jobs.csv
+    python job_tracker.py export contacts contacts.jsonl
+    python job_tracker.py convert applications.json applications.snap
+
+Add --sqlite before the command to use the SQLite database. Only the window
+needs tkinter, and it is imported only when the window is opened.
+
+Set JOB_TRACKER_SNAPSHOT=binary to keep the records in compact .snap files
+instead of JSON. Switching either way converts the files the first time and
+renames the old ones to *.converted; `convert` does it by hand.
+
+Add --profile (or set JOB_TRACKER_PROFILE=1) to record timings: a command
+prints them to stderr when it finishes, and in the window Ctrl+Shift+D
+shows them live.
+"""
+import argparse
+import json
+import os
+import sys
+
+from tracker_core import (BACKEND, RECORD_KINDS, SNAPSHOT_SUFFIX, UpdateConflict, convert_snapshot,
+                          export_records, field_text, import_records, instruments, now_stamp, open_stores,
+                          parse_timestamp, unpack_timestamp)
+
+FILTER_OPS = ('=', 'in', '>=', '<=', 'like')
+INTEGER_FIELDS = ('id', 'version')  # stored as ints, so compared as ints
+
+
+class CommandError(Exception):
+    """A problem with what was asked for, reported without a traceback."""
+
+
+def parse_assignments(pairs, fields):
+    """['company=Acme', 'role=QA'] -> {'company': 'Acme', 'role': 'QA'}."""
+    values = {}
+    for pair in pairs:
+        field, sep, value = pair.partition('=')
+        if not sep:
+            raise CommandError(f"Expected field=value, got '{pair}'")
+        editable = [name for name in fields if name not in ('id', 'version')]
+        if field not in editable:
+            raise CommandError(f"Unknown field '{field}' - choose from {', '.join(editable)}")
+        values[field] = value
+    return values
+
+
+def parse_filters(where, fields):
+    """--where triples -> (field, op, value) filters; 'in' takes a comma-separated list.
+    Values for id and version are turned into ints to match the stored ones."""
+    filters = []
+    for field, op, value in where or ():
+        if field not in fields:
+            raise CommandError(f"Unknown field '{field}'")
+        if op not in FILTER_OPS:
+            raise CommandError(f"Unknown operator '{op}' - choose from {', '.join(FILTER_OPS)}")
+        if op == 'in':
+            value = tuple(part.strip() for part in value.split(','))
+        if field in INTEGER_FIELDS and op != 'like':
+            try:
+                value = tuple(map(int, value)) if op == 'in' else int(value)
+            except ValueError:
+                raise CommandError(f"'{field}' takes whole numbers, got '{value}'") from None
+        filters.append((field, op, value))
+    return filters
+
+
+def print_records(records, fields, as_json, limit=None):
+    count = 0
+    if not as_json:
+        print("\t".join(fields))
+    for record in records:
+        if limit is not None and count >= limit:
+            break
+        if as_json:
+            print(json.dumps({field: record.get(field, '') for field in fields}))
+        else:
+            print("\t".join(str(record.get(field, '')).replace("\t", " ").replace("\n", " ")
+                            for field in fields))
+        count += 1
+    return count
+
+
+def command_add(store, args):
+    fields, build, errors_for, key_for = RECORD_KINDS[args.kind]
+    values = parse_assignments(args.values, fields)
+    errors = errors_for(values)
+    if errors:
+        raise CommandError("; ".join(errors))
+    record = store.add(build(store.allocate_id(), values))
+    print(record['id'])
+
+
+def command_update(store, args):
+    fields, build, errors_for, key_for = RECORD_KINDS[args.kind]
+    changes = parse_assignments(args.values, fields)
+    record = store.get(args.id)
+    if record is None:
+        raise CommandError(f"No {args.kind[:-1]} with id {args.id}")
+    base = {field: record[field] for field in record.keys()}  # so saves by the window since load aren't lost
+    changes = {field: field_text(changes, field) for field in changes}
+    merged = {field: record.get(field, '') for field in fields}
+    merged.update(changes)
+    errors = errors_for(merged)
+    if errors:
+        raise CommandError("; ".join(errors))
+    changes['last_updated'] = now_stamp()
+    try:
+        store.update(args.id, changes, base=base)
+    except UpdateConflict as conflict:
+        raise CommandError(f"Not saved: {conflict}") from None
+
+
+def command_query(store, args):
+    fields = RECORD_KINDS[args.kind][0]
+    if args.sort and args.sort not in fields:
+        raise CommandError(f"Unknown field '{args.sort}'")
+    records = store.query(parse_filters(args.where, fields), args.sort, args.desc, args.search)
+    print_records(records, fields, args.json, args.limit)
+
+
+def command_stats(stores, args):
+    app_store, contact_store = stores
+    statuses = {}
+    for record in app_store:
+        statuses[record['status']] = statuses.get(record['status'], 0) + 1
+    print(json.dumps({
+        'backend': args.backend,
+        'applications': len(app_store),
+        'contacts': len(contact_store),
+        'applications_by_status': dict(sorted(statuses.items(), key=lambda item: -item[1])),
+    }, indent=2))
+
+
+def command_history(stores, args):
+    """Status history: one application's periods, the pipeline as of a date,
+    or the time spent in each status so far."""
+    history = stores[0].history
+    now = parse_timestamp(now_stamp())
+    if args.id is not None:
+        if not history.events(args.id):
+            raise CommandError(f"No history for application {args.id}")
+        result = [{'status': status, 'from': unpack_timestamp(start),
+                   'to': unpack_timestamp(end) if end is not None else None,
+                   'days': round(((now if end is None else end) - start) / 1440, 1)}
+                  for status, start, end in history.status_periods(args.id)]
+    elif args.as_of is not None:
+        when = parse_timestamp(args.as_of)
+        if when is None:
+            raise CommandError(f"Expected a date like 2026-03-01, got '{args.as_of}'")
+        if len(args.as_of.strip()) == 10:
+            when += 1439  # a bare date means the end of that day
+        counts = history.pipeline_as_of(when)
+        result = {'as_of': unpack_timestamp(when), 'applications': sum(counts.values()),
+                  'applications_by_status': dict(sorted(counts.items(), key=lambda item: -item[1]))}
+    else:
+        result = {status: {'total_days': round(minutes / 1440, 1), 'times_entered': entered,
+                           'average_days': round(minutes / 1440 / entered, 1) if entered else None}
+                  for status, (minutes, entered) in sorted(history.time_in_status(now).items())}
+    print(json.dumps(result, indent=2))
+
+
+def command_import(store, args):
+    summary = import_records(store, args.path, args.kind)
+    print(f"Imported {summary['imported']:,} {args.kind} "
+          f"({summary['duplicates']:,} duplicates, {summary['invalid']:,} invalid rows skipped)")
+    for error in summary['errors']:
+        print(f"  {error}", file=sys.stderr)
+
+
+def command_export(store, args):
+    count = export_records(store, args.path, args.kind)
+    print(f"Exported {count:,} {args.kind} to {args.path}")
+
+
+def command_convert(args):
+    """Copy a JSON-backend file to the other snapshot format; needs no stores open."""
+    for path in (args.source, args.target):
+        if not path.endswith(('.json', SNAPSHOT_SUFFIX)):
+            raise CommandError(f"'{path}' should end in .json or {SNAPSHOT_SUFFIX}")
+    if args.source == args.target:
+        raise CommandError("Source and target are the same file")
+    if not os.path.exists(args.source):
+        raise CommandError(f"No such file: {args.source}")
+    count = convert_snapshot(args.source, args.target)
+    print(f"Converted {count:,} records from {args.source} to {args.target}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sqlite', action='store_true', help="use the SQLite database instead of the JSON files")
+    parser.add_argument('--profile', action='store_true', help="record timings of loads, saves, searches and so on")
+    commands = parser.add_subparsers(dest='command')
+    kinds = list(RECORD_KINDS)
+
+    add = commands.add_parser('add', help="add one record")
+    add.add_argument('kind', choices=kinds)
+    add.add_argument('values', nargs='*', metavar='field=value')
+    add.set_defaults(run=command_add)
+
+    update = commands.add_parser('update', help="change fields of one record")
+    update.add_argument('kind', choices=kinds)
+    update.add_argument('id', type=int)
+    update.add_argument('values', nargs='+', metavar='field=value')
+    update.set_defaults(run=command_update)
+
+    for name, help_text in (('list', "print records"), ('query', "print records matching filters")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('kind', choices=kinds)
+        command.add_argument('--limit', type=int)
+        command.add_argument('--json', action='store_true', help="one JSON object per line")
+        if name == 'query':
+            command.add_argument('--where', nargs=3, action='append', metavar=('FIELD', 'OP', 'VALUE'),
+                                 help=f"filter; OP is one of {' '.join(FILTER_OPS)}")
+            command.add_argument('--search', help="words to search for")
+            command.add_argument('--sort', metavar='FIELD')
+            command.add_argument('--desc', action='store_true')
+        else:
+            command.set_defaults(where=None, search=None, sort=None, desc=False)
+        command.set_defaults(run=command_query)
+
+    stats = commands.add_parser('stats', help="print record counts")
+    stats.set_defaults(run=command_stats, kind=None, kinds=kinds)
+
+    history = commands.add_parser('history', help="status history of the applications")
+    choice = history.add_mutually_exclusive_group()
+    choice.add_argument('--id', type=int, help="one application's status periods")
+    choice.add_argument('--as-of', metavar='DATE', help="status counts as they were on DATE")
+    history.set_defaults(run=command_history, kind=None, kinds=['applications'])
+
+    for name, help_text, run in (('import', "add records from a .csv or .jsonl file", command_import),
+                                 ('export', "write records to a .csv or .jsonl file", command_export)):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('kind', choices=kinds)
+        command.add_argument('path')
+        command.set_defaults(run=run)
+
+    convert = commands.add_parser('convert', help=f"copy a .json data file to {SNAPSHOT_SUFFIX} or back")
+    convert.add_argument('source')
+    convert.add_argument('target')
+    convert.set_defaults(run=command_convert, kind=None)
+    return parser
+
+
+def main(argv=None):
+    """Run one command, or open the window when there is none."""
+    args = build_parser().parse_args(argv)
+    args.backend = 'sqlite' if args.sqlite else BACKEND
+    if args.profile:
+        instruments.enabled = True
+
+    if args.command is None:
+        import tracker_gui  # the only place tkinter gets imported
+        tracker_gui.run(args.backend)
+        return 0
+
+    if args.command == 'convert':
+        try:
+            args.run(args)
+        except (CommandError, ValueError, OSError) as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 1
+        return 0
+
+    # Only the store the command works on, so a cron job's `add` isn't
+    # held up loading the other one.
+    try:
+        stores = open_stores(args.backend, kinds=[args.kind] if args.kind else args.kinds)
+    except (ValueError, OSError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    try:
+        if args.kind is None:
+            args.run(stores, args)
+        else:
+            args.run(stores[0] if args.kind == 'applications' else stores[1], args)
+    except (CommandError, ValueError, OSError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        for store in stores:
+            if store is not None:
+                store.close()
+        if instruments.enabled:
+            print(json.dumps(instruments.summary(), indent=2), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
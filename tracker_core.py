@@ -0,0 +1,3294 @@
+"""Job Tracker core: records, stores, search, validation and import/export.
+
+Pure Python with no GUI dependencies, so scripts, cron jobs and the command
+line (tracker_cli) can use it on machines without a display. The window
+lives in tracker_gui.
+"""
+import array
+import atexit
+import bisect
+import collections
+import csv
+import functools
+import itertools
+import json
+import marshal
+import math
+import mmap
+import os
+import queue
+import re
+import sqlite3
+import struct
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from datetime import date, datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Snapshot format of the JSON-backend files: "json" (readable) or "binary" (see save_snapshot).
+SNAPSHOT_FORMAT = os.environ.get("JOB_TRACKER_SNAPSHOT", "json")
+SNAPSHOT_SUFFIX = ".snap"
+APPLICATIONS_JSON = "applications.json"
+CONTACTS_JSON = "contacts.json"
+APPLICATIONS_SNAPSHOT = "applications" + SNAPSHOT_SUFFIX
+CONTACTS_SNAPSHOT = "contacts" + SNAPSHOT_SUFFIX
+if SNAPSHOT_FORMAT == "binary":
+    APPLICATIONS_FILE = APPLICATIONS_SNAPSHOT
+    CONTACTS_FILE = CONTACTS_SNAPSHOT
+else:
+    APPLICATIONS_FILE = APPLICATIONS_JSON
+    CONTACTS_FILE = CONTACTS_JSON
+COMPANY_ALIASES_FILE = "company_aliases.json"  # optional {"alias": "company"} table
+
+JOURNAL_SUFFIX = ".journal"
+META_SUFFIX = ".meta"
+LOCK_SUFFIX = ".lock"
+CONVERTED_SUFFIX = ".converted"  # what a store's files are renamed to after a format switch
+SNAPSHOT_MAGIC = b"JTSNAP"
+SNAPSHOT_VERSION = 1          # bump when the layout changes; older readers refuse newer files
+SNAPSHOT_MARSHAL_VERSION = 4  # pinned so the bytes don't depend on the Python that wrote them
+SNAPSHOT_HEADER = struct.Struct("<6sHI")  # magic, format version, length of the JSON schema after it
+SNAPSHOT_LENGTH = struct.Struct("<I")     # in front of every block of records
+SNAPSHOT_OFFSET = struct.Struct("<Q")     # one per block in the offset table
+SNAPSHOT_BLOCK = 256                      # records per block
+SNAPSHOT_TRAILER = struct.Struct("<QQ")   # where the offset table starts, number of records
+MISSING = ...  # stands in for a field a snapshot record doesn't have (JSON has no Ellipsis)
+HISTORY_SUFFIX = ".history"
+CHECKPOINT_SUFFIX = ".checkpoints"
+CHECKPOINT_EVENTS = 1000  # fewest history events between two checkpoints
+HISTORY_LINES = 8         # status periods listed in an application's details
+LINKED_LINES = 8          # linked records listed in a detail view
+COMPACT_THRESHOLD = 500  # journal entries before they get folded into the snapshot
+FIRST_PAGE_SIZE = 100     # records shown before the rest loads in the background
+PAGE_SIZE = 5000
+LOAD_POLL_MS = 20
+SAVE_STATUS_MS = 1000
+SAVE_RETRY_MS = 2000   # wait before writing journal lines again after a failed save
+RELOAD_POLL_MS = 1000  # how often to look for changes saved by other processes
+
+# Instrumentation (see Instruments); off unless asked for.
+PROFILE = os.environ.get("JOB_TRACKER_PROFILE", "") not in ("", "0")
+HEARTBEAT_MS = 100        # how often the GUI checks the event loop isn't blocked
+STALL_THRESHOLD_MS = 200  # lateness of a heartbeat that counts as a stall
+STALL_LOG_SIZE = 50       # recent stalls kept for the debug panel
+HISTOGRAM_GROWTH = 1.1    # each histogram bucket is 10% wider than the last
+DEBUG_PANEL_MS = 500      # debug panel refresh interval
+
+DATABASE_FILE = "job_tracker.db"
+SQLITE_MIGRATED = 1  # PRAGMA user_version once the JSON records have been copied in
+BACKEND = os.environ.get("JOB_TRACKER_BACKEND", "json")  # "json" or "sqlite"
+
+APPLICATION_FIELDS = ('id', 'company', 'role', 'salary_range', 'date_applied', 'status', 'notes', 'last_updated',
+                      'version')
+CONTACT_FIELDS = ('id', 'name', 'company', 'role', 'relationship', 'notes', 'last_updated', 'version')
+# Bookkeeping fields that never count as a user's edit when merging (see merge_changes).
+MERGE_IGNORED = ('id', 'version', 'last_updated')
+
+# Searchable fields and how much a match in each counts towards the ranking.
+APPLICATION_SEARCH_FIELDS = {'company': 3, 'role': 2, 'status': 1, 'notes': 1}
+CONTACT_SEARCH_FIELDS = {'name': 3, 'company': 2, 'role': 2, 'notes': 1}
+SEARCH_DELAY_MS = 150  # wait for a pause in typing before searching
+
+RESPONSE_EXCLUDED = ('Applied', 'Withdrawn')  # statuses that mean no answer from the company yet
+SALARY_BUCKET = 20000  # width of the salary distribution bars
+
+IMPORT_BATCH_SIZE = 1000  # rows validated and saved together during an import
+MAX_IMPORT_ERRORS = 20    # invalid rows listed in an import summary
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    id INTEGER PRIMARY KEY,
+    company TEXT NOT NULL,
+    role TEXT NOT NULL,
+    salary_range TEXT NOT NULL DEFAULT '',
+    date_applied TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL DEFAULT '',
+    notes TEXT NOT NULL DEFAULT '',
+    last_updated TEXT NOT NULL DEFAULT '',
+    version INTEGER NOT NULL DEFAULT 0,  -- bumped by every update, for conflict checks
+    salary_value REAL,  -- parse_salary(salary_range), for sorting and range filters
+    company_key TEXT,  -- company_key(company) without aliases, for CompanyIndex
+    status_since INTEGER  -- minute the application entered its status, for SqlitePipelineStats
+);
+CREATE INDEX IF NOT EXISTS idx_applications_company ON applications(company);
+CREATE INDEX IF NOT EXISTS idx_applications_company_key ON applications(company_key);
+CREATE INDEX IF NOT EXISTS idx_applications_status ON applications(status);
+CREATE INDEX IF NOT EXISTS idx_applications_date_applied ON applications(date_applied);
+CREATE INDEX IF NOT EXISTS idx_applications_last_updated ON applications(last_updated);
+CREATE INDEX IF NOT EXISTS idx_applications_salary_value ON applications(salary_value);
+CREATE INDEX IF NOT EXISTS idx_applications_status_since ON applications(status, status_since);
+
+CREATE TABLE IF NOT EXISTS contacts (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    company TEXT NOT NULL DEFAULT '',
+    role TEXT NOT NULL DEFAULT '',
+    relationship TEXT NOT NULL DEFAULT '',
+    notes TEXT NOT NULL DEFAULT '',
+    last_updated TEXT NOT NULL DEFAULT '',
+    version INTEGER NOT NULL DEFAULT 0,
+    company_key TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_contacts_company ON contacts(company);
+CREATE INDEX IF NOT EXISTS idx_contacts_company_key ON contacts(company_key);
+CREATE INDEX IF NOT EXISTS idx_contacts_last_updated ON contacts(last_updated);
+
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    next_id INTEGER NOT NULL
+);
+"""
+
+
+class Histogram:
+    """Latency samples in buckets HISTOGRAM_GROWTH apart, so any percentile
+    is known to within that factor in constant memory."""
+
+    def __init__(self):
+        self.buckets = {}  # bucket number -> samples
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+
+    def add(self, ms):
+        bucket = math.floor(math.log(max(ms, 0.001), HISTOGRAM_GROWTH))
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+
+    def percentile(self, fraction):
+        """Upper edge of the bucket holding the sample at `fraction` (0.5 = median)."""
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(HISTOGRAM_GROWTH ** (bucket + 1), self.max_ms)
+        return 0.0
+
+
+class Instruments:
+    """Timing histograms for the hot paths (load, save, list refresh, modal
+    open, search) and a record of event-loop stalls.
+
+    Off unless JOB_TRACKER_PROFILE is set or --profile is given; while off,
+    timed() hands back a shared do-nothing context manager and record()
+    returns at once, so the instrumented code pays one attribute check.
+    Safe to call from the writer threads.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.histograms = {}  # name -> Histogram
+        self.lock = threading.Lock()
+        self.slowest = None   # (name, ms) of the slowest timed section on the main thread since the last beat
+        self.stalls = collections.deque(maxlen=STALL_LOG_SIZE)  # (when, ms, slowest)
+
+
+    def timed(self, name):
+        """with instruments.timed('save'): ... - records how long the block took."""
+        if not self.enabled:
+            return NOT_TIMED
+        return self._timed(name)
+
+
+    @contextmanager
+    def _timed(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - started) * 1000)
+
+
+    def record(self, name, ms):
+        if not self.enabled:
+            return
+        with self.lock:
+            self._add(name, ms)
+            if threading.current_thread() is threading.main_thread() and (
+                    self.slowest is None or ms > self.slowest[1]):
+                self.slowest = (name, ms)
+
+
+    def _add(self, name, ms):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.add(ms)
+
+
+    def event_loop_delay(self, ms):
+        """Called by the GUI heartbeat with how late it ran. Over
+        STALL_THRESHOLD_MS the loop was blocked; that gets logged with the
+        slowest timed section since the last beat, the likely culprit."""
+        if not self.enabled:
+            return
+        with self.lock:
+            self._add('event loop delay', ms)
+            slowest, self.slowest = self.slowest, None
+        if ms > STALL_THRESHOLD_MS:
+            self.stalls.append((now_stamp(), ms, slowest))
+            culprit = f" (slowest: {slowest[0]} {slowest[1]:.0f} ms)" if slowest else ""
+            print(f"Job Tracker: event loop blocked for {ms:.0f} ms{culprit}", file=sys.stderr)
+
+
+    def summary(self):
+        """{name: {count, p50_ms, p99_ms, max_ms}} for everything recorded so far."""
+        with self.lock:
+            return {name: {'count': histogram.count,
+                           'p50_ms': round(histogram.percentile(0.5), 3),
+                           'p99_ms': round(histogram.percentile(0.99), 3),
+                           'max_ms': round(histogram.max_ms, 3)}
+                    for name, histogram in sorted(self.histograms.items())}
+
+
+NOT_TIMED = nullcontext()
+instruments = Instruments(PROFILE)  # the one set of instruments the whole program records into
+
+
+def instrumented(name):
+    """Decorator: time every call of the function under `name` while instruments are on."""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not instruments.enabled:
+                return function(*args, **kwargs)
+            with instruments.timed(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def load_data(filename):
+    """Load a record list: the snapshot (JSON, or binary for a SNAPSHOT_SUFFIX
+    file) plus any journaled changes."""
+    with instruments.timed('load'):
+        return JournalStore(filename).load()
+
+
+def save_data(filename, data):
+    """Write data as JSON without ever leaving a half-written file behind:
+    write a temp file, fsync it, then rename it over the old one. A
+    SNAPSHOT_SUFFIX file is written with save_snapshot instead."""
+    if is_binary_snapshot(filename):
+        save_snapshot(filename, data)
+        return
+    tmp_file = filename + ".tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump(data, f, indent=2, default=record_to_json)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, filename)
+
+
+def generate_id(data_list):
+    if not data_list:
+        return 1
+    return max(item['id'] for item in data_list) + 1
+
+
+def iter_json_array(filename, chunk_size=1 << 16, f=None):
+    """Yield the items of a top-level JSON array without reading the whole file.
+
+    Yields (item, rough fraction of the file read so far). Pass `f` to read
+    from a handle already open on filename.
+    """
+    decoder = json.JSONDecoder()
+    if f is None:
+        with open(filename, 'r') as f:
+            yield from iter_json_array(filename, chunk_size, f)
+        return
+    total = os.fstat(f.fileno()).st_size or 1
+    buf = ""
+    pos = 0
+    read = 0  # characters, which is close enough to bytes for a progress bar
+    started = False
+    while True:
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+        if pos == len(buf):
+            more = f.read(chunk_size)
+            if not more:
+                return
+            read += len(more)
+            buf, pos = more, 0
+            continue
+        if not started:
+            if buf[pos] != '[':
+                raise ValueError(f"{filename} is not a JSON array")
+            started = True
+            pos += 1
+            continue
+        if buf[pos] == ']':
+            return
+
+        try:
+            item, pos = decoder.raw_decode(buf, pos)
+        except ValueError:
+            # Item runs past the end of the buffer - read more and retry.
+            more = f.read(chunk_size)
+            if not more:
+                raise
+            read += len(more)
+            buf = buf[pos:] + more
+            pos = 0
+            continue
+        yield item, min(1.0, read / total)
+
+
+def is_binary_snapshot(filename):
+    return filename.endswith(SNAPSHOT_SUFFIX)
+
+
+def open_snapshot(filename):
+    """An open file for a JSON snapshot, a SnapshotReader for a binary one; None if there's none."""
+    if not os.path.exists(filename):
+        return None
+    return SnapshotReader(filename) if is_binary_snapshot(filename) else open(filename, 'r')
+
+
+def save_snapshot(filename, records):
+    """Write records in the binary snapshot format, atomically like save_data.
+
+    Layout: SNAPSHOT_HEADER (magic, format version, schema length), the
+    schema as JSON, then the records in blocks of SNAPSHOT_BLOCK, each a
+    4-byte length followed by a marshal'd list of record value tuples in
+    schema order, then the file offset of every block and SNAPSHOT_TRAILER
+    (where those offsets start, number of records). Record i is in block
+    i // SNAPSHOT_BLOCK, so it can be read without decoding the others.
+
+    Blocks rather than single records are the unit because marshal shares
+    repeated strings (companies, statuses, dates) within one dump, which
+    makes the file a third smaller and quicker to load than one dump per
+    record.
+
+    The schema is the first record's fields. A record lacking one has
+    MISSING in its place, and one with fields outside it is stored as a
+    whole dict, so any JSON record list round-trips.
+    """
+    records = records if isinstance(records, list) else list(records)
+    fields = list(records[0].keys()) if records else []
+    width = len(fields)
+    schema = json.dumps({'fields': fields, 'block': SNAPSHOT_BLOCK,
+                         'marshal': SNAPSHOT_MARSHAL_VERSION}).encode()
+    offsets = array.array('Q')
+    tmp_file = filename + ".tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(schema)) + schema)
+        position = SNAPSHOT_HEADER.size + len(schema)
+        for start in range(0, len(records), SNAPSHOT_BLOCK):
+            entries = []
+            plain = True  # every entry a full tuple - lets the loader take the fast path
+            for record in records[start:start + SNAPSHOT_BLOCK]:
+                values = tuple([record.get(field, MISSING) for field in fields])
+                missing = values.count(MISSING)
+                if len(record.keys()) != width - missing:
+                    values = record.to_dict() if isinstance(record, Record) else dict(record)
+                plain = plain and not missing and type(values) is tuple
+                entries.append(values)
+            blob = marshal.dumps((plain, entries), SNAPSHOT_MARSHAL_VERSION)
+            offsets.append(position)
+            position += SNAPSHOT_LENGTH.size + len(blob)
+            f.write(SNAPSHOT_LENGTH.pack(len(blob)))
+            f.write(blob)
+        if sys.byteorder == 'big':
+            offsets.byteswap()  # the file is little-endian throughout
+        f.write(offsets.tobytes())
+        f.write(SNAPSHOT_TRAILER.pack(position, len(records)))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, filename)
+
+
+def snapshot_record(fields, values):
+    """A decoded snapshot entry back as the record dict that was saved."""
+    if type(values) is dict:
+        return values
+    if MISSING in values:
+        return {field: value for field, value in zip(fields, values) if value is not MISSING}
+    return dict(zip(fields, values))
+
+
+class SnapshotReader:
+    """A binary snapshot (see save_snapshot) opened through mmap.
+
+    Opening reads only the header and trailer. reader[i] decodes just the
+    block holding record i; iterating decodes the blocks in file order.
+    Use as a context manager, or close(), to release the mapping.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        with open(filename, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < SNAPSHOT_HEADER.size + SNAPSHOT_TRAILER.size:
+                raise ValueError(f"{filename} is not a Job Tracker snapshot")
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, schema_size = SNAPSHOT_HEADER.unpack_from(self.data, 0)
+        if magic != SNAPSHOT_MAGIC:
+            self.close()
+            raise ValueError(f"{filename} is not a Job Tracker snapshot")
+        if version > SNAPSHOT_VERSION:
+            self.close()
+            raise ValueError(f"{filename} uses snapshot format {version}; "
+                             f"this version reads up to {SNAPSHOT_VERSION}")
+        self.start = SNAPSHOT_HEADER.size + schema_size
+        schema = json.loads(self.data[SNAPSHOT_HEADER.size:self.start])
+        self.fields = tuple(schema['fields'])
+        self.block_size = schema['block']
+        self.end, self.count = SNAPSHOT_TRAILER.unpack_from(self.data, size - SNAPSHOT_TRAILER.size)
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+    def close(self):
+        self.data.close()
+
+
+    def __len__(self):
+        return self.count
+
+
+    def __getitem__(self, index):
+        if not -self.count <= index < self.count:
+            raise IndexError("snapshot record index out of range")
+        block, slot = divmod(index % self.count, self.block_size)
+        (position,) = SNAPSHOT_OFFSET.unpack_from(self.data, self.end + block * SNAPSHOT_OFFSET.size)
+        plain, entries = self._block(position)[0]
+        return snapshot_record(self.fields, entries[slot])
+
+
+    def _block(self, position):
+        """((plain, entries), position of the next block) for the block at `position`."""
+        (size,) = SNAPSHOT_LENGTH.unpack_from(self.data, position)
+        position += SNAPSHOT_LENGTH.size
+        return marshal.loads(self.data[position:position + size]), position + size
+
+
+    def __iter__(self):
+        for record, progress in self.iter_progress():
+            yield record
+
+
+    def iter_progress(self):
+        """Yield (record, fraction of the file read so far), like iter_json_array."""
+        position = self.start
+        while position < self.end:
+            (plain, entries), position = self._block(position)
+            progress = position / self.end
+            for values in entries:
+                yield snapshot_record(self.fields, values), progress
+
+
+    def read_all(self):
+        """Every record as a list - the fast path for loading the whole file."""
+        records = []
+        fields = itertools.repeat(self.fields)
+        position = self.start
+        while position < self.end:
+            (plain, entries), position = self._block(position)
+            if plain:
+                records.extend(map(dict, map(zip, fields, entries)))
+            else:
+                records.extend(snapshot_record(self.fields, values) for values in entries)
+        return records
+
+
+def convert_snapshot(source, target):
+    """Copy a store's records (snapshot plus journal) and id counter to a new
+    file in the format its name asks for - .json or SNAPSHOT_SUFFIX.
+    Returns the number of records."""
+    journal = JournalStore(source)
+    records = journal.load()
+    with FileLock(target + LOCK_SUFFIX):
+        save_data(target, records)
+        save_data(target + META_SUFFIX, {'next_id': max(journal.next_id, journal.read_meta())})
+        for path in (target + JOURNAL_SUFFIX, target + JOURNAL_SUFFIX + ".old"):
+            if os.path.exists(path):
+                os.remove(path)  # changes to whatever the target held before
+    return len(records)
+
+
+def store_files(filename):
+    """Those of a JournalStore's files for `filename` that exist."""
+    paths = (filename, filename + JOURNAL_SUFFIX, filename + JOURNAL_SUFFIX + ".old", filename + META_SUFFIX)
+    return [path for path in paths if os.path.exists(path)]
+
+
+def adopt_snapshot(target, source):
+    """Bring a store over to `target` after the snapshot format was switched.
+
+    If only `source`, the same store in the other format, has files, they
+    are converted and then renamed with CONVERTED_SUFFIX, so switching back
+    converts again rather than opening records that are out of date.
+    Raises ValueError if both have files and `source` was changed last:
+    `target` would be the stale copy.
+    """
+    source_files = store_files(source)
+    if not source_files:
+        return
+    target_files = store_files(target)
+    if not target_files:
+        convert_snapshot(source, target)
+        for path in source_files:
+            os.replace(path, path + CONVERTED_SUFFIX)
+    elif max(map(os.path.getmtime, source_files)) > max(map(os.path.getmtime, target_files)):
+        raise ValueError(f"{source} has newer changes than {target}: run `python job_tracker.py convert "
+                         f"{source} {target}` to carry them over, or move {source} out of the way")
+
+
+SALARY_RE = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*(k)?", re.IGNORECASE)
+
+
+def parse_date(text):
+    """'2026-02-09' -> day number, or None if it isn't a date."""
+    try:
+        return date.fromisoformat(text.strip()).toordinal()
+    except (AttributeError, ValueError):  # AttributeError: not text at all
+        return None
+
+
+def parse_timestamp(text):
+    """'2026-02-09 17:24' -> minute number, or None."""
+    try:
+        stamp = datetime.fromisoformat(text.strip())
+    except (AttributeError, ValueError):
+        return None
+    return stamp.toordinal() * 1440 + stamp.hour * 60 + stamp.minute
+
+
+def parse_salary(text):
+    """First amount in a free-text salary: '120000', '$120k - 140k', '120,000/yr'."""
+    match = SALARY_RE.search(text or '')
+    if not match:
+        return None
+    value = float(match.group(1).replace(',', ''))
+    if match.group(2) or (value < 1000 and 'k' in text.lower()):
+        value *= 1000
+    return value
+
+
+def company_key(name, aliases=None):
+    """'  Bentley  SYSTEMS ' -> 'bentley systems', then through the alias table."""
+    key = " ".join((name or '').split()).casefold()
+    if aliases:
+        key = aliases.get(key, key)
+    return key
+
+
+# Fields that sort and range-filter by parsed value rather than as text.
+FIELD_PARSERS = {
+    'date_applied': parse_date,
+    'last_updated': parse_timestamp,
+    'salary_range': parse_salary,
+}
+
+
+def sort_key(field, value):
+    """Comparable key for one field; unparseable values sort after the rest."""
+    parse = FIELD_PARSERS.get(field)
+    if parse is None:
+        return (False, (value or '').casefold())
+    parsed = parse(value or '')
+    return (parsed is None, parsed if parsed is not None else 0)
+
+
+def parse_bound(field, value):
+    """The value of a >= or <= filter on a FIELD_PARSERS field, parsed.
+
+    Raises ValueError if it isn't a date (or amount, for salaries) rather than
+    letting every record fail to compare with it.
+    """
+    if not isinstance(value, str):
+        return value
+    parsed = FIELD_PARSERS[field](value)
+    if parsed is None:
+        raise ValueError(f"'{value}' is not {'an amount' if field == 'salary_range' else 'a date'}")
+    return parsed
+
+
+def parse_bounds(filters):
+    """filters with parse_bound applied to the range bounds, so it's done once per query."""
+    return [(field, op, parse_bound(field, value) if op in ('>=', '<=') and field in FIELD_PARSERS else value)
+            for field, op, value in filters]
+
+
+def record_matches(record, filters, key=None):
+    """Check a record against (field, op, value) filters - see RecordStore.query.
+
+    `key(field, record)` can supply a cached sort_key for the record.
+    """
+    for field, op, value in filters:
+        if op in ('>=', '<=') and field in FIELD_PARSERS:
+            # Dates and salaries compare by value; records without one don't match.
+            missing, parsed = key(field, record) if key else sort_key(field, record.get(field, ''))
+            value = parse_bound(field, value)
+            if missing or (op == '>=' and parsed < value) or (op == '<=' and parsed > value):
+                return False
+            continue
+
+        field_value = record.get(field, 0 if field == 'version' else '')  # as SqliteStore stores it
+        if op == '=' and field_value != value:
+            return False
+        if op == 'in' and field_value not in value:
+            return False
+        if op == '>=' and field_value < value:
+            return False
+        if op == '<=' and field_value > value:
+            return False
+        if op == 'like' and value.lower() not in field_value.lower():
+            return False
+    return True
+
+
+class Verbatim:
+    """An int that was already an int in the JSON, kept in a date or timestamp
+    slot where a bare int would be taken for a packed one."""
+
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+
+def pack_date(value):
+    """'2026-02-09' -> day number, if that turns back into exactly the same text."""
+    if type(value) is str and len(value) == 10 and value[4] == value[7] == '-':
+        try:
+            return date.fromisoformat(value).toordinal()
+        except ValueError:
+            pass
+    return Verbatim(value) if type(value) is int else value
+
+
+def unpack_date(value):
+    return date.fromordinal(value).isoformat() if type(value) is int else value
+
+
+def pack_timestamp(value):
+    """'2026-02-09 17:24' -> minute number, if it round-trips exactly."""
+    if (type(value) is str and len(value) == 16 and value[4] == value[7] == '-'
+            and value[10] == ' ' and value[13] == ':'):
+        try:
+            stamp = datetime.fromisoformat(value)
+        except ValueError:
+            return value
+        return stamp.toordinal() * 1440 + stamp.hour * 60 + stamp.minute
+    return Verbatim(value) if type(value) is int else value
+
+
+def intern_text(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+def unpack_timestamp(value):
+    if type(value) is not int:
+        return value
+    day, minute = divmod(value, 1440)
+    return f"{date.fromordinal(day).isoformat()} {minute // 60:02d}:{minute % 60:02d}"
+
+
+class Record:
+    """Compact record with the same dict-style interface as the JSON records.
+
+    Fields live in __slots__ instead of a per-record dict. Categorical fields
+    (INTERNED) share one string object per distinct value. Dates and
+    timestamps are kept as ints when they are in the app's own format and
+    turn back into exactly the same text (an int that was an int to begin
+    with is wrapped in Verbatim). Anything else round-trips unchanged.
+    Unknown keys go in `extra`, so to_dict() always gives back the
+    record as it was in the JSON file.
+
+    Use record['field'] / record.get(); the attributes hold the packed values.
+    """
+
+    __slots__ = ('extra',)
+    FIELDS = ()
+    INTERNED = ()
+    DATES = ()
+    TIMESTAMPS = ()
+    PACKERS = {}    # field -> function applied on the way in, or None
+    UNPACKERS = {}  # field -> function turning a packed int back into text
+
+    def __init_subclass__(cls):
+        super().__init_subclass__()
+        cls.PACKERS = {field: None for field in cls.FIELDS}
+        cls.PACKERS.update({field: intern_text for field in cls.INTERNED})
+        cls.PACKERS.update({field: pack_date for field in cls.DATES})
+        cls.PACKERS.update({field: pack_timestamp for field in cls.TIMESTAMPS})
+        cls.UNPACKERS = {field: unpack_date for field in cls.DATES}
+        cls.UNPACKERS.update({field: unpack_timestamp for field in cls.TIMESTAMPS})
+
+
+    def __init__(self, data=None):
+        self.extra = None
+        for field, value in (data or {}).items():
+            self[field] = value
+
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, cls):
+            return data
+        # Same as cls(data), inlined because it runs for every loaded record.
+        record = cls.__new__(cls)
+        record.extra = None
+        packers = cls.PACKERS
+        for field, value in data.items():
+            if field in packers:
+                pack = packers[field]
+                setattr(record, field, pack(value) if pack else value)
+            else:
+                record[field] = value
+        return record
+
+
+    def __getitem__(self, field):
+        if field not in self.PACKERS:
+            if self.extra and field in self.extra:
+                return self.extra[field]
+            raise KeyError(field)
+        try:
+            value = getattr(self, field)
+        except AttributeError:  # field was never set, like a missing JSON key
+            raise KeyError(field) from None
+        if type(value) is int and field in self.UNPACKERS:
+            return self.UNPACKERS[field](value)
+        if type(value) is Verbatim:
+            return value.value
+        return value
+
+
+    def __setitem__(self, field, value):
+        if field in self.PACKERS:
+            pack = self.PACKERS[field]
+            setattr(self, field, pack(value) if pack else value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[field] = value
+
+
+    def __contains__(self, field):
+        try:
+            self[field]
+        except KeyError:
+            return False
+        return True
+
+
+    def get(self, field, default=None):
+        try:
+            return self[field]
+        except KeyError:
+            return default
+
+
+    def keys(self):
+        return [field for field in self.FIELDS if hasattr(self, field)] + list(self.extra or ())
+
+
+    def update(self, changes):
+        for field, value in changes.items():
+            self[field] = value
+
+
+    def to_dict(self):
+        return {field: self[field] for field in self.keys()}
+
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class Application(Record):
+    __slots__ = APPLICATION_FIELDS
+    FIELDS = APPLICATION_FIELDS
+    INTERNED = ('company', 'status')
+    DATES = ('date_applied',)
+    TIMESTAMPS = ('last_updated',)
+
+
+class Contact(Record):
+    __slots__ = CONTACT_FIELDS
+    FIELDS = CONTACT_FIELDS
+    INTERNED = ('company', 'relationship')
+    TIMESTAMPS = ('last_updated',)
+
+
+def record_to_json(obj):
+    """json `default=` hook so Record objects serialize as their dicts."""
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def open_stores(backend=BACKEND, lazy=False, kinds=('applications', 'contacts')):
+    """Return (application store, contact store) for the selected backend.
+
+    With lazy=True the JSON stores start empty and load in the background
+    (see RecordStore.start_loading); SQLite never needs to load up front.
+    Only the kinds asked for are opened - the other comes back as None - so
+    a command about contacts doesn't load every application first.
+    Changes to applications are also logged to a HistoryLog. After the
+    snapshot format is switched, the files in the old one are converted the
+    first time (see adopt_snapshot).
+    """
+    if backend == 'sqlite':
+        conn = migrate_json_to_sqlite(DATABASE_FILE)
+        stores = (SqliteStore(conn, 'applications', APPLICATION_FIELDS, APPLICATION_SEARCH_FIELDS)
+                  if 'applications' in kinds else None,
+                  SqliteStore(conn, 'contacts', CONTACT_FIELDS, CONTACT_SEARCH_FIELDS)
+                  if 'contacts' in kinds else None)
+        history_file = DATABASE_FILE + HISTORY_SUFFIX
+    else:
+        formats = {'applications': (APPLICATIONS_JSON, APPLICATIONS_SNAPSHOT),
+                   'contacts': (CONTACTS_JSON, CONTACTS_SNAPSHOT)}
+        for kind in kinds:
+            json_file, snapshot_file = formats[kind]
+            if SNAPSHOT_FORMAT == "binary":
+                adopt_snapshot(snapshot_file, json_file)
+            else:
+                adopt_snapshot(json_file, snapshot_file)
+        stores = (RecordStore(APPLICATIONS_FILE, lazy, APPLICATION_SEARCH_FIELDS, Application)
+                  if 'applications' in kinds else None,
+                  RecordStore(CONTACTS_FILE, lazy, CONTACT_SEARCH_FIELDS, Contact)
+                  if 'contacts' in kinds else None)
+        history_file = APPLICATIONS_JSON + HISTORY_SUFFIX  # the same history in either snapshot format
+    if stores[0] is not None:
+        stores[0].history = HistoryLog(history_file, stores[0])
+    return stores
+
+
+WORD_RE = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return WORD_RE.findall(text.lower())
+
+
+def search_schema(table, search_fields):
+    """FTS5 index over a table's search fields, kept in sync by triggers."""
+    fts = f"{table}_fts"
+    columns = ", ".join(search_fields)
+    new_values = ", ".join(f"new.{field}" for field in search_fields)
+    old_values = ", ".join(f"old.{field}" for field in search_fields)
+    return f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({columns}, content='{table}', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table} BEGIN
+    INSERT INTO {fts} (rowid, {columns}) VALUES (new.id, {new_values});
+END;
+CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table} BEGIN
+    INSERT INTO {fts} ({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+END;
+CREATE TRIGGER IF NOT EXISTS {table}_fts_update AFTER UPDATE ON {table} BEGIN
+    INSERT INTO {fts} ({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+    INSERT INTO {fts} (rowid, {columns}) VALUES (new.id, {new_values});
+END;
+"""
+
+
+# Columns computed from a field when a row is written: table -> {field: (column, parser)}
+SQLITE_PARSED_COLUMNS = {
+    'applications': {'salary_range': ('salary_value', parse_salary), 'company': ('company_key', company_key)},
+    'contacts': {'company': ('company_key', company_key)},
+}
+
+
+def connect_database(db_file):
+    conn = sqlite3.connect(db_file)
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(applications)")]
+    if columns and 'salary_value' not in columns:
+        # Database created before salary sorting existed.
+        conn.execute("ALTER TABLE applications ADD COLUMN salary_value REAL")
+        conn.create_function('parse_salary', 1, parse_salary)
+        conn.execute("UPDATE applications SET salary_value = parse_salary(salary_range)")
+    if columns and 'status_since' not in columns:
+        # Database created before the pipeline stats were queried in SQL.
+        conn.execute("ALTER TABLE applications ADD COLUMN status_since INTEGER")
+        conn.create_function('parse_timestamp', 1, parse_timestamp)
+        conn.execute("UPDATE applications SET status_since = parse_timestamp(last_updated)")
+    for table in ('applications', 'contacts'):
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+        if columns and 'version' not in columns:
+            # Database created before version checks existed.
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+        if columns and 'company_key' not in columns:
+            # Database created before company links were looked up in SQL.
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN company_key TEXT")
+            conn.create_function('normalize_company', 1, company_key)
+            conn.execute(f"UPDATE {table} SET company_key = normalize_company(company)")
+    conn.executescript(SQLITE_SCHEMA)
+    for table, search_fields in (('applications', APPLICATION_SEARCH_FIELDS),
+                                 ('contacts', CONTACT_SEARCH_FIELDS)):
+        existed = conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (f"{table}_fts",)).fetchone()
+        conn.executescript(search_schema(table, search_fields))
+        if not existed:
+            # Databases from before search existed need their rows indexed once.
+            conn.execute(f"INSERT INTO {table}_fts ({table}_fts) VALUES ('rebuild')")
+    conn.commit()
+    return conn
+
+
+def migrate_json_to_sqlite(db_file=DATABASE_FILE):
+    """Copy the JSON files (snapshot + journal) into SQLite, once.
+
+    PRAGMA user_version records that the copy was made, in the same
+    transaction, so this is safe to call on every startup - deleting every
+    row doesn't bring the JSON records back. Databases from before the
+    marker count as migrated per table if it has rows or has handed out ids.
+    """
+    conn = connect_database(db_file)
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= SQLITE_MIGRATED:
+        return conn
+    for filename, table, fields in ((APPLICATIONS_FILE, 'applications', APPLICATION_FIELDS),
+                                    (CONTACTS_FILE, 'contacts', CONTACT_FIELDS)):
+        counter = conn.execute("SELECT next_id FROM counters WHERE name = ?", (table,)).fetchone()
+        if (counter and counter[0] > 1) or conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone():
+            continue
+        journal = JournalStore(filename)
+        records = journal.load()
+        store = SqliteStore(conn, table, fields, {})
+        conn.executemany(store.insert_sql, (store.row_values(record) for record in records))
+        # Never lower the counter: an id handed out once stays used.
+        conn.execute("UPDATE counters SET next_id = MAX(next_id, ?) WHERE name = ?", (journal.next_id, table))
+    conn.execute(f"PRAGMA user_version = {SQLITE_MIGRATED}")
+    conn.commit()
+    return conn
+
+
+def now_stamp():
+    return datetime.now().strftime("%Y-%m-%d %H:%M")
+
+
+def field_text(values, field):
+    """One form/import field as stripped text ('' if missing)."""
+    value = values.get(field)
+    return '' if value is None else str(value).strip()
+
+
+def new_application(record_id, values, now=None):
+    """An application record in the shape the Add Application form saves."""
+    return {
+        'id': record_id,
+        'company': field_text(values, 'company'),
+        'role': field_text(values, 'role'),
+        'salary_range': field_text(values, 'salary_range'),
+        'date_applied': field_text(values, 'date_applied'),
+        'status': field_text(values, 'status') or "Applied",
+        'notes': field_text(values, 'notes'),
+        'last_updated': field_text(values, 'last_updated') or now or now_stamp(),
+        'version': 1
+    }
+
+
+def new_contact(record_id, values, now=None):
+    """A contact record in the shape the Add Contact form saves."""
+    return {
+        'id': record_id,
+        'name': field_text(values, 'name'),
+        'company': field_text(values, 'company'),
+        'role': field_text(values, 'role'),
+        'relationship': field_text(values, 'relationship') or "New Connection",
+        'notes': field_text(values, 'notes'),
+        'last_updated': field_text(values, 'last_updated') or now or now_stamp(),
+        'version': 1
+    }
+
+
+def application_errors(values):
+    errors = []
+    if not field_text(values, 'company'):
+        errors.append("Company Name is required")
+    if not field_text(values, 'role'):
+        errors.append("Job Title is required")
+    return errors
+
+
+def contact_errors(values):
+    return [] if field_text(values, 'name') else ["Name is required"]
+
+
+def application_key(values):
+    """Two applications are the same if company, role and date all match."""
+    return (field_text(values, 'company').casefold(), field_text(values, 'role').casefold(),
+            field_text(values, 'date_applied'))
+
+
+def contact_key(values):
+    return (field_text(values, 'name').casefold(), field_text(values, 'company').casefold())
+
+
+# kind -> (fields, build record, validation errors, duplicate key)
+RECORD_KINDS = {
+    'applications': (APPLICATION_FIELDS, new_application, application_errors, application_key),
+    'contacts': (CONTACT_FIELDS, new_contact, contact_errors, contact_key),
+}
+
+
+def file_format(path):
+    """'csv' or 'jsonl', from the file extension."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    raise ValueError(f"Unsupported file type '{extension}' - use .csv or .jsonl")
+
+
+def read_rows(path):
+    """Yield (line number, row) from a .csv or .jsonl file, one row at a time.
+
+    A JSON Lines row that doesn't parse comes through as None so the import
+    can report it instead of stopping.
+    """
+    fmt = file_format(path)
+    with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+        if fmt == 'csv':
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+            return
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield number, row
+
+
+def write_rows(path, records, fields):
+    """Stream records to a .csv or .jsonl file; returns how many were written."""
+    fmt = file_format(path)
+    defaults = [0 if field == 'version' else '' for field in fields]  # as SqliteStore.row_values
+    count = 0
+    temp_file = path + ".tmp"
+    with open(temp_file, 'w', newline='', encoding='utf-8') as f:
+        if fmt == 'csv':
+            writer = csv.writer(f)
+            writer.writerow(fields)
+            for record in records:
+                writer.writerow([record.get(field, default) for field, default in zip(fields, defaults)])
+                count += 1
+        else:
+            for record in records:
+                f.write(json.dumps({field: record.get(field, default) for field, default in zip(fields, defaults)}) + "\n")
+                count += 1
+    os.replace(temp_file, path)
+    return count
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def import_records(store, path, kind, batch_size=IMPORT_BATCH_SIZE):
+    """Add every valid, new row of a CSV/JSON Lines file to `store`.
+
+    The file is streamed in batches of batch_size rows: each batch is
+    validated, checked for duplicates (see application_key/contact_key)
+    against the store and the rows already imported, and saved with one
+    store.add_many. Ids in the file are ignored - new ones are allocated.
+    Returns counts plus the first MAX_IMPORT_ERRORS problems.
+    """
+    fields, build, errors_for, key_for = RECORD_KINDS[kind]
+    seen = {key_for(record) for record in store}
+    summary = {'imported': 0, 'duplicates': 0, 'invalid': 0, 'errors': []}
+
+    for batch in batched(read_rows(path), batch_size):
+        rows = []
+        for line, row in batch:
+            errors = errors_for(row) if isinstance(row, dict) else ["Not a JSON object"]
+            if errors:
+                summary['invalid'] += 1
+                if len(summary['errors']) < MAX_IMPORT_ERRORS:
+                    summary['errors'].append(f"line {line}: {'; '.join(errors)}")
+                continue
+            key = key_for(row)
+            if key in seen:
+                summary['duplicates'] += 1
+                continue
+            seen.add(key)
+            rows.append(row)
+
+        if rows:
+            now = now_stamp()
+            ids = store.allocate_ids(len(rows))
+            store.add_many([build(record_id, row, now) for record_id, row in zip(ids, rows)])
+            summary['imported'] += len(rows)
+    return summary
+
+
+def export_records(store, path, kind, filters=(), search=None):
+    """Write a store's records (optionally filtered, see query) to a .csv or .jsonl file."""
+    return write_rows(path, store.query(filters, search=search), RECORD_KINDS[kind][0])
+
+
+def file_signature(path):
+    """(inode, size, mtime) of a file, or None if it doesn't exist - changes whenever it's replaced or written."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def lock_file(f, blocking=True):
+    """Take an exclusive advisory lock on an open file; False if busy and not blocking."""
+    if fcntl is not None:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            return False
+        return True
+    while True:
+        f.seek(0)
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            if not blocking:
+                return False
+            time.sleep(0.05)
+
+
+def unlock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class FileLock:
+    """Advisory lock on <path>, shared by this process's threads and by other
+    processes using the same file.
+
+    Re-entrant for the thread holding it. Use `with lock:` to wait for it, or
+    acquire(blocking=False) to skip work when someone else has it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.thread_lock = threading.RLock()
+        self.depth = 0
+        self.file = None
+
+
+    def acquire(self, blocking=True):
+        if not self.thread_lock.acquire(blocking):
+            return False
+        if self.depth == 0:
+            if self.file is None:
+                self.file = open(self.path, 'a+b')
+            if not lock_file(self.file, blocking):
+                self.thread_lock.release()
+                return False
+        self.depth += 1
+        return True
+
+
+    def release(self):
+        self.depth -= 1
+        if self.depth == 0:
+            unlock_file(self.file)
+        self.thread_lock.release()
+
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+    def close(self):
+        with self.thread_lock:
+            if self.file is not None and self.depth == 0:
+                self.file.close()
+                self.file = None
+
+
+class UpdateConflict(Exception):
+    """An edit clashed with a change saved by another window or process.
+
+    `fields` are the fields both sides changed to different values and
+    `current` is the record as it is now (None if it was deleted).
+    """
+
+    def __init__(self, record_id, fields, current):
+        self.record_id = record_id
+        self.fields = list(fields)
+        self.current = current
+        if current is None:
+            message = f"Record {record_id} was deleted elsewhere"
+        else:
+            message = f"Record {record_id} was changed elsewhere: {', '.join(self.fields)}"
+        super().__init__(message)
+
+
+def merge_changes(current, changes, base):
+    """The changes to save on top of `current`, for an edit made to `base`.
+
+    If someone else saved the record since `base` was read, fields only one
+    side touched merge; a field both sides changed to different values raises
+    UpdateConflict.
+    """
+    if current is None:
+        raise UpdateConflict(base['id'], (), None)
+    if current.get('version', 0) == base.get('version', 0):
+        return dict(changes)
+    mine = {field: value for field, value in changes.items()
+            if field not in MERGE_IGNORED and value != base.get(field)}
+    clashes = [field for field, value in mine.items()
+               if current.get(field) != base.get(field) and current.get(field) != value]
+    if clashes:
+        raise UpdateConflict(current['id'], clashes, current)
+    if 'last_updated' in changes:
+        mine['last_updated'] = changes['last_updated']
+    return mine
+
+
+class JournalStore:
+    """Append-only change journal sitting in front of a JSON snapshot file.
+
+    Saving a record appends one line to <filename>.journal instead of rewriting
+    the whole snapshot, so a write costs one record. Once the journal passes
+    compact_threshold entries it is folded back into the snapshot. Loading
+    replays snapshot + journal.
+
+    Plain saves (put, put_many, delete) aren't written on the calling (Tk)
+    thread: entries are serialized and queued for a write-behind thread,
+    which takes everything queued since its last flush, keeps only the
+    newest entry per record, and appends it in one write + fsync.
+    Compaction runs on a thread of its own, so saves (and flush()) never
+    wait behind it. Two writes do happen on the caller's thread, each a
+    small locked write + fsync: reserve_ids (so every allocated id) updates
+    the .meta file, and put_now, used for edits checked against other
+    processes, appends its entry in the same lock hold as the check.
+
+    Call close() (also registered with atexit) to flush before exiting.
+    Lines a failed write couldn't save are kept in `unsaved` and go out
+    first with the next write, or after SAVE_RETRY_MS if nothing else is
+    saved; `error` stays set until they have.
+
+    Several processes can share the files. Appends and id reservations
+    happen under an advisory lock on <filename>.lock. Compaction holds it
+    only to move the journal aside to <journal>.old and, later, to swap in
+    the snapshot it rebuilt in between from the files on disk (not from this
+    process's memory); a second lock keeps two processes from compacting at
+    once. Each entry is tagged with the writing process, so read_changes()
+    can return just the other processes' entries since the last call by
+    reading the journal from where it left off.
+
+    The next free id is kept in <filename>.meta so that an id that was handed
+    out once is never reused, even after its record is deleted and compacted
+    away or by another process.
+    """
+
+    def __init__(self, filename, compact_threshold=COMPACT_THRESHOLD):
+        self.filename = filename
+        self.journal_file = filename + JOURNAL_SUFFIX
+        self.meta_file = filename + META_SUFFIX
+        self.rotated_file = self.journal_file + ".old"  # the journal a compaction is folding in
+        root, ext = os.path.splitext(filename)
+        self.compacted_file = root + ".compacting" + ext  # same suffix, so the same format
+        self.compact_threshold = compact_threshold
+        self.entries = 0
+        self.next_id = 1  # filled in by load()
+        self.progress = 0.0
+
+        self.lock = FileLock(filename + LOCK_SUFFIX)
+        self.compact_lock = FileLock(filename + ".compact" + LOCK_SUFFIX)
+        self.token = uuid.uuid4().hex[:12]  # marks this process's journal entries
+        self.snapshot_id = None  # file_signature() of the snapshot last loaded
+        self.journal_inode = None
+        self.offset = 0          # bytes of the journal already read
+        self.rotated_id = None   # file_signature() of the .old journal when last read
+        self.pending = []        # other processes' entries picked up by a compaction
+        self.stale = False       # snapshot replaced by another process - load() again
+
+        self.queue = queue.Queue()
+        self.writer = None      # started on the first write
+        self.compactor = None   # thread started by maybe_compact
+        self.compacting = False
+        self.flushes = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.error = None
+        self.unsaved = {}  # record id -> line a failed write left behind; only touched under self.lock
+
+
+    def load(self):
+        # Snapshot and journal are opened together under the lock so they
+        # match; the (possibly large) snapshot is parsed after releasing it.
+        # Not timed as 'load' here: compaction calls this too, so the
+        # callers loading records for use time it instead.
+        with self.lock:
+            snapshot = self._open_snapshot()
+            changes = self.read_journal()
+        loaded = []
+        if snapshot is not None:
+            with snapshot:
+                loaded = snapshot.read_all() if isinstance(snapshot, SnapshotReader) else json.load(snapshot)
+        return self._replay(loaded, changes)
+
+
+    def _replay(self, loaded, changes):
+        # The snapshot's records with {id: record or None} applied.
+        records = {}
+        for record in loaded:
+            records[record['id']] = record
+        self.next_id = max(self.next_id, max(records, default=0) + 1)
+
+        for record_id, record in changes.items():
+            if record is None:
+                records.pop(record_id, None)
+            else:
+                records[record_id] = record
+        return list(records.values())
+
+
+    def iter_load(self, first_page=FIRST_PAGE_SIZE, page_size=PAGE_SIZE):
+        """Same result as load(), streamed as pages of records.
+
+        The first page is small so the list can be shown right away. Sets
+        self.progress (0.0 - 1.0) as it goes; safe to run on a worker thread.
+        """
+        self.progress = 0.0
+        with self.lock:
+            snapshot = self._open_snapshot()
+            changes = self.read_journal()
+        page, size = [], first_page
+        if snapshot is not None:
+            with snapshot:
+                if isinstance(snapshot, SnapshotReader):
+                    items = snapshot.iter_progress()
+                else:
+                    items = iter_json_array(self.filename, f=snapshot)
+                for record, self.progress in items:
+                    record_id = record['id']
+                    self.next_id = max(self.next_id, record_id + 1)
+                    if record_id in changes:
+                        record = changes.pop(record_id)
+                        if record is None:
+                            continue
+                    page.append(record)
+                    if len(page) >= size:
+                        yield page
+                        page, size = [], page_size
+
+        # Whatever is left in the journal are records added since the snapshot.
+        page.extend(record for record in changes.values() if record is not None)
+        self.progress = 1.0
+        yield page
+
+
+    def _open_snapshot(self):
+        # open_snapshot(), noting which snapshot this process has loaded.
+        self.stale = False
+        self.pending = []
+        self.snapshot_id = file_signature(self.filename)
+        return open_snapshot(self.filename)
+
+
+    def read_journal(self):
+        """Collect journaled changes as {id: record, or None if deleted}."""
+        self.next_id = max(self.next_id, self.read_meta())
+
+        # An .old journal belongs to a compaction that is running or was
+        # interrupted - its entries may not be in the snapshot yet, so
+        # replay it first.
+        changes = {}
+        entries, _ = self._read_entries(self.rotated_file, 0)
+        self._fold(entries, changes)
+        self.rotated_id = file_signature(self.rotated_file)
+        entries, self.offset = self._read_entries(self.journal_file, 0)
+        self._fold(entries, changes)
+        self.entries = len(entries)
+        signature = file_signature(self.journal_file)
+        self.journal_inode = signature[0] if signature else None
+        return changes
+
+
+    def read_meta(self):
+        if not os.path.exists(self.meta_file):
+            return 1
+        with open(self.meta_file, 'r') as f:
+            return json.load(f)['next_id']
+
+
+    def _read_entries(self, path, offset):
+        """Parse journal entries from byte `offset` on; returns (entries, new offset)."""
+        if not os.path.exists(path):
+            return [], offset
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1  # an unfinished last line waits for the next read
+        entries = []
+        for line in data[:end].splitlines():
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue  # torn line from a crash mid-append
+        return entries, offset + end
+
+
+    def _fold(self, entries, changes):
+        for entry in entries:
+            if entry['op'] == 'put':
+                record_id = entry['record']['id']
+                changes[record_id] = entry['record']
+            elif entry['op'] == 'delete':
+                record_id = entry['id']
+                changes[record_id] = None
+            self.next_id = max(self.next_id, record_id + 1)
+
+
+    def read_changes(self, blocking=True):
+        """Entries other processes have journaled since the last load or call.
+
+        Returns None if the snapshot was compacted by another process in the
+        meantime, in which case the records have to be load()ed again. With
+        blocking=False, returns [] straight away if the lock is busy.
+        Checking costs one stat() when nothing has changed.
+        """
+        if not self.lock.acquire(blocking):
+            return []
+        try:
+            if self.stale:
+                return None
+            rotated = []
+            if self._rotated_away():
+                # Another process started compacting: the rest of the journal
+                # we were reading is in the .old file now.
+                new_entries, _ = self._read_entries(self.rotated_file, self.offset)
+                rotated = [entry for entry in new_entries if entry.get('by') != self.token]
+                self.rotated_id = file_signature(self.rotated_file)
+                self.journal_inode = None
+                self.offset = 0
+            if self._replaced():
+                return None
+            entries, self.pending = self.pending + rotated, []
+            signature = file_signature(self.journal_file)
+            if signature is not None and signature[1] > self.offset:
+                new_entries, self.offset = self._read_entries(self.journal_file, self.offset)
+                self.journal_inode = signature[0]
+                self.entries += len(new_entries)
+                entries += [entry for entry in new_entries if entry.get('by') != self.token]
+            return entries
+        finally:
+            self.lock.release()
+
+
+    def _replaced(self):
+        """True if another process swapped the snapshot or journal out from under us."""
+        if file_signature(self.filename) != self.snapshot_id or file_signature(self.rotated_file) != self.rotated_id:
+            return True
+        signature = file_signature(self.journal_file)
+        if signature is None:
+            return self.offset > 0
+        return ((self.journal_inode is not None and signature[0] != self.journal_inode)
+                or signature[1] < self.offset)
+
+
+    def _rotated_away(self):
+        """True if a compaction has just moved the journal being read to .old."""
+        signature = file_signature(self.rotated_file)
+        if signature is None or self.rotated_id is not None:
+            return False
+        if self.journal_inode is None:
+            return self.offset == 0  # none of it read yet, so all of it is new
+        return signature[0] == self.journal_inode
+
+
+    def reserve_ids(self, next_id, count=1):
+        """Claim `count` consecutive ids, starting at next_id or the highest id
+        any process has claimed, whichever is larger. Returns the first one.
+
+        Writes the .meta file before returning, on the caller's thread, so
+        no other process can be handed the same ids."""
+        with self.lock:
+            first = max(next_id, self.read_meta())
+            save_data(self.meta_file, {'next_id': first + count})
+        return first
+
+
+    def put(self, record):
+        """Journal the current state of one added or edited record."""
+        self._append(record['id'], {'op': 'put', 'record': record})
+
+
+    def put_many(self, records):
+        """Journal a batch of records; the writer flushes them in one write."""
+        lines = [(record['id'], self._line({'op': 'put', 'record': record})) for record in records]
+        self.entries += len(lines)
+        self._submit(('lines', lines))
+
+
+    def put_now(self, record):
+        """Journal a record synchronously, on the caller's thread. For callers
+        holding self.lock after flush(), so the write lands before anyone else's."""
+        self.entries += 1
+        self._guarded(self._write_lines, {record['id']: self._line({'op': 'put', 'record': record})})
+        if self.unsaved:
+            self._submit(('lines', []))  # so the writer thread retries it
+
+
+    def delete(self, record_id):
+        self._append(record_id, {'op': 'delete', 'id': record_id})
+
+
+    def _append(self, record_id, entry):
+        self.entries += 1
+        self._submit(('lines', [(record_id, self._line(entry))]))
+
+
+    def _line(self, entry):
+        # Serialize now: the record may change again before the writer runs.
+        entry['by'] = self.token
+        return json.dumps(entry, separators=(',', ':'), default=record_to_json) + "\n"
+
+
+    def maybe_compact(self):
+        """Fold the journal into the snapshot once it has grown large enough."""
+        if self.entries < self.compact_threshold or self.compacting:
+            return
+        self.compacting = True
+        self.entries = 0
+        self.compactor = threading.Thread(target=self._compact, daemon=True)
+        self.compactor.start()
+
+
+    def _submit(self, item):
+        if self.writer is None:
+            self.writer = threading.Thread(target=self._write_loop, daemon=True)
+            self.writer.start()
+            atexit.register(self.close)
+        self.queue.put(item)
+
+
+    def busy(self):
+        """True while queued (or failed) writes haven't reached the file yet."""
+        return self.queue.unfinished_tasks > 0 or bool(self.unsaved)
+
+
+    def flush(self):
+        """Wait until everything queued so far is written."""
+        if self.writer is not None:
+            self.queue.join()
+
+
+    def finish_compaction(self):
+        """Wait for a compaction maybe_compact() started to finish."""
+        if self.compactor is not None:
+            self.compactor.join()
+
+
+    def close(self):
+        """Write everything still queued and stop the writer thread."""
+        if self.writer is not None:
+            self.queue.put(None)
+            self.writer.join()
+            self.writer = None
+        self.finish_compaction()
+        self.lock.close()
+        self.compact_lock.close()
+
+
+    def stats(self):
+        return {'queue_depth': self.queue.qsize(), 'flushes': self.flushes,
+                'last_flush_ms': self.last_flush_ms, 'max_flush_ms': self.max_flush_ms,
+                'unsaved': len(self.unsaved), 'error': self.error}
+
+
+    def _write_loop(self):
+        running = True
+        while running:
+            try:
+                # With unsaved lines, wake up to retry them even if nothing new is queued.
+                batch = [self.queue.get(timeout=SAVE_RETRY_MS / 1000 if self.unsaved else None)]
+            except queue.Empty:
+                batch = []
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = {}  # record id -> newest line; rapid re-saves coalesce here
+            try:
+                for item in batch:
+                    if item is None:
+                        running = False
+                        break
+                    for record_id, line in item[1]:
+                        lines.pop(record_id, None)  # keep entries in order of last save
+                        lines[record_id] = line
+                self._guarded(self._write_lines, lines)
+            finally:
+                for item in batch:
+                    self.queue.task_done()
+
+
+    def _guarded(self, step, *args):
+        # A failed step is reported, not raised, so the rest of the batch still runs.
+        try:
+            step(*args)
+        except OSError as exc:
+            self.error = f"{type(exc).__name__}: {exc}"
+            if self.unsaved:
+                self.error += f" ({len(self.unsaved)} changes not saved yet)"
+            print(f"Job Tracker: saving {self.filename} failed - {self.error}", file=sys.stderr)
+
+
+    def _write_lines(self, lines):
+        with self.lock:
+            # Whatever an earlier write failed to save goes first; a newer
+            # line for the same record replaces it.
+            retry = bool(self.unsaved)
+            pending = dict(self.unsaved)
+            for record_id, line in lines.items():
+                pending.pop(record_id, None)
+                pending[record_id] = line
+            if not pending:
+                return
+            started = time.perf_counter()
+            try:
+                with open(self.journal_file, 'a') as f:
+                    # After a failed write the last line may be torn; start a fresh one.
+                    f.write(("\n" if retry else "") + "".join(pending.values()))
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError:
+                self.unsaved = pending
+                raise
+            self.unsaved = {}
+        self.last_flush_ms = (time.perf_counter() - started) * 1000
+        self.max_flush_ms = max(self.max_flush_ms, self.last_flush_ms)
+        self.flushes += 1
+        self.error = None
+        instruments.record('save', self.last_flush_ms)
+
+
+    @instrumented('compact')
+    def _compact(self):
+        try:
+            self._guarded(self._rebuild_snapshot)
+        finally:
+            self.compacting = False
+
+
+    def _rebuild_snapshot(self):
+        if not self.compact_lock.acquire(blocking=False):
+            return  # another process is compacting; this journal goes with it
+        try:
+            with self.lock:
+                # Entries other processes wrote that this one hasn't read yet are
+                # about to leave the journal - keep them for read_changes().
+                if self.stale or self._replaced():
+                    self.stale = True
+                else:
+                    entries, self.offset = self._read_entries(self.journal_file, self.offset)
+                    self.pending += [entry for entry in entries if entry.get('by') != self.token]
+                self._rotate_journal()
+
+            # Only compaction changes the snapshot and the .old journal, so the
+            # new snapshot is built without the shared lock: saves meanwhile go
+            # to a fresh journal, and loads replay .old before it. Rebuilt from
+            # the files, not memory, so every process's changes are kept.
+            changes = {}
+            self._fold(self._read_entries(self.rotated_file, 0)[0], changes)
+            snapshot = open_snapshot(self.filename)
+            if snapshot is None:
+                records = self._replay([], changes)
+            else:
+                with snapshot:
+                    # Streamed: one json.load of a big snapshot holds the GIL,
+                    # and with it the Tk thread, for the whole parse.
+                    items = (snapshot.iter_progress() if isinstance(snapshot, SnapshotReader)
+                             else iter_json_array(self.filename, f=snapshot))
+                    records = self._replay((record for record, progress in items), changes)
+            save_data(self.compacted_file, records)
+
+            with self.lock:
+                os.replace(self.compacted_file, self.filename)
+                # The .old journal may hold deletes of the highest ids, so the
+                # counter has to be on disk before that journal goes away.
+                save_data(self.meta_file, {'next_id': max(self.next_id, self.read_meta())})
+                if os.path.exists(self.rotated_file):
+                    os.remove(self.rotated_file)
+                self.snapshot_id = file_signature(self.filename)
+                self.rotated_id = None
+        finally:
+            self.compact_lock.release()
+
+
+    def _rotate_journal(self):
+        # Under self.lock: the journal becomes .old and saves start a new one.
+        if os.path.exists(self.journal_file):
+            if os.path.exists(self.rotated_file):
+                # An earlier compaction never finished; keep its entries ahead of these.
+                with open(self.journal_file, 'r') as src, open(self.rotated_file, 'a') as dst:
+                    dst.write("\n" + src.read())  # its last line may be torn
+                os.remove(self.journal_file)
+            else:
+                os.replace(self.journal_file, self.rotated_file)
+        self.rotated_id = file_signature(self.rotated_file)
+        self.journal_inode = None
+        self.offset = 0
+
+
+class RecordStore:
+    """In-memory record list that persists through a JournalStore and tells
+    subscribers about every change.
+
+    Records are indexed by id so lookups are O(1), and ids come from a
+    monotonic counter (see allocate_id) instead of scanning for the max.
+    With a record_class (Application/Contact) records are kept in that
+    compact form; otherwise they stay plain dicts.
+    Listeners are called as listener(event, record) where event is 'insert',
+    'update' or 'delete', so views can apply just that change instead of
+    rebuilding from the whole list. After a full reload they get
+    ('reload', None) instead.
+
+    Other processes may be editing the same file; call refresh() now and
+    then to pick up their changes, and pass `base` to update() to catch
+    conflicting edits.
+
+    Set `history` to a HistoryLog to have every add, edit and delete made
+    through this store logged there.
+    """
+
+    history = None
+
+    def __init__(self, filename, lazy=False, search_fields=None, record_class=None):
+        self.journal = JournalStore(filename)
+        self.record_class = record_class
+        self.listeners = []
+        self.pages = None
+        if lazy:
+            # Filled in page by page - see start_loading/load_pending.
+            self.records = []
+            self.loading = True
+        else:
+            with instruments.timed('load'):
+                self.records = self.convert(self.journal.load())
+            self.loading = False
+        self.index = {record['id']: record for record in self.records}
+        self.next_id = self.journal.next_id
+
+        self.sort_keys = SortKeyCache()
+        self.subscribe(self.sort_keys.record_changed)
+
+        # The window builds the search index page by page as records load;
+        # scripts and commands, which mostly never search, on the first search().
+        self.search_fields = search_fields
+        self.search_index = None
+        if lazy and search_fields:
+            self.build_search_index()
+
+
+    def start_loading(self):
+        """Read the file on a worker thread; the pages are applied by load_pending()."""
+        self.pages = queue.Queue(maxsize=4)  # bounded so the reader can't run far ahead
+
+        def reader():
+            with instruments.timed('load'):
+                for page in self.journal.iter_load():
+                    self.pages.put(self.convert(page))
+            self.pages.put(None)
+
+        threading.Thread(target=reader, daemon=True).start()
+
+
+    def load_pending(self):
+        """Add any pages the reader has finished. Call on the Tk thread.
+
+        Returns True once everything is loaded.
+        """
+        while self.loading:
+            try:
+                page = self.pages.get_nowait()
+            except queue.Empty:
+                break
+            if page is None:
+                self.loading = False
+                self.next_id = max(self.next_id, self.journal.next_id)
+                break
+            for record in page:
+                self.records.append(record)
+                self.index[record['id']] = record
+                self.notify('insert', record)
+        return not self.loading
+
+
+    def progress(self):
+        return self.journal.progress if self.loading else 1.0
+
+
+    def close(self):
+        self.journal.close()
+
+
+    def stats(self):
+        return self.journal.stats()
+
+
+    def convert(self, records):
+        if self.record_class is None:
+            return records
+        return [self.record_class.from_dict(record) for record in records]
+
+
+    def __len__(self):
+        return len(self.records)
+
+
+    def __iter__(self):
+        return iter(self.records)
+
+
+    def detached(self):
+        """The records, for another thread to go through while this one keeps changing the store."""
+        return list(self.records)
+
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+
+    def unsubscribe(self, listener):
+        self.listeners.remove(listener)
+
+
+    def notify(self, event, record):
+        for listener in self.listeners:
+            listener(event, record)
+
+
+    def get(self, record_id):
+        return self.index.get(record_id)
+
+
+    def allocate_id(self):
+        """Hand out the next id. Ids are never reused, even after a delete."""
+        if self.loading:
+            raise RuntimeError("Records are still loading")
+        record_id = self.journal.reserve_ids(self.next_id)
+        self.next_id = record_id + 1
+        return record_id
+
+
+    def allocate_ids(self, count):
+        """Hand out `count` consecutive ids at once, as a range."""
+        if self.loading:
+            raise RuntimeError("Records are still loading")
+        first = self.journal.reserve_ids(self.next_id, count)
+        self.next_id = first + count
+        return range(first, first + count)
+
+
+    def add(self, record):
+        if self.record_class is not None:
+            record = self.record_class.from_dict(record)
+        if record['id'] in self.index:
+            raise ValueError(f"Duplicate record id {record['id']}")
+        if self.history is not None:
+            self.history.record(record['id'], history_fields(record))
+        self.next_id = max(self.next_id, record['id'] + 1)
+        self.records.append(record)
+        self.index[record['id']] = record
+        self.persist(record)
+        self.notify('insert', record)
+        return record
+
+
+    def add_many(self, records):
+        """Add a batch of new records with a single journal write."""
+        if self.record_class is not None:
+            records = [self.record_class.from_dict(record) for record in records]
+        for record in records:
+            if record['id'] in self.index:
+                raise ValueError(f"Duplicate record id {record['id']}")
+        if self.history is not None:
+            self.history.record_many((record['id'], history_fields(record)) for record in records)
+        for record in records:
+            self.next_id = max(self.next_id, record['id'] + 1)
+            self.records.append(record)
+            self.index[record['id']] = record
+        # No compaction here: during a bulk import every batch would rewrite
+        # the whole snapshot. The next single save folds the journal in.
+        self.journal.put_many(records)
+        for record in records:
+            self.notify('insert', record)
+        return records
+
+
+    def update(self, record_id, changes, base=None):
+        """Apply changes to a record and bump its version.
+
+        Pass `base`, the record as it was when the edit started, to have the
+        change checked against other processes: their saves are read in
+        first, and the edit is merged or rejected with UpdateConflict (see
+        merge_changes). That check and the journal write happen together
+        under the file lock. Without `base` the changes simply overwrite.
+        """
+        if base is None:
+            record = self.get(record_id)
+            self.log_changes(record, changes)
+            record.update(dict(changes, version=record.get('version', 0) + 1))
+            self.persist(record)
+            self.notify('update', record)
+            return record
+
+        self.journal.flush()  # our own queued writes go first
+        with self.journal.lock:
+            self.refresh()
+            record = self.get(record_id)
+            changes = merge_changes(record, changes, base)
+            self.log_changes(record, changes)
+            record.update(dict(changes, version=record.get('version', 0) + 1))
+            self.journal.put_now(record)
+        self.journal.maybe_compact()
+        self.notify('update', record)
+        return record
+
+
+    def log_changes(self, record, changes):
+        if self.history is not None:
+            fields = changed_fields(record, changes)
+            if fields:
+                self.history.record(record['id'], fields)
+
+
+    def delete(self, record_id):
+        if self.history is not None and record_id in self.index:
+            self.history.record(record_id, None)
+        record = self.index.pop(record_id)
+        self.remove_record(record)
+        self.journal.delete(record_id)
+        if not self.loading:
+            self.journal.maybe_compact()
+        self.notify('delete', record)
+
+
+    def remove_record(self, record):
+        # By identity: list.remove() would call Record.__eq__ (two to_dict()s)
+        # on every record in front of it.
+        for position, candidate in enumerate(self.records):
+            if candidate is record:
+                del self.records[position]
+                return
+
+
+    def persist(self, record):
+        self.journal.put(record)
+        if not self.loading:
+            self.journal.maybe_compact()
+
+
+    def refresh(self, blocking=True):
+        """Apply changes other processes have saved since we last looked.
+
+        Usually that means reading just the new end of the journal; only
+        after another process compacted the file is everything re-read (see
+        reload). Returns True if anything changed. With blocking=False this
+        gives up rather than wait for the file lock.
+        """
+        if self.loading or self.journal.busy():
+            return False  # our own queued writes would race with theirs
+        entries = self.journal.read_changes(blocking)
+        if entries is None:
+            self.reload()
+            return True
+        for entry in entries:
+            self.apply_entry(entry)
+        return bool(entries)
+
+
+    def apply_entry(self, entry):
+        """Apply one journal entry written by another process."""
+        if entry['op'] == 'delete':
+            record = self.index.pop(entry['id'], None)
+            if record is not None:
+                self.remove_record(record)
+                self.notify('delete', record)
+            return
+
+        data = entry['record']
+        record = self.index.get(data['id'])
+        if record is None:
+            record = self.convert([data])[0]
+            self.next_id = max(self.next_id, record['id'] + 1)
+            self.records.append(record)
+            self.index[record['id']] = record
+            self.notify('insert', record)
+        else:
+            record.update(data)
+            self.notify('update', record)
+
+
+    def reload(self):
+        """Re-read all records, e.g. after another process compacted the file.
+
+        Listeners get a single ('reload', None) event.
+        """
+        with instruments.timed('load'):
+            self.records = self.convert(self.journal.load())
+        self.index = {record['id']: record for record in self.records}
+        self.next_id = max(self.next_id, self.journal.next_id)
+        if self.search_index is not None:
+            self.search_index.clear()
+            for record in self.records:
+                self.search_index.add(record)
+        self.notify('reload', None)
+
+
+    def query(self, filters=(), order_by=None, descending=False, search=None):
+        """Records matching all (field, op, value) filters, optionally sorted.
+
+        op is one of '=', 'in', '>=', '<=' or 'like' (case-insensitive
+        substring). Range filters and sorting on dates and salaries use the
+        parsed value (see FIELD_PARSERS). With `search` text, only search
+        hits are returned, best first unless order_by is given.
+        SqliteStore.query takes the same arguments.
+        """
+        rows = self.search(search) if search else self
+        if not filters and not order_by:
+            return rows
+        if filters:
+            filters = parse_bounds(filters)
+            rows = [r for r in rows if record_matches(r, filters, self.sort_keys.get)]
+        else:
+            rows = list(rows)
+        if order_by:
+            rows.sort(key=self.sort_keys.key_for(order_by), reverse=descending)
+        return rows
+
+
+    def build_search_index(self):
+        """Index the records for search(); store events keep it current after that."""
+        self.search_index = SearchIndex(self.search_fields)
+        for record in self.records:
+            self.search_index.add(record)
+        self.subscribe(self.search_index.record_changed)
+
+
+    @instrumented('search')
+    def search(self, text):
+        """Records matching every word of `text` (as a prefix), best match first."""
+        if self.search_index is None:
+            self.build_search_index()
+        ranked = self.search_index.search(text)
+        if ranked is None:
+            return self
+        return [self.index[record_id] for record_id in ranked]
+
+
+class SortKeyCache:
+    """Sort keys per field and record id, computed once and dropped when the
+    record changes.
+
+    Re-sorting by date or salary then doesn't re-parse every string, only the
+    records edited since the last sort.
+    """
+
+    def __init__(self):
+        self.keys = {}  # field -> {record id: sort_key(...)}
+
+
+    def record_changed(self, event, record):
+        if event == 'reload':
+            self.keys.clear()
+            return
+        for keys in self.keys.values():
+            keys.pop(record['id'], None)
+
+
+    def get(self, field, record):
+        keys = self.keys.setdefault(field, {})
+        key = keys.get(record['id'])
+        if key is None:
+            key = keys[record['id']] = sort_key(field, record.get(field, ''))
+        return key
+
+
+    def key_for(self, field):
+        """A key function for list.sort over records."""
+        keys = self.keys.setdefault(field, {})
+
+        def key(record):
+            value = keys.get(record['id'])
+            if value is None:
+                value = keys[record['id']] = sort_key(field, record.get(field, ''))
+            return value
+        return key
+
+
+class SearchIndex:
+    """Inverted index behind the search boxes, kept current from store events.
+
+    Maps each lowercased word to the ids of the records containing it, with
+    the weight of the best field it appears in. A sorted copy of the
+    vocabulary lets each query word match as a prefix with a binary search,
+    so typing "bent" finds "bentley".
+    """
+
+    RANK_LIMIT = 1000
+
+    def __init__(self, field_weights):
+        self.field_weights = field_weights
+        self.postings = {}      # word -> {record id: weight}
+        self.words = []         # sorted vocabulary, for prefix lookups
+        self.record_words = {}  # record id -> its words, so edits can be undone
+
+
+    def record_changed(self, event, record):
+        if event == 'reload':
+            return  # RecordStore.reload rebuilds the index itself
+        self.remove(record['id'])
+        if event != 'delete':
+            self.add(record)
+
+
+    def clear(self):
+        self.postings.clear()
+        self.words.clear()
+        self.record_words.clear()
+
+
+    def add(self, record):
+        # Runs for every record during loading, hence the plain loops.
+        words = {}
+        for field, weight in self.field_weights.items():
+            value = record.get(field)
+            if value:
+                for word in WORD_RE.findall(value.lower()):
+                    if words.get(word, 0) < weight:
+                        words[word] = weight
+
+        record_id = record['id']
+        postings = self.postings
+        for word, weight in words.items():
+            posting = postings.get(word)
+            if posting is None:
+                posting = postings[word] = {}
+                bisect.insort(self.words, word)
+            posting[record_id] = weight
+        self.record_words[record_id] = words
+
+
+    def remove(self, record_id):
+        for word in self.record_words.pop(record_id, ()):
+            posting = self.postings[word]
+            del posting[record_id]
+            if not posting:
+                del self.postings[word]
+                del self.words[bisect.bisect_left(self.words, word)]
+
+
+    def search(self, text):
+        """Ids matching all words in `text`, best match first.
+
+        Returns None for an empty query. Matching is done with set operations
+        over the postings; only result sets up to RANK_LIMIT are ranked (a
+        whole-word match scores double a prefix match), larger ones - a
+        one-letter query, say - come back in id order.
+        """
+        terms = set(tokenize(text))
+        if not terms:
+            return None
+
+        matches = None
+        for term in terms:
+            lo = bisect.bisect_left(self.words, term)
+            hi = bisect.bisect_left(self.words, term + "\U0010ffff")
+            ids = set().union(*(self.postings[word] for word in self.words[lo:hi]))
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                return []
+
+        if len(matches) > self.RANK_LIMIT:
+            return sorted(matches)
+
+        scores = {}
+        for record_id in matches:
+            words = self.record_words[record_id]
+            score = 0
+            for term in terms:
+                score += max(weight * (2 if word == term else 1)
+                             for word, weight in words.items() if word.startswith(term))
+            scores[record_id] = score
+        return sorted(matches, key=lambda record_id: (-scores[record_id], record_id))
+
+
+def week_start(day):
+    """Day number -> day number of the Monday starting its week."""
+    return day - (day - 1) % 7  # day 1 (0001-01-01) was a Monday
+
+
+def median_of_sorted(values):
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2
+
+
+def parsed_value(record, field):
+    """FIELD_PARSERS[field] applied to record[field] - free for a Record
+    field already packed into the same int."""
+    if isinstance(record, Record):
+        value = getattr(record, field, None)
+        if type(value) is int and field in record.UNPACKERS:
+            return value
+    return FIELD_PARSERS[field](record.get(field) or '')
+
+
+def pipeline_contribution(record, since=None):
+    """What one application adds to the pipeline stats:
+    (status, week applied, salary bucket, minute it entered its status)."""
+    day = parsed_value(record, 'date_applied')
+    salary = parsed_value(record, 'salary_range')
+    if since is None:
+        since = parsed_value(record, 'last_updated')
+    return (record.get('status', ''),
+            week_start(day) if day is not None else None,
+            int(salary // SALARY_BUCKET) * SALARY_BUCKET if salary is not None else None,
+            since)
+
+
+def pipeline_summary(total, responded, status_counts, weekly, salary_buckets, median_since, now):
+    return {
+        'total': total,
+        'response_rate': responded / total if total else 0.0,
+        'status_counts': dict(status_counts),
+        'weekly': {date.fromordinal(week).isoformat(): count for week, count in sorted(weekly.items())},
+        'median_days_in_status': {status: round((now - since) / 1440, 2)
+                                  for status, since in sorted(median_since.items())},
+        'salary_buckets': dict(sorted(salary_buckets.items())),
+    }
+
+
+def compute_pipeline_stats(records, since=None, now=None):
+    """PipelineStats.summary() the slow way, by scanning every record.
+
+    For checking the incremental numbers. `since` maps record id -> minute
+    the record entered its status, for records where that isn't last_updated.
+    """
+    since = since or {}
+    now = parse_timestamp(now_stamp()) if now is None else now
+    total = responded = 0
+    status_counts, weekly, salary_buckets, entered = {}, {}, {}, {}
+    for record in records:
+        status, week, bucket, minute = pipeline_contribution(record, since.get(record['id']))
+        total += 1
+        if status not in RESPONSE_EXCLUDED:
+            responded += 1
+        status_counts[status] = status_counts.get(status, 0) + 1
+        if week is not None:
+            weekly[week] = weekly.get(week, 0) + 1
+        if bucket is not None:
+            salary_buckets[bucket] = salary_buckets.get(bucket, 0) + 1
+        if minute is not None:
+            entered.setdefault(status, []).append(minute)
+    median_since = {status: median_of_sorted(sorted(minutes)) for status, minutes in entered.items()}
+    return pipeline_summary(total, responded, status_counts, weekly, salary_buckets, median_since, now)
+
+
+class PipelineStats:
+    """Application pipeline numbers for the stats window, kept current from
+    store events instead of rescanning the records on every open.
+
+    Counts per status, per week applied and per salary bucket are plain
+    counters; time in status keeps, per status, a sorted list of the minutes
+    records entered it, so the median is an index lookup. Each record's
+    contribution is remembered so an update can take the old one back out.
+    A record entered its status at last_updated unless an update was seen
+    that left the status alone, in which case the earlier time is kept.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.rebuild()
+        store.subscribe(self.record_changed)
+
+
+    def rebuild(self):
+        self.total = 0
+        self.responded = 0
+        self.status_counts = {}
+        self.weekly = {}          # Monday's day number -> applications
+        self.salary_buckets = {}  # bucket floor -> applications
+        self.entered = {}         # status -> sorted minutes records entered it
+        self.contributions = {}   # record id -> pipeline_contribution()
+        for record in self.store:
+            self.add(record, bulk=True)
+        for minutes in self.entered.values():
+            minutes.sort()
+
+
+    def record_changed(self, event, record):
+        if event == 'reload':
+            self.rebuild()
+            return
+        old = self.contributions.get(record['id'])
+        if old is not None:
+            self.remove(record['id'])
+        if event != 'delete':
+            # Editing other fields doesn't restart the clock on the status.
+            same_status = old is not None and old[0] == record.get('status', '')
+            self.add(record, old[3] if same_status else None)
+
+
+    def add(self, record, since=None, bulk=False):
+        """Count a record in. With bulk=True the entered lists are left for
+        the caller to sort, which beats inserting in order one by one."""
+        status, week, bucket, minute = contribution = pipeline_contribution(record, since)
+        self.contributions[record['id']] = contribution
+        self.total += 1
+        if status not in RESPONSE_EXCLUDED:
+            self.responded += 1
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        if week is not None:
+            self.weekly[week] = self.weekly.get(week, 0) + 1
+        if bucket is not None:
+            self.salary_buckets[bucket] = self.salary_buckets.get(bucket, 0) + 1
+        if minute is not None:
+            if bulk:
+                self.entered.setdefault(status, []).append(minute)
+            else:
+                bisect.insort(self.entered.setdefault(status, []), minute)
+
+
+    def remove(self, record_id):
+        status, week, bucket, minute = self.contributions.pop(record_id)
+        self.total -= 1
+        if status not in RESPONSE_EXCLUDED:
+            self.responded -= 1
+        decrement(self.status_counts, status)
+        if week is not None:
+            decrement(self.weekly, week)
+        if bucket is not None:
+            decrement(self.salary_buckets, bucket)
+        if minute is not None:
+            minutes = self.entered[status]
+            del minutes[bisect.bisect_left(minutes, minute)]
+            if not minutes:
+                del self.entered[status]
+
+
+    def summary(self, now=None):
+        """All the numbers at once; cost depends on the number of statuses,
+        weeks and buckets, not on the number of records."""
+        now = parse_timestamp(now_stamp()) if now is None else now
+        median_since = {status: median_of_sorted(minutes) for status, minutes in self.entered.items()}
+        return pipeline_summary(self.total, self.responded, self.status_counts, self.weekly,
+                                self.salary_buckets, median_since, now)
+
+
+class SqlitePipelineStats:
+    """PipelineStats for a SqliteStore, as GROUP BY queries run on each
+    summary() - nothing is held in Python, so commits from other
+    connections cost nothing until the numbers are asked for.
+
+    The minute each application entered its status is the status_since
+    column, which SqliteStore.update keeps through edits that leave the
+    status alone.
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+
+    def summary(self, now=None):
+        now = parse_timestamp(now_stamp()) if now is None else now
+        conn, table = self.store.conn, self.store.table
+        counts = conn.execute(f"SELECT status, COUNT(*), COUNT(status_since) FROM {table} GROUP BY status").fetchall()
+        status_counts = {status: count for status, count, timed in counts}
+        total = sum(status_counts.values())
+        responded = sum(count for status, count in status_counts.items() if status not in RESPONSE_EXCLUDED)
+        # Grouped by the indexed values, then bucketed here once per distinct value.
+        weekly = {}
+        for applied, count in conn.execute(f"SELECT date_applied, COUNT(*) FROM {table} GROUP BY date_applied"):
+            day = parse_date(applied)
+            if day is not None:
+                weekly[week_start(day)] = weekly.get(week_start(day), 0) + count
+        salary_buckets = {}
+        for salary, count in conn.execute(f"SELECT salary_value, COUNT(*) FROM {table} "
+                                          "WHERE salary_value IS NOT NULL GROUP BY salary_value"):
+            bucket = int(salary // SALARY_BUCKET) * SALARY_BUCKET
+            salary_buckets[bucket] = salary_buckets.get(bucket, 0) + count
+        median_since = {}
+        for status, count, timed in counts:
+            if timed:
+                # The middle one or two, read off the (status, status_since) index.
+                middle = [row[0] for row in conn.execute(
+                    f"SELECT status_since FROM {table} WHERE status = ? AND status_since IS NOT NULL "
+                    "ORDER BY status_since LIMIT ? OFFSET ?", (status, 2 - timed % 2, (timed - 1) // 2))]
+                median_since[status] = median_of_sorted(middle)
+        return pipeline_summary(total, responded, status_counts, weekly, salary_buckets, median_since, now)
+
+
+def pipeline_stats(store):
+    """PipelineStats for `store`, or SqlitePipelineStats for a SqliteStore."""
+    if isinstance(store, SqliteStore):
+        return SqlitePipelineStats(store)
+    return PipelineStats(store)
+
+
+def decrement(counts, key):
+    if counts[key] == 1:
+        del counts[key]
+    else:
+        counts[key] -= 1
+
+
+def load_company_aliases(filename=COMPANY_ALIASES_FILE):
+    """{alias: company} from a JSON object, both sides normalized; {} without the file.
+
+    e.g. {"AWS": "Amazon", "Bentley": "Bentley Systems"}
+    """
+    if not os.path.exists(filename):
+        return {}
+    with open(filename) as f:
+        aliases = json.load(f)
+    return {company_key(alias): company_key(company) for alias, company in aliases.items()}
+
+
+class CompanyIndex:
+    """Applications and contacts grouped by company_key(), so the contacts
+    for an application (and the other way round) are one dict lookup rather
+    than a scan of the other store.
+
+    Both groupings follow their store's events, so edits, deletes and
+    reloads are picked up as they happen. Call close() to stop listening.
+    A SqliteStore isn't grouped in Python at all: its lookups are queries
+    on the indexed company_key column (see SqliteCompanyGroups).
+    """
+
+    def __init__(self, app_store, contact_store, aliases=None):
+        self.aliases = load_company_aliases() if aliases is None else aliases
+        self.applications = self.groups(app_store)
+        self.contacts = self.groups(contact_store)
+
+
+    def groups(self, store):
+        if isinstance(store, SqliteStore):
+            return SqliteCompanyGroups(store, self.aliases)
+        return CompanyGroups(store, self.key)
+
+
+    def key(self, name):
+        return company_key(name, self.aliases)
+
+
+    def contacts_for(self, application):
+        return self.contacts.records(self.key(application.get('company')))
+
+
+    def applications_for(self, contact):
+        return self.applications.records(self.key(contact.get('company')))
+
+
+    def close(self):
+        self.applications.close()
+        self.contacts.close()
+
+
+class CompanyGroups:
+    """One store's record ids by company key, for CompanyIndex."""
+
+    def __init__(self, store, key):
+        self.store = store
+        self.key = key
+        self.rebuild()
+        store.subscribe(self.record_changed)
+
+
+    def rebuild(self):
+        self.ids = {}   # company key -> ids of the records at that company
+        self.keys = {}  # record id -> its company key
+        for record in self.store:
+            self.add(record)
+
+
+    def record_changed(self, event, record):
+        if event == 'reload':
+            self.rebuild()
+            return
+        self.remove(record['id'])
+        if event != 'delete':
+            self.add(record)
+
+
+    def add(self, record):
+        key = self.key(record.get('company'))
+        if key:  # no company links to nothing
+            self.keys[record['id']] = key
+            self.ids.setdefault(key, set()).add(record['id'])
+
+
+    def remove(self, record_id):
+        key = self.keys.pop(record_id, None)
+        if key is not None:
+            ids = self.ids[key]
+            ids.discard(record_id)
+            if not ids:
+                del self.ids[key]
+
+
+    def records(self, key):
+        """The records at company `key`, by id."""
+        records = (self.store.get(record_id) for record_id in sorted(self.ids.get(key, ())))
+        return [record for record in records if record is not None]
+
+
+    def close(self):
+        self.store.unsubscribe(self.record_changed)
+
+
+class SqliteCompanyGroups:
+    """CompanyGroups for a SqliteStore, answered by SQL on the company_key
+    column, so nothing has to be rebuilt when another connection commits.
+
+    The column is stored without aliases, so a lookup asks for every stored
+    key the aliases map to the one wanted.
+    """
+
+    def __init__(self, store, aliases):
+        self.store = store
+        self.aliases = aliases
+        self.spellings = {}  # company key -> the aliases that map to it
+        for alias, company in aliases.items():
+            self.spellings.setdefault(company, []).append(alias)
+
+
+    def records(self, key):
+        """The records at company `key`, by id."""
+        keys = self.spellings.get(key, []) + ([] if key in self.aliases else [key])
+        keys = [spelling for spelling in keys if spelling]  # no company links to nothing
+        if not keys:
+            return []
+        where = f" WHERE {self.store.table}.company_key IN ({', '.join('?' * len(keys))})"
+        return list(SqliteQuery(self.store, where, keys))
+
+
+    def close(self):
+        pass  # nothing to stop listening to
+
+
+def history_fields(record):
+    """A record's fields as logged in the history (bookkeeping fields left out)."""
+    return {field: record[field] for field in record.keys() if field not in MERGE_IGNORED}
+
+
+def changed_fields(record, changes):
+    return {field: value for field, value in changes.items()
+            if field not in MERGE_IGNORED and record.get(field) != value}
+
+
+class HistoryLog:
+    """Append-only log of every change to the applications, for looking back
+    in time.
+
+    Each line of <file>.history is [minute, id, fields]: the new values of
+    the fields that changed, the whole record for an add, or null for a
+    delete. Records that existed before the log did are written as adds at
+    their last_updated time: on a worker thread once the store has loaded
+    (see start_seeding), or else the first time anything is logged, so
+    nothing can be logged until the store has finished loading.
+
+    Queries replay the log into {id: [status, minute it entered it]} plus
+    per-status [closed minutes, entries] totals. So they don't always start
+    from the beginning, replays leave checkpoints of that state in
+    <file>.history.checkpoints: one line per checkpoint, a small JSON header
+    (log offset, minute), a tab, then the state. A checkpoint is written once
+    the events since the last one are at least as many as the records in it,
+    so checkpoints never add up to more than the log itself.
+
+    One record's events are found through an in-memory index of where each
+    record's lines start, built on first use (or ahead of time on a thread,
+    see start_indexing) and extended with whatever any process has appended
+    since, so a detail view reads a few lines instead of the whole log.
+    """
+
+    def __init__(self, filename, store):
+        self.filename = filename
+        self.checkpoint_file = filename + CHECKPOINT_SUFFIX
+        self.store = store
+        self.lock = FileLock(filename + LOCK_SUFFIX)
+        self.seeded = False
+        self.seeder = None        # thread started by start_seeding
+        self.held = None          # changes logged while it runs; appended after the seed
+        self.unchanged = {}       # record id -> its seed event from before the first held change
+        self.held_lock = threading.Lock()
+        self.checkpoints = []     # (log offset, minute, position in checkpoint_file), by offset
+        self.checkpoints_read = 0  # bytes of checkpoint_file already in self.checkpoints
+        self.line_offsets = {}    # record id -> array of where its lines start in the log
+        self.lines_indexed = 0    # bytes of the log already in line_offsets
+        self.index_lock = threading.Lock()
+
+
+    def seed(self):
+        """Log the records that pre-date the history. Call before changing any.
+
+        Raises RuntimeError if the log has to be started while the store is
+        still loading: seeding from some of the records would leave the rest
+        out of the history for good.
+        """
+        if self.seeded or self.held is not None:
+            return  # done, or being done by start_seeding's thread
+        with self.lock:
+            if not os.path.exists(self.filename):
+                if self.store.loading:
+                    raise RuntimeError("Records are still loading")
+                now = parse_timestamp(now_stamp())
+                self._append(sorted(self._seed_event(record, now) for record in self.store))
+        self.seeded = True
+
+
+    def start_seeding(self):
+        """Do what seed() does on a worker thread. Call once the store has loaded.
+
+        Logging doesn't wait for it: changes logged while it runs are held
+        back and appended after the seed, and the records they change are
+        seeded as they were before them.
+        """
+        if self.seeded or self.held is not None:
+            return
+        if os.path.exists(self.filename):
+            self.seeded = True  # started by an earlier run or another process
+            return
+        self.held = []
+        self.unchanged = {}
+        records = self.store.detached()
+
+        def seeder():
+            try:
+                now = parse_timestamp(now_stamp())
+                seeds = {record['id']: self._seed_event(record, now) for record in records}
+                with self.held_lock:
+                    for record_id, event in self.unchanged.items():
+                        if record_id in seeds:
+                            seeds[record_id] = event
+                with self.lock:
+                    if not os.path.exists(self.filename):
+                        self._append(sorted(event for event in seeds.values() if event is not None))
+                    self.seeded = True
+            finally:
+                with self.held_lock:
+                    held, self.held = self.held, None
+                    if self.seeded:
+                        with self.lock:
+                            self._append(held)
+
+        self.seeder = threading.Thread(target=seeder, daemon=True)
+        self.seeder.start()
+
+
+    def before_change(self, record_id):
+        """For a store that logs a change only after making it: call first, so
+        the record's earlier state gets into the log (or the seed) too."""
+        with self.held_lock:
+            if self.held is not None:
+                self._keep_unchanged(record_id)
+                return
+        self.seed()
+
+
+    def _keep_unchanged(self, record_id):
+        # Under held_lock: the record as the seed should show it, before its first held change.
+        if record_id not in self.unchanged:
+            record = self.store.get(record_id)
+            self.unchanged[record_id] = None if record is None else self._seed_event(record, parse_timestamp(now_stamp()))
+
+
+    def _seed_event(self, record, now):
+        return (parsed_value(record, 'last_updated') or now, record['id'], history_fields(record))
+
+
+    def record(self, record_id, fields, when=None):
+        """Log one change; see the class docstring for `fields`."""
+        self.record_many([(record_id, fields)], when)
+
+
+    def record_many(self, changes, when=None):
+        when = parse_timestamp(now_stamp()) if when is None else when
+        events = [(when, record_id, fields) for record_id, fields in changes]
+        with self.held_lock:
+            if self.held is not None:
+                for when, record_id, fields in events:
+                    self._keep_unchanged(record_id)
+                self.held += events
+                return
+        self.seed()
+        with self.lock:
+            self._append(events)
+
+
+    def _append(self, events):
+        with open(self.filename, 'a') as f:
+            for event in events:
+                f.write(json.dumps(event, separators=(',', ':'), default=record_to_json) + "\n")
+
+
+    def events(self, record_id):
+        """[(minute, fields)] logged for one record, oldest first."""
+        with self.index_lock:
+            self._index_lines()
+            offsets = self.line_offsets.get(record_id, ())
+            found = []
+            if offsets:
+                with open(self.filename, 'rb') as f:
+                    for offset in offsets:
+                        f.seek(offset)
+                        when, event_id, fields = json.loads(f.readline())
+                        found.append((when, fields))
+        return found
+
+
+    def start_indexing(self):
+        """Build the events() index on a worker thread, so the first lookup is quick too."""
+        def indexer():
+            with self.index_lock:
+                self._index_lines()
+
+        threading.Thread(target=indexer, daemon=True).start()
+
+
+    def _index_lines(self):
+        # Add the lines appended since the last call; costs one stat() if there are none.
+        try:
+            if os.path.getsize(self.filename) == self.lines_indexed:
+                return
+        except FileNotFoundError:
+            return
+        offset = self.lines_indexed
+        with open(self.filename, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # being written by another process
+                record_id = int(line.split(b",", 2)[1])  # lines are [minute,id,fields]
+                offsets = self.line_offsets.get(record_id)
+                if offsets is None:
+                    offsets = self.line_offsets[record_id] = array.array('Q')
+                offsets.append(offset)
+                offset += len(line)
+        self.lines_indexed = offset
+
+
+    def status_periods(self, record_id, now=None):
+        """[(status, from minute, to minute or None if current)] for one record."""
+        periods = []
+        for when, fields in self.events(record_id):
+            if fields is None or 'status' in fields:
+                if periods and periods[-1][2] is None:
+                    if fields is not None and fields['status'] == periods[-1][0]:
+                        continue
+                    periods[-1] = (periods[-1][0], periods[-1][1], when)
+                if fields is not None:
+                    periods.append((fields['status'], when, None))
+        return periods
+
+
+    def statuses_as_of(self, when):
+        """{id: status} of the applications that existed at minute `when`."""
+        state, totals = self.replay(when)
+        return {record_id: status for record_id, (status, since) in state.items()}
+
+
+    def pipeline_as_of(self, when):
+        """Status counts at minute `when`."""
+        counts = {}
+        for status, since in self.replay(when)[0].values():
+            counts[status] = counts.get(status, 0) + 1
+        return counts
+
+
+    def time_in_status(self, now=None):
+        """{status: (total minutes spent in it by all applications, times entered)} up to `now`."""
+        now = parse_timestamp(now_stamp()) if now is None else now
+        state, totals = self.replay(now)
+        result = {status: list(total) for status, total in totals.items()}
+        for status, since in state.values():
+            result.setdefault(status, [0, 0])[0] += max(0, now - since)
+        return {status: tuple(total) for status, total in result.items()}
+
+
+    def replay(self, until=None):
+        """(state, totals) after every event up to minute `until` (all of them if None).
+
+        Starts from the newest checkpoint at or before `until` and writes a
+        new one when it replays far enough past the last.
+        """
+        self.seed()
+        if self.seeder is not None:
+            self.seeder.join()  # the log isn't complete until it's done
+        with self.lock:
+            self._read_checkpoint_index()
+            start = None
+            for checkpoint in self.checkpoints:
+                if until is not None and checkpoint[1] > until:
+                    break
+                start = checkpoint
+            state, totals = self._load_checkpoint(start[2]) if start else ({}, {})
+            offset = start[0] if start else 0
+            last_checkpoint = self.checkpoints[-1][0] if self.checkpoints else 0
+            since_checkpoint = 0
+
+            if not os.path.exists(self.filename):
+                return state, totals
+            with open(self.filename, 'rb') as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # being written by another process
+                    when, record_id, fields = json.loads(line)
+                    if until is not None and when > until:
+                        break
+                    apply_history_event(state, totals, when, record_id, fields)
+                    offset += len(line)
+                    if offset > last_checkpoint:
+                        since_checkpoint += 1
+                        if since_checkpoint >= max(CHECKPOINT_EVENTS, len(state)):
+                            self._write_checkpoint(offset, when, state, totals)
+                            last_checkpoint, since_checkpoint = offset, 0
+        return state, totals
+
+
+    def _read_checkpoint_index(self):
+        if not os.path.exists(self.checkpoint_file):
+            return
+        with open(self.checkpoint_file, 'rb') as f:
+            f.seek(self.checkpoints_read)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                header = json.loads(line[:line.index(b"\t")])
+                self.checkpoints.append((header['offset'], header['t'], self.checkpoints_read))
+                self.checkpoints_read += len(line)
+
+
+    def _load_checkpoint(self, position):
+        with open(self.checkpoint_file, 'rb') as f:
+            f.seek(position)
+            line = f.readline()
+        body = json.loads(line[line.index(b"\t") + 1:])
+        return {int(record_id): entry for record_id, entry in body['state'].items()}, body['totals']
+
+
+    def _write_checkpoint(self, offset, when, state, totals):
+        line = (json.dumps({'offset': offset, 't': when, 'records': len(state)}) + "\t"
+                + json.dumps({'state': state, 'totals': totals}, separators=(',', ':')) + "\n").encode()
+        with open(self.checkpoint_file, 'ab') as f:
+            f.write(line)
+        self._read_checkpoint_index()
+
+
+def apply_history_event(state, totals, when, record_id, fields):
+    current = state.get(record_id)
+    if current is not None and (fields is None or fields.get('status', current[0]) != current[0]):
+        total = totals.setdefault(current[0], [0, 0])
+        total[0] += max(0, when - current[1])
+        del state[record_id]
+        current = None
+    if fields is not None and current is None:
+        status = fields.get('status', '')
+        state[record_id] = [status, when]
+        totals.setdefault(status, [0, 0])[1] += 1
+
+
+class SqliteQuery:
+    """Lazy, sliceable query result - rows are only fetched for the slice asked for.
+
+    This is what lets VirtualTreeview page through a SQLite table without the
+    records ever being loaded into Python.
+    """
+
+    def __init__(self, store, where="", params=(), order="id", source=None):
+        self.store = store
+        self.source = source or store.table  # table, or a join for search results
+        self.where = where
+        self.params = tuple(params)
+        self.order = order
+        self.count = None
+
+
+    def __len__(self):
+        if self.count is None:
+            sql = f"SELECT COUNT(*) FROM {self.source}{self.where}"
+            self.count = self.store.conn.execute(sql, self.params).fetchone()[0]
+        return self.count
+
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, _ = index.indices(len(self))
+            if stop <= start:
+                return []
+            sql = f"SELECT {self.store.columns} FROM {self.source}{self.where} ORDER BY {self.order} LIMIT ? OFFSET ?"
+            cursor = self.store.conn.execute(sql, self.params + (stop - start, start))
+            return [self.store.to_record(row) for row in cursor]
+
+        if index < 0:
+            index += len(self)
+        rows = self[index:index + 1]
+        if not rows:
+            raise IndexError(index)
+        return rows[0]
+
+
+    def __iter__(self):
+        sql = f"SELECT {self.store.columns} FROM {self.source}{self.where} ORDER BY {self.order}"
+        for row in self.store.conn.execute(sql, self.params):
+            yield self.store.to_record(row)
+
+
+class SqliteStore:
+    """RecordStore interface on top of one table of a SQLite database.
+
+    Nothing is loaded at startup: len(), slicing, get() and query() all run
+    indexed SQL, so the size of the table doesn't matter until rows are
+    actually shown.
+    """
+
+    loading = False  # never loads up front
+    history = None   # see RecordStore
+
+    def __init__(self, conn, table, fields, search_fields):
+        self.conn = conn
+        self.table = table
+        self.fields = fields
+        self.search_fields = search_fields
+        self.parsed_columns = SQLITE_PARSED_COLUMNS[table]
+        self.tracks_status = 'status' in fields  # keeps status_since up to date
+        columns = list(fields) + [column for column, parse in self.parsed_columns.values()]
+        if self.tracks_status:
+            columns.append('status_since')
+        self.insert_sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        # Named, not *: older databases got some columns added at the end.
+        self.columns = ', '.join(f"{table}.{field}" for field in fields)
+        self.listeners = []
+        self.data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        self.all = SqliteQuery(self)
+        self.flushes = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.conn.execute("INSERT OR IGNORE INTO counters (name, next_id) "
+                          f"SELECT ?, IFNULL(MAX(id), 0) + 1 FROM {table}", (table,))
+        self.conn.commit()
+
+
+    @contextmanager
+    def write(self):
+        """One committed transaction, timed for stats()."""
+        started = time.perf_counter()
+        with self.conn:
+            yield
+        self.last_flush_ms = (time.perf_counter() - started) * 1000
+        self.max_flush_ms = max(self.max_flush_ms, self.last_flush_ms)
+        self.flushes += 1
+        instruments.record('save', self.last_flush_ms)
+
+
+    def close(self):
+        self.conn.commit()  # every write already commits; the connection is shared
+
+
+    def stats(self):
+        # SQLite writes are synchronous, so nothing is ever queued.
+        return {'queue_depth': 0, 'flushes': self.flushes, 'last_flush_ms': self.last_flush_ms,
+                'max_flush_ms': self.max_flush_ms, 'unsaved': 0, 'error': None}
+
+
+    def __len__(self):
+        return len(self.all)
+
+
+    def __iter__(self):
+        return iter(self.all)
+
+
+    def detached(self):
+        """The rows, for another thread to go through while this one keeps changing the table.
+
+        Read on a connection of its own, a page at a time, so writes here
+        don't wait for the whole read."""
+        database = self.conn.execute("PRAGMA database_list").fetchone()[2]
+        sql = f"SELECT {self.columns} FROM {self.table} WHERE id > ? ORDER BY id LIMIT {PAGE_SIZE}"
+
+        def rows():
+            conn = sqlite3.connect(database)
+            try:
+                last_id = 0
+                while True:
+                    page = conn.execute(sql, (last_id,)).fetchall()
+                    if not page:
+                        return
+                    for row in page:
+                        record = self.to_record(row)
+                        yield record
+                    last_id = record['id']
+            finally:
+                conn.close()
+
+        return rows()
+
+
+    def __getitem__(self, index):
+        return self.all[index]
+
+
+    def to_record(self, row):
+        return dict(zip(self.fields, row))
+
+
+    def row_values(self, record):
+        values = [record.get(field, 0 if field == 'version' else '') for field in self.fields]
+        values += [parse(record.get(field, '')) for field, (column, parse) in self.parsed_columns.items()]
+        if self.tracks_status:
+            values.append(parse_timestamp(record.get('last_updated', '')))
+        return values
+
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+
+    def unsubscribe(self, listener):
+        self.listeners.remove(listener)
+
+
+    def refresh(self, blocking=True):
+        """Tell listeners to re-read if another connection has committed since
+        we last looked (PRAGMA data_version). Returns True if so."""
+        data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version == self.data_version:
+            return False
+        self.data_version = data_version
+        self.notify('reload', None)
+        return True
+
+
+    def notify(self, event, record):
+        self.all.count = None
+        for listener in self.listeners:
+            listener(event, record)
+
+
+    def get(self, record_id):
+        row = self.conn.execute(f"SELECT {self.columns} FROM {self.table} WHERE id = ?", (record_id,)).fetchone()
+        return self.to_record(row) if row else None
+
+
+    def allocate_id(self):
+        """Hand out the next id. Ids are never reused, even after a delete."""
+        with self.write():
+            record_id = self.conn.execute("SELECT next_id FROM counters WHERE name = ?",
+                                          (self.table,)).fetchone()[0]
+            self.conn.execute("UPDATE counters SET next_id = ? WHERE name = ?",
+                              (record_id + 1, self.table))
+        return record_id
+
+
+    def allocate_ids(self, count):
+        """Hand out `count` consecutive ids at once, as a range."""
+        with self.write():
+            first = self.conn.execute("SELECT next_id FROM counters WHERE name = ?",
+                                      (self.table,)).fetchone()[0]
+            self.conn.execute("UPDATE counters SET next_id = ? WHERE name = ?",
+                              (first + count, self.table))
+        return range(first, first + count)
+
+
+    def add(self, record):
+        if self.history is not None:
+            self.history.record(record['id'], history_fields(record))
+        with self.write():
+            self.conn.execute(self.insert_sql, self.row_values(record))
+            self.conn.execute("UPDATE counters SET next_id = MAX(next_id, ?) WHERE name = ?",
+                              (record['id'] + 1, self.table))
+        self.notify('insert', record)
+        return record
+
+
+    def add_many(self, records):
+        """Add a batch of new records in one transaction."""
+        if self.history is not None:
+            self.history.record_many((record['id'], history_fields(record)) for record in records)
+        with self.write():
+            self.conn.executemany(self.insert_sql, [self.row_values(record) for record in records])
+            if records:
+                self.conn.execute("UPDATE counters SET next_id = MAX(next_id, ?) WHERE name = ?",
+                                  (max(record['id'] for record in records) + 1, self.table))
+        for record in records:
+            self.notify('insert', record)
+        return records
+
+
+    def update(self, record_id, changes, base=None):
+        """Apply changes to a row and bump its version.
+
+        With `base` (the record when the edit started) a change saved
+        meanwhile by another process is merged or rejected with
+        UpdateConflict, like RecordStore.update. The UPDATE only applies to
+        the version that was checked, so a save that slips in between is
+        caught and the check runs again.
+        """
+        if self.history is not None:
+            self.history.before_change(record_id)
+        while True:
+            current = self.get(record_id)
+            if current is None:
+                raise UpdateConflict(record_id, (), None)
+            to_save = merge_changes(current, changes, base) if base is not None else changes
+            values = {field: value for field, value in to_save.items() if field in self.fields
+                      and field not in ('id', 'version')}
+            for field, (column, parse) in self.parsed_columns.items():
+                if field in values:
+                    values[column] = parse(values[field])
+            sets, params = ''.join(f'{column} = ?, ' for column in values), list(values.values())
+            if self.tracks_status:
+                # An edit that leaves the status alone doesn't restart its clock,
+                # as in PipelineStats. SET sees the row as it was before.
+                sets += ("status_since = CASE WHEN status = ? AND status_since IS NOT NULL "
+                         "THEN status_since ELSE ? END, ")
+                params += [values.get('status', current['status']),
+                           parse_timestamp(values.get('last_updated', current['last_updated']))]
+            with self.write():
+                cursor = self.conn.execute(
+                    f"UPDATE {self.table} SET {sets}version = version + 1 WHERE id = ? AND version = ?",
+                    params + [record_id, current['version']])
+            if cursor.rowcount:
+                break
+        if self.history is not None:
+            fields = changed_fields(current, to_save)
+            if fields:
+                self.history.record(record_id, fields)
+        record = self.get(record_id)
+        self.notify('update', record)
+        return record
+
+
+    def delete(self, record_id):
+        record = self.get(record_id)
+        if self.history is not None and record is not None:
+            self.history.record(record_id, None)
+        with self.write():
+            self.conn.execute(f"DELETE FROM {self.table} WHERE id = ?", (record_id,))
+        self.notify('delete', record)
+
+
+    def query(self, filters=(), order_by=None, descending=False, search=None):
+        """Same arguments as RecordStore.query, run as SQL and returned lazily.
+
+        Salary ranges and sorting go through the indexed salary_value column;
+        dates are stored as ISO text, which already compares in date order.
+        """
+        table = self.table
+        clauses, params = [], []
+        for field, op, value in filters:
+            if field not in self.fields:
+                raise ValueError(f"Unknown field {field!r}")
+            column = f"{table}.{field}"
+            if field in FIELD_PARSERS and op in ('>=', '<='):
+                bound = parse_bound(field, value)  # ValueError here too, as in RecordStore
+                if field in self.parsed_columns:
+                    column = f"{table}.{self.parsed_columns[field][0]}"
+                    value = bound
+                else:
+                    # Dates are stored as ISO text, so compare with the bound in that
+                    # form, not as typed ('20260105' sorts after '2026-01-10').
+                    value = unpack_date(bound) if field == 'date_applied' else unpack_timestamp(bound)
+            if op == 'in':
+                clauses.append(f"{column} IN ({', '.join('?' * len(value))})")
+                params.extend(value)
+            elif op == 'like':
+                clauses.append(f"{column} LIKE ?")
+                params.append(f"%{value}%")
+            elif op in ('=', '>=', '<='):
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+            else:
+                raise ValueError(f"Unknown filter op {op!r}")
+
+        terms = tokenize(search or '')
+        if not clauses and not terms and not order_by:
+            return self
+
+        source = None
+        order = f"{table}.id"
+        if terms:
+            fts = f"{table}_fts"
+            source = f"{table} JOIN {fts} ON {fts}.rowid = {table}.id"
+            clauses.append(f"{fts} MATCH ?")
+            params.append(" ".join(f'"{term}"*' for term in terms))
+            weights = ", ".join(str(weight) for weight in self.search_fields.values())
+            order = f"bm25({fts}, {weights}), {table}.id"
+
+        if order_by:
+            if order_by not in self.fields:
+                raise ValueError(f"Unknown field {order_by!r}")
+            direction = " DESC" if descending else ""
+            if order_by in self.parsed_columns and order_by in FIELD_PARSERS:
+                # Unparseable salaries (NULL) go after the rest, as in RecordStore
+                column = f"{table}.{self.parsed_columns[order_by][0]}"
+                order = f"{column} IS NULL{direction}, {column}{direction}, {table}.id"
+            elif order_by in FIELD_PARSERS or order_by == 'id':
+                order = f"{table}.{order_by}{direction}, {table}.id"
+            else:
+                order = f"{table}.{order_by} COLLATE NOCASE{direction}, {table}.id"
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        results = SqliteQuery(self, where, params, order, source)
+        if terms and instruments.enabled:
+            with instruments.timed('search'):
+                len(results)  # run the search now so its time is counted
+        return results
+
+
+    def search(self, text):
+        """Same as RecordStore.search, answered by the table's FTS5 index."""
+        if not tokenize(text):
+            return self
+        return self.query(search=text)
@@ -0,0 +1,1047 @@
+"""Job Tracker window (tkinter). Imported only when the GUI is launched."""
+import tkinter as tk
+from tkinter import ttk, messagebox, simpledialog
+import os
+import time
+from datetime import datetime
+
+from tracker_core import (APPLICATIONS_FILE, BACKEND, CONTACTS_FILE, DEBUG_PANEL_MS, HEARTBEAT_MS,
+                          HISTORY_LINES, LINKED_LINES, LOAD_POLL_MS, RELOAD_POLL_MS, SALARY_BUCKET,
+                          SAVE_STATUS_MS, SEARCH_DELAY_MS, CompanyIndex, UpdateConflict,
+                          application_errors, contact_errors, instrumented, instruments, new_application,
+                          new_contact, now_stamp, open_stores, parse_date, parse_salary, parse_timestamp,
+                          pipeline_stats, unpack_timestamp)
+
+
+class DelayedCall:
+    """Runs `callback` once, `delay_ms` after the last schedule() call."""
+
+    def __init__(self, widget, delay_ms, callback):
+        self.widget = widget
+        self.delay_ms = delay_ms
+        self.callback = callback
+        self.pending = None
+
+
+    def schedule(self):
+        if self.pending:
+            self.widget.after_cancel(self.pending)
+        self.pending = self.widget.after(self.delay_ms, self.run)
+
+
+    def run(self):
+        self.pending = None
+        self.callback()
+
+
+class StallDetector:
+    """Heartbeat that notices when the Tk event loop was blocked.
+
+    A beat is due every HEARTBEAT_MS; however late it runs is how long some
+    callback held the loop, and that goes to instruments.event_loop_delay().
+    Stops once instruments are turned off.
+    """
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.due = time.perf_counter() + HEARTBEAT_MS / 1000
+        widget.after(HEARTBEAT_MS, self.beat)
+
+
+    def beat(self):
+        now = time.perf_counter()
+        instruments.event_loop_delay(max(0.0, (now - self.due) * 1000))
+        if instruments.enabled:
+            self.due = now + HEARTBEAT_MS / 1000
+            self.widget.after(HEARTBEAT_MS, self.beat)
+
+
+class VirtualTreeview:
+    """Shows a large record list in a Treeview without inserting every row.
+
+    Only the rows in view (plus `overscan` rows on each side) exist as Treeview
+    items. The Treeview scrolls natively inside that window, and once it gets
+    close to an edge the window is rebuilt around the new position. The
+    scrollbar is driven from the position in the full record list, so a
+    refresh or scroll costs the same at 1k rows as at 1M rows.
+    """
+
+    def __init__(self, tree, scrollbar, row_values, overscan=20):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.row_values = row_values  # record -> tuple of column values
+        self.overscan = overscan
+        self.records = []
+        self.start = 0   # first materialized record
+        self.end = 0     # one past the last materialized record
+        self.offset = 0  # first visible record
+        self.render_pending = False
+        self.changes = {}  # record id -> (event, record) waiting for the next idle flush
+        self.rowheight = int(ttk.Style(tree).lookup('Treeview', 'rowheight') or 20)
+
+        tree.configure(yscrollcommand=self.on_tree_scroll)
+        scrollbar.configure(command=self.yview)
+        tree.bind('<Configure>', lambda e: self.render(self.offset))
+
+
+    def visible_rows(self):
+        return max(int(self.tree.cget('height')), self.tree.winfo_height() // self.rowheight)
+
+
+    def set_records(self, records, offset=None):
+        """Show a new record list, keeping the scroll position unless `offset` is given."""
+        self.records = records
+        self.render(self.offset if offset is None else offset)
+
+
+    def render(self, offset):
+        """Rebuild the materialized window so that `offset` is the top row."""
+        self.render_pending = False
+        total = len(self.records)
+        visible = self.visible_rows()
+        offset = max(0, min(offset, total - visible))
+        start = max(0, offset - self.overscan)
+        end = min(total, offset + visible + self.overscan)
+
+        selected = self.tree.selection()
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+        for record in self.records[start:end]:
+            self.tree.insert('', tk.END, iid=record['id'], values=self.row_values(record))
+        self.start, self.end, self.offset = start, end, offset
+
+        still_shown = [iid for iid in selected if self.tree.exists(iid)]
+        if still_shown:
+            self.tree.selection_set(still_shown)
+        self.tree.yview_moveto((offset - start) / (end - start) if end > start else 0)
+        self.update_scrollbar(visible)
+
+
+    def scroll_to(self, offset):
+        total = len(self.records)
+        visible = self.visible_rows()
+        offset = max(0, min(offset, total - visible))
+        margin = self.overscan // 2
+        inside = (offset - self.start >= margin or self.start == 0) and \
+                 (self.end - (offset + visible) >= margin or self.end == total)
+        if inside and self.end > self.start:
+            self.tree.yview_moveto((offset - self.start) / (self.end - self.start))
+        else:
+            self.render(offset)
+
+
+    def yview(self, *args):
+        """Scrollbar command - positions are fractions of the full record list."""
+        if args[0] == 'moveto':
+            self.scroll_to(int(float(args[1]) * len(self.records)))
+        elif args[0] == 'scroll':
+            step = self.visible_rows() if args[2] == 'pages' else 1
+            self.scroll_to(self.offset + int(args[1]) * step)
+
+
+    def on_tree_scroll(self, first, last):
+        """Treeview yscrollcommand - fractions here are of the materialized window."""
+        window = self.end - self.start
+        if not window:
+            self.scrollbar.set(0, 1)
+            return
+
+        self.offset = self.start + int(round(float(first) * window))
+        visible = max(1, int(round((float(last) - float(first)) * window)))
+        margin = self.overscan // 2
+        near_top = self.start > 0 and self.offset - self.start < margin
+        near_bottom = self.end < len(self.records) and self.end - (self.offset + visible) < margin
+        if (near_top or near_bottom) and not self.render_pending:
+            # Don't rebuild the tree from inside its own scroll callback.
+            self.render_pending = True
+            self.tree.after_idle(lambda: self.render(self.offset))
+        self.update_scrollbar(visible)
+
+
+    def record_changed(self, event, record):
+        """RecordStore listener - queue the change and apply it when Tk is idle.
+
+        Several changes in a row (an import, a bulk status change) coalesce
+        into a single update of the tree.
+        """
+        if not self.changes:
+            self.tree.after_idle(self.apply_changes)
+        self.changes[record['id'] if record is not None else None] = (event, record)
+
+
+    def apply_changes(self):
+        changes, self.changes = self.changes, {}
+        if any(event in ('delete', 'reload') for event, record in changes.values()):
+            # Rows shift up after a delete; re-rendering the window is cheap.
+            self.render(self.offset)
+            return
+
+        for record_id, (event, record) in changes.items():
+            if event == 'update' and self.tree.exists(record_id):
+                self.tree.item(record_id, values=self.row_values(record))
+
+        # New records are appended, so only a window that reaches the end of
+        # the list needs rows inserted.
+        visible = self.visible_rows()
+        end = min(len(self.records), self.offset + visible + self.overscan)
+        for record in self.records[self.end:end]:
+            self.tree.insert('', tk.END, iid=record['id'], values=self.row_values(record))
+        self.end = max(self.end, end)
+        self.update_scrollbar(visible)
+
+
+    def update_scrollbar(self, visible):
+        total = len(self.records)
+        if not total:
+            self.scrollbar.set(0, 1)
+            return
+        self.scrollbar.set(self.offset / total, min(1.0, (self.offset + visible) / total))
+
+
+def application_row(app):
+    """Column values for one row of the applications list."""
+    return (
+        app['company'],
+        app['role'],
+        app['status'],
+        app['date_applied'],
+        app['salary_range'],
+        app['last_updated']
+    )
+
+
+class JobTrackerApp:
+    """Main application class - holds all app data and functions together."""
+    
+    def __init__(self, root, backend=BACKEND):
+        self.root = root
+        self.root.title("Job Tracker - Sprint 1")
+        self.root.geometry("900x600")
+        
+        self.app_store, self.contact_store = open_stores(backend, lazy=True)
+        
+        self.status_options = ["Applied", "Interviewing", "Offer", "Rejected", "Withdrawn"]
+        self.requeries_pending = set()
+        self.pipeline_stats = None  # built the first time the stats window opens
+        self.company_index = None   # built the first time a detail view opens
+        self.stall_detector = StallDetector(root) if instruments.enabled else None
+        
+        self.main_frame = ttk.Frame(root)
+        self.main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        welcome_frame = ttk.Frame(self.main_frame)
+        welcome_frame.pack(fill=tk.X, pady=(0, 10))
+        ttk.Label(welcome_frame, 
+                  text="Track your job applications and networking contacts in one place. Double-click any row to view details.",
+                  font=('Arial', 10), foreground='gray').pack(anchor=tk.W)
+        
+        self.status_frame = ttk.Frame(self.main_frame)
+        self.status_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=(5, 0))
+        self.status_label = ttk.Label(self.status_frame, text="", foreground='gray')
+        self.status_label.pack(side=tk.LEFT)
+        self.save_label = ttk.Label(self.status_frame, text="", foreground='gray')
+        self.save_label.pack(side=tk.RIGHT)
+        self.load_progress = ttk.Progressbar(self.status_frame, length=200, maximum=1.0)
+        
+        self.notebook = ttk.Notebook(self.main_frame)
+        self.notebook.pack(fill=tk.BOTH, expand=True)
+        
+        self.applications_tab = ttk.Frame(self.notebook)
+        self.contacts_tab = ttk.Frame(self.notebook)
+        
+        self.notebook.add(self.applications_tab, text="Job Applications")
+        self.notebook.add(self.contacts_tab, text="Networking Contacts")
+        
+        self.build_applications_tab()
+        self.build_contacts_tab()
+        
+        self.root.bind('<Control-n>', lambda e: self.add_new_shortcut())  # Ctrl+N to add new
+        self.root.bind('<Control-q>', lambda e: self.quit_app())  # Ctrl+Q to quit
+        self.root.bind('<Control-D>', lambda e: self.show_debug_panel())  # Ctrl+Shift+D, not advertised
+        self.root.protocol("WM_DELETE_WINDOW", self.quit_app)
+        self.root.after(SAVE_STATUS_MS, self.update_save_status)
+        self.root.after(RELOAD_POLL_MS, self.poll_changes)
+        
+        # Window shows right away; records stream in from reader threads.
+        if self.app_store.loading or self.contact_store.loading:
+            for store in (self.app_store, self.contact_store):
+                if store.loading:
+                    store.start_loading()
+            self.load_progress.pack(side=tk.RIGHT)
+            self.root.after(0, self.poll_loading)
+        if self.app_store.history is not None:
+            self.app_store.history.start_indexing()  # so opening an application doesn't scan the history
+            if not self.app_store.loading:
+                self.app_store.history.start_seeding()  # otherwise poll_loading does, once it has loaded
+    
+    
+    def quit_app(self):
+        """Flush queued saves to disk, then close the window."""
+        for store in (self.app_store, self.contact_store):
+            store.close()
+        self.root.destroy()
+    
+    
+    def update_save_status(self):
+        """Show how the write-behind saves are doing in the status bar."""
+        stats = [store.stats() for store in (self.app_store, self.contact_store)]
+        errors = [s['error'] for s in stats if s['error']]
+        if errors:
+            self.save_label.config(text=f"Save failed: {errors[0]}", foreground='red')
+        elif any(s['flushes'] for s in stats):
+            pending = sum(s['queue_depth'] for s in stats)
+            last = max(s['last_flush_ms'] for s in stats)
+            self.save_label.config(text=f"Saved ({last:.1f} ms) · {pending} pending", foreground='gray')
+        self.root.after(SAVE_STATUS_MS, self.update_save_status)
+    
+    
+    def poll_changes(self):
+        """Pick up records other windows or scripts saved to the same files."""
+        for store in (self.app_store, self.contact_store):
+            store.refresh(blocking=False)
+        self.root.after(RELOAD_POLL_MS, self.poll_changes)
+    
+    
+    def poll_loading(self):
+        """Move pages finished by the reader threads into the lists."""
+        stores = (self.app_store, self.contact_store)
+        done = [store.load_pending() for store in stores if store.loading]
+        if all(done):
+            self.load_progress.pack_forget()
+            self.status_label.config(text="")
+            if self.app_store.history is not None:
+                self.app_store.history.start_seeding()  # off this thread, not in the first edit
+            return
+        
+        loading = [store for store in stores if store.loading]
+        self.load_progress['value'] = sum(store.progress() for store in loading) / len(loading)
+        self.status_label.config(text=f"Loading... {len(self.app_store):,} applications, "
+                                      f"{len(self.contact_store):,} contacts")
+        self.root.after(LOAD_POLL_MS, self.poll_loading)
+    
+    
+    def show_debug_panel(self):
+        """Live p50/p99 timings from the instruments, plus record counts."""
+        panel = tk.Toplevel(self.root)
+        panel.title("Performance")
+        panel.geometry("560x420")
+        
+        controls = ttk.Frame(panel)
+        controls.pack(fill=tk.X, padx=10, pady=(10, 5))
+        state_label = ttk.Label(controls, text="")
+        state_label.pack(side=tk.LEFT)
+        
+        def enable():
+            instruments.enabled = True
+            if self.stall_detector is None:
+                self.stall_detector = StallDetector(self.root)
+            enable_button.pack_forget()
+        
+        enable_button = ttk.Button(controls, text="Start Recording", command=enable)
+        
+        columns = ('count', 'p50', 'p99', 'max')
+        tree = ttk.Treeview(panel, columns=columns, height=10)
+        tree.heading('#0', text="Operation")
+        for column, text in zip(columns, ("Count", "p50 ms", "p99 ms", "Max ms")):
+            tree.heading(column, text=text)
+            tree.column(column, width=80, anchor=tk.E)
+        tree.pack(fill=tk.BOTH, expand=True, padx=10)
+        
+        counts_label = ttk.Label(panel, text="", foreground='gray', justify=tk.LEFT)
+        counts_label.pack(anchor=tk.W, padx=10, pady=(5, 10))
+        
+        def render():
+            if instruments.enabled:
+                state_label.config(text=f"Recording - stalls over the threshold: {len(instruments.stalls)}")
+            else:
+                state_label.config(text="Off - start with --profile or JOB_TRACKER_PROFILE=1")
+                enable_button.pack(side=tk.RIGHT)
+            tree.delete(*tree.get_children())
+            for name, numbers in instruments.summary().items():
+                tree.insert('', tk.END, text=name, values=(numbers['count'], f"{numbers['p50_ms']:.1f}",
+                                                           f"{numbers['p99_ms']:.1f}", f"{numbers['max_ms']:.1f}"))
+            stores = (('Applications', self.app_store), ('Contacts', self.contact_store))
+            lines = [f"{name}: {len(store):,} records, {store.stats()['queue_depth']} saves pending"
+                     for name, store in stores]
+            lines += [f"Stall {when}: {ms:.0f} ms" + (f" ({slowest[0]})" if slowest else "")
+                      for when, ms, slowest in list(instruments.stalls)[-3:]]
+            counts_label.config(text="\n".join(lines))
+            render.pending = panel.after(DEBUG_PANEL_MS, render)
+        
+        def close():
+            panel.after_cancel(render.pending)
+            panel.destroy()
+        
+        render()
+        panel.protocol("WM_DELETE_WINDOW", close)
+        panel.bind('<Escape>', lambda e: close())
+    
+    
+    def add_new_shortcut(self):
+        current_tab = self.notebook.index(self.notebook.select())
+        if current_tab == 0:  
+            self.show_add_application_modal()
+        else:
+            self.show_add_contact_modal()
+    
+    def build_applications_tab(self):
+        """Build the Job Applications list view."""
+        header = ttk.Frame(self.applications_tab)
+        header.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(header, text="Job Applications", font=('Arial', 16, 'bold')).pack(side=tk.LEFT)
+        
+        add_btn = ttk.Button(header, text="+ Add New (Ctrl+N)", command=self.show_add_application_modal)
+        add_btn.pack(side=tk.RIGHT)
+        
+        ttk.Button(header, text="⚙ Add Status", command=self.add_custom_status).pack(side=tk.RIGHT, padx=(0, 5))
+        ttk.Button(header, text="📊 Stats", command=self.show_stats_window).pack(side=tk.RIGHT, padx=(0, 5))
+        
+        search_bar = ttk.Frame(self.applications_tab)
+        search_bar.pack(fill=tk.X, pady=(0, 5))
+        ttk.Label(search_bar, text="Search:").pack(side=tk.LEFT)
+        self.app_search_var = tk.StringVar()
+        ttk.Entry(search_bar, textvariable=self.app_search_var, width=40).pack(side=tk.LEFT, padx=5)
+        
+        filter_bar = ttk.Frame(self.applications_tab)
+        filter_bar.pack(fill=tk.X, pady=(0, 5))
+        status_button = ttk.Menubutton(filter_bar, text="Status ▾")
+        self.status_filter_menu = tk.Menu(status_button, tearoff=0)
+        status_button['menu'] = self.status_filter_menu
+        status_button.pack(side=tk.LEFT)
+        self.status_filter_vars = {}
+        for status in self.status_options:
+            self.add_status_filter(status)
+        
+        self.date_from_var = tk.StringVar()
+        self.date_to_var = tk.StringVar()
+        self.salary_min_var = tk.StringVar()
+        self.salary_max_var = tk.StringVar()
+        self.company_filter_var = tk.StringVar()
+        ttk.Label(filter_bar, text="Applied from").pack(side=tk.LEFT, padx=(10, 2))
+        ttk.Entry(filter_bar, textvariable=self.date_from_var, width=11).pack(side=tk.LEFT)
+        ttk.Label(filter_bar, text="to").pack(side=tk.LEFT, padx=2)
+        ttk.Entry(filter_bar, textvariable=self.date_to_var, width=11).pack(side=tk.LEFT)
+        ttk.Label(filter_bar, text="Salary").pack(side=tk.LEFT, padx=(10, 2))
+        ttk.Entry(filter_bar, textvariable=self.salary_min_var, width=9).pack(side=tk.LEFT)
+        ttk.Label(filter_bar, text="-").pack(side=tk.LEFT, padx=2)
+        ttk.Entry(filter_bar, textvariable=self.salary_max_var, width=9).pack(side=tk.LEFT)
+        ttk.Label(filter_bar, text="Company").pack(side=tk.LEFT, padx=(10, 2))
+        ttk.Entry(filter_bar, textvariable=self.company_filter_var, width=15).pack(side=tk.LEFT)
+        ttk.Button(filter_bar, text="Clear", command=self.clear_application_filters).pack(side=tk.LEFT, padx=(10, 0))
+        
+        columns = ('company', 'role', 'status', 'date_applied', 'salary', 'last_updated')
+        self.app_tree = ttk.Treeview(self.applications_tab, columns=columns, show='headings', height=20)
+        
+        self.app_headings = {'company': 'Company', 'role': 'Role', 'status': 'Status',
+                             'date_applied': 'Date Applied', 'salary': 'Salary Range',
+                             'last_updated': 'Last Updated'}
+        self.app_sort = {'column': None, 'descending': False}
+        for column, text in self.app_headings.items():
+            self.app_tree.heading(column, text=text, command=lambda c=column: self.sort_list(
+                self.app_tree, self.app_headings, self.app_sort, c, self.refresh_applications_list))
+        
+        self.app_tree.column('company', width=150)
+        self.app_tree.column('role', width=150)
+        self.app_tree.column('status', width=100)
+        self.app_tree.column('date_applied', width=100)
+        self.app_tree.column('salary', width=120)
+        self.app_tree.column('last_updated', width=120)
+        
+        scrollbar = ttk.Scrollbar(self.applications_tab, orient=tk.VERTICAL)
+        self.app_view = VirtualTreeview(self.app_tree, scrollbar, application_row)
+        
+        self.app_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.app_tree.bind('<Double-1>', self.show_application_detail)
+        
+        self.app_store.subscribe(self.app_view.record_changed)
+        self.app_store.subscribe(lambda event, record: self.requery(self.app_view, self.app_store, self.refresh_applications_list))
+        self.app_requery = DelayedCall(self.root, SEARCH_DELAY_MS, lambda: self.refresh_applications_list(offset=0))
+        for var in (self.app_search_var, self.date_from_var, self.date_to_var,
+                    self.salary_min_var, self.salary_max_var, self.company_filter_var):
+            var.trace_add('write', lambda *args: self.app_requery.schedule())
+        self.refresh_applications_list()
+    
+    
+    @instrumented('list refresh')
+    def refresh_applications_list(self, offset=None):
+        self.app_view.set_records(self.app_store.query(self.application_filters(),
+                                                       self.sort_field(self.app_sort),
+                                                       self.app_sort['descending'],
+                                                       search=self.app_search_var.get()), offset)
+    
+    
+    def application_filters(self):
+        """Filters from the filter bar; blank or unparseable entries are ignored."""
+        filters = []
+        statuses = [status for status, var in self.status_filter_vars.items() if var.get()]
+        if statuses:
+            filters.append(('status', 'in', statuses))
+        for var, op in ((self.date_from_var, '>='), (self.date_to_var, '<=')):
+            if parse_date(var.get()) is not None:
+                filters.append(('date_applied', op, var.get().strip()))
+        for var, op in ((self.salary_min_var, '>='), (self.salary_max_var, '<=')):
+            salary = parse_salary(var.get())
+            if salary is not None:
+                filters.append(('salary_range', op, salary))
+        if self.company_filter_var.get().strip():
+            filters.append(('company', 'like', self.company_filter_var.get().strip()))
+        return filters
+    
+    
+    def add_status_filter(self, status):
+        var = tk.BooleanVar()
+        var.trace_add('write', lambda *args: self.app_requery.schedule())
+        self.status_filter_vars[status] = var
+        self.status_filter_menu.add_checkbutton(label=status, variable=var)
+    
+    
+    def clear_application_filters(self):
+        for var in self.status_filter_vars.values():
+            var.set(False)
+        for var in (self.date_from_var, self.date_to_var, self.salary_min_var,
+                    self.salary_max_var, self.company_filter_var):
+            var.set("")
+    
+    
+    def sort_list(self, tree, headings, sort, column, refresh):
+        """Heading click: sort by that column, or flip the order if it already is."""
+        if sort['column'] == column:
+            sort['descending'] = not sort['descending']
+        else:
+            sort['column'], sort['descending'] = column, False
+        for name, text in headings.items():
+            arrow = (" ▼" if sort['descending'] else " ▲") if name == column else ""
+            tree.heading(name, text=text + arrow)
+        refresh(offset=0)
+    
+    
+    def sort_field(self, sort):
+        return 'salary_range' if sort['column'] == 'salary' else sort['column']
+    
+    
+    def requery(self, view, store, refresh):
+        """Store listener for searched, filtered or sorted lists.
+        
+        Those show a query result rather than the store itself, so a changed
+        record may need to move, appear or disappear - re-run the query once
+        Tk is idle. Plain lists take the change as a delta instead.
+        """
+        if view.records is not store and refresh not in self.requeries_pending:
+            self.requeries_pending.add(refresh)
+            
+            def run():
+                self.requeries_pending.discard(refresh)
+                refresh()
+            self.root.after_idle(run)
+    
+    
+    def add_custom_status(self):
+        new_status = simpledialog.askstring("Add Custom Status", 
+                                            "Enter a new status option:",
+                                            parent=self.root)
+        if new_status and new_status.strip():
+            new_status = new_status.strip()
+            if new_status not in self.status_options:
+                self.status_options.append(new_status)
+                self.add_status_filter(new_status)
+                messagebox.showinfo("Success", f"Status '{new_status}' added!")
+            else:
+                messagebox.showinfo("Info", f"Status '{new_status}' already exists.")
+    
+    
+    @instrumented('modal open')
+    def show_stats_window(self):
+        """Pipeline numbers, updated live as applications are saved."""
+        if self.pipeline_stats is None:
+            self.pipeline_stats = pipeline_stats(self.app_store)
+        
+        window = tk.Toplevel(self.root)
+        window.title("Pipeline Stats")
+        window.geometry("520x600")
+        window.transient(self.root)
+        
+        ttk.Label(window, text="Pipeline Stats", font=('Arial', 14, 'bold')).pack(pady=(15, 5))
+        totals_label = ttk.Label(window, text="", font=('Arial', 10))
+        totals_label.pack()
+        
+        status_tree = ttk.Treeview(window, columns=('status', 'count', 'days'), show='headings', height=7)
+        status_tree.heading('status', text="Status")
+        status_tree.heading('count', text="Applications")
+        status_tree.heading('days', text="Median Days in Status")
+        status_tree.column('status', width=150)
+        status_tree.column('count', width=100, anchor=tk.E)
+        status_tree.column('days', width=160, anchor=tk.E)
+        status_tree.pack(fill=tk.X, padx=20, pady=10)
+        
+        ttk.Label(window, text="Applications per Week (last 12)", font=('Arial', 10, 'bold')).pack(anchor=tk.W, padx=20)
+        weekly_label = ttk.Label(window, text="", font=('Courier', 9), justify=tk.LEFT)
+        weekly_label.pack(anchor=tk.W, padx=20, pady=(0, 10))
+        ttk.Label(window, text="Salary Distribution", font=('Arial', 10, 'bold')).pack(anchor=tk.W, padx=20)
+        salary_label = ttk.Label(window, text="", font=('Courier', 9), justify=tk.LEFT)
+        salary_label.pack(anchor=tk.W, padx=20)
+        
+        def bars(counts, label):
+            if not counts:
+                return "—"
+            most = max(counts.values())
+            return "\n".join(f"{label(key):<16}{'█' * max(1, round(20 * count / most))} {count}"
+                             for key, count in counts.items())
+        
+        def render():
+            stats = self.pipeline_stats.summary()
+            totals_label.config(text=f"{stats['total']:,} applications · "
+                                     f"{stats['response_rate']:.0%} got a response")
+            status_tree.delete(*status_tree.get_children())
+            statuses = self.status_options + [s for s in stats['status_counts'] if s not in self.status_options]
+            for status in statuses:
+                days = stats['median_days_in_status'].get(status)
+                status_tree.insert('', tk.END, values=(status, stats['status_counts'].get(status, 0),
+                                                       "—" if days is None else f"{days:.1f}"))
+            weeks = dict(list(stats['weekly'].items())[-12:])
+            weekly_label.config(text=bars(weeks, lambda week: week))
+            salary_label.config(text=bars(stats['salary_buckets'],
+                                          lambda low: f"${low // 1000:,.0f}k-{(low + SALARY_BUCKET) // 1000:,.0f}k"))
+        
+        redraw = DelayedCall(window, 250, render)
+        listener = lambda event, record: redraw.schedule()
+        self.app_store.subscribe(listener)
+        
+        def close():
+            self.app_store.unsubscribe(listener)
+            if redraw.pending:
+                window.after_cancel(redraw.pending)
+            window.destroy()
+        
+        ttk.Button(window, text="Close", command=close).pack(pady=15)
+        window.protocol("WM_DELETE_WINDOW", close)
+        window.bind('<Escape>', lambda e: close())
+        render()
+    
+    
+    @instrumented('modal open')
+    def show_add_application_modal(self):
+        modal = tk.Toplevel(self.root)
+        modal.title("Add New Application")
+        modal.geometry("400x500")
+        modal.transient(self.root)
+        modal.grab_set()
+        modal.geometry("+%d+%d" % (self.root.winfo_x() + 250, self.root.winfo_y() + 50))
+        
+        ttk.Label(modal, text="Add New Application", font=('Arial', 14, 'bold')).pack(pady=(20, 5))
+        ttk.Label(modal, text="Track a new job you've applied to", 
+                  font=('Arial', 9), foreground='gray').pack(pady=(0, 15))
+        
+        form_frame = ttk.Frame(modal)
+        form_frame.pack(padx=30, fill=tk.X)
+        
+        ttk.Label(form_frame, text="Company Name *").pack(anchor=tk.W)
+        company_var = tk.StringVar()
+        company_entry = ttk.Entry(form_frame, textvariable=company_var, width=40)
+        company_entry.pack(fill=tk.X, pady=(0, 10))
+        company_entry.focus()  # Start with cursor here
+        
+        ttk.Label(form_frame, text="Job Title *").pack(anchor=tk.W)
+        title_var = tk.StringVar()
+        ttk.Entry(form_frame, textvariable=title_var, width=40).pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(form_frame, text="Salary Range").pack(anchor=tk.W)
+        salary_var = tk.StringVar()
+        ttk.Entry(form_frame, textvariable=salary_var, width=40).pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(form_frame, text="Application Date").pack(anchor=tk.W)
+        date_var = tk.StringVar(value=datetime.now().strftime("%Y-%m-%d"))
+        ttk.Entry(form_frame, textvariable=date_var, width=40).pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(form_frame, text="Status").pack(anchor=tk.W)
+        status_var = tk.StringVar(value="Applied")
+        status_combo = ttk.Combobox(form_frame, textvariable=status_var, width=37, values=self.status_options)
+        status_combo.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(form_frame, text="Notes").pack(anchor=tk.W)
+        notes_text = tk.Text(form_frame, height=3, width=40)
+        notes_text.pack(fill=tk.X, pady=(0, 10))
+        
+        button_frame = ttk.Frame(modal)
+        button_frame.pack(pady=20)
+        
+        def save_application():
+            if self.app_store.loading:
+                messagebox.showinfo("Please Wait", "Still loading your applications - try again in a moment.")
+                return
+            values = {
+                'company': company_var.get(),
+                'role': title_var.get(),
+                'salary_range': salary_var.get(),
+                'date_applied': date_var.get(),
+                'status': status_var.get(),
+                'notes': notes_text.get("1.0", tk.END)
+            }
+            errors = application_errors(values)
+            if errors:
+                messagebox.showerror("Error", errors[0])
+                return
+            
+            self.app_store.add(new_application(self.app_store.allocate_id(), values))
+            
+            full_path = os.path.abspath(APPLICATIONS_FILE)
+            messagebox.showinfo("Success", f"Application saved!\n\nData stored in:\n{full_path}")
+            modal.destroy()
+        
+        def cancel():
+            has_data = (company_var.get().strip() or title_var.get().strip() or 
+                       notes_text.get("1.0", tk.END).strip())
+            if has_data:
+                if messagebox.askyesno("Discard Changes?", 
+                                       "You have unsaved changes. Are you sure you want to close?"):
+                    modal.destroy()
+            else:
+                modal.destroy()
+        
+        ttk.Button(button_frame, text="Save", command=save_application).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Cancel", command=cancel).pack(side=tk.LEFT, padx=5)
+        
+        modal.bind('<Return>', lambda e: save_application())  # Enter to save
+        modal.bind('<Escape>', lambda e: cancel())  # Escape to cancel
+        
+        modal.protocol("WM_DELETE_WINDOW", cancel)
+    
+    
+    def company_links(self):
+        if self.company_index is None:
+            self.company_index = CompanyIndex(self.app_store, self.contact_store)
+        return self.company_index
+    
+    
+    def linked_text(self, records, describe):
+        lines = [describe(record) for record in records[:LINKED_LINES]]
+        if len(records) > LINKED_LINES:
+            lines.append(f"and {len(records) - LINKED_LINES} more")
+        return "\n".join(lines) or "—"
+    
+    
+    @instrumented('modal open')
+    def show_application_detail(self, event=None):
+        selection = self.app_tree.selection()
+        if not selection:
+            return
+        
+        app_id = int(selection[0])
+        app = self.app_store.get(app_id)
+        if not app:
+            return
+        base = {field: app[field] for field in app.keys()}  # as loaded, to detect edits made elsewhere
+        
+        detail = tk.Toplevel(self.root)
+        detail.title(f"Application - {app['company']}")
+        detail.geometry("450x750")
+        detail.transient(self.root)
+        detail.grab_set()
+        detail.geometry("+%d+%d" % (self.root.winfo_x() + 225, self.root.winfo_y() + 25))
+        
+        header = ttk.Frame(detail)
+        header.pack(fill=tk.X, padx=20, pady=(15, 10))
+        ttk.Button(header, text="← Back", command=detail.destroy).pack(side=tk.LEFT)
+        ttk.Label(header, text="Application Details", font=('Arial', 14, 'bold')).pack(side=tk.LEFT, padx=20)
+        
+        form_frame = ttk.Frame(detail)
+        form_frame.pack(padx=30, fill=tk.X, pady=10)
+        
+        ttk.Label(form_frame, text="Company Name *").pack(anchor=tk.W)
+        company_var = tk.StringVar(value=app['company'])
+        ttk.Entry(form_frame, textvariable=company_var, width=45).pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(form_frame, text="Job Title *").pack(anchor=tk.W)
+        title_var = tk.StringVar(value=app['role'])
+        ttk.Entry(form_frame, textvariable=title_var, width=45).pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(form_frame, text="Salary Range").pack(anchor=tk.W)
+        salary_var = tk.StringVar(value=app['salary_range'])
+        ttk.Entry(form_frame, textvariable=salary_var, width=45).pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(form_frame, text="Application Date").pack(anchor=tk.W)
+        date_var = tk.StringVar(value=app['date_applied'])
+        ttk.Entry(form_frame, textvariable=date_var, width=45).pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(form_frame, text="Status").pack(anchor=tk.W)
+        status_var = tk.StringVar(value=app['status'])
+        status_combo = ttk.Combobox(form_frame, textvariable=status_var, width=42, values=self.status_options)
+        status_combo.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(form_frame, text="Notes").pack(anchor=tk.W)
+        notes_text = tk.Text(form_frame, height=4, width=45)
+        notes_text.insert("1.0", app.get('notes', ''))
+        notes_text.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(form_frame, text="Last Updated").pack(anchor=tk.W)
+        ttk.Label(form_frame, text=app['last_updated'], foreground='gray').pack(anchor=tk.W, pady=(0, 10))
+        
+        history = self.app_store.history
+        periods = history.status_periods(app_id) if history is not None else []
+        if periods:
+            now = parse_timestamp(now_stamp())
+            lines = [f"{status or '—'}: {unpack_timestamp(start)[:10]} → "
+                     f"{unpack_timestamp(end)[:10] if end is not None else 'now'} "
+                     f"({((now if end is None else end) - start) // 1440} days)"
+                     for status, start, end in periods[-HISTORY_LINES:]]
+            ttk.Label(form_frame, text="Status History").pack(anchor=tk.W)
+            ttk.Label(form_frame, text="\n".join(lines), foreground='gray').pack(anchor=tk.W, pady=(0, 10))
+        
+        contacts = self.company_links().contacts_for(app)
+        ttk.Label(form_frame, text="Contacts at this Company").pack(anchor=tk.W)
+        ttk.Label(form_frame, text=self.linked_text(contacts, lambda contact: f"{contact['name']} - {contact['relationship']}"),
+                  foreground='gray').pack(anchor=tk.W, pady=(0, 10))
+        
+        def update_application():
+            if self.app_store.loading:
+                messagebox.showinfo("Please Wait", "Still loading your applications - try again in a moment.")
+                return
+            if not company_var.get().strip():
+                messagebox.showerror("Error", "Company Name is required")
+                return
+            if not title_var.get().strip():
+                messagebox.showerror("Error", "Job Title is required")
+                return
+            
+            changes = {
+                'company': company_var.get().strip(),
+                'role': title_var.get().strip(),
+                'salary_range': salary_var.get().strip(),
+                'date_applied': date_var.get().strip(),
+                'status': status_var.get(),
+                'notes': notes_text.get("1.0", tk.END).strip(),
+                'last_updated': now_stamp()
+            }
+            try:
+                self.app_store.update(app['id'], changes, base=base)
+            except UpdateConflict as conflict:
+                if conflict.current is None:
+                    messagebox.showerror("Not Saved", "This application was deleted in another window.")
+                    detail.destroy()
+                    return
+                theirs = "\n".join(f"{field}: {conflict.current.get(field, '')}" for field in conflict.fields)
+                if not messagebox.askyesno("Edit Conflict",
+                                           f"This application was changed in another window while you were editing:\n\n"
+                                           f"{theirs}\n\nSave your version over it?"):
+                    detail.destroy()
+                    return
+                # Only what this form changed (the conflicting fields among it), so
+                # the other window's edits to the rest aren't reverted to `base`.
+                mine = {field: value for field, value in changes.items() if value != base.get(field)}
+                self.app_store.update(app['id'], dict(mine, last_updated=changes['last_updated']))
+            messagebox.showinfo("Success", "Application updated!")
+            detail.destroy()
+        
+        ttk.Button(detail, text="Update", command=update_application).pack(pady=15)
+        
+        detail.bind('<Return>', lambda e: update_application())
+        detail.bind('<Escape>', lambda e: detail.destroy())
+        
+    def build_contacts_tab(self):
+        header = ttk.Frame(self.contacts_tab)
+        header.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(header, text="Networking Contacts", font=('Arial', 16, 'bold')).pack(side=tk.LEFT)
+        ttk.Button(header, text="+ Add New (Ctrl+N)", command=self.show_add_contact_modal).pack(side=tk.RIGHT)
+        
+        search_bar = ttk.Frame(self.contacts_tab)
+        search_bar.pack(fill=tk.X, pady=(0, 5))
+        ttk.Label(search_bar, text="Search:").pack(side=tk.LEFT)
+        self.contact_search_var = tk.StringVar()
+        ttk.Entry(search_bar, textvariable=self.contact_search_var, width=40).pack(side=tk.LEFT, padx=5)
+        
+        columns = ('name', 'company', 'role', 'relationship', 'last_updated')
+        self.contact_tree = ttk.Treeview(self.contacts_tab, columns=columns, show='headings', height=20)
+        
+        self.contact_headings = {'name': 'Name', 'company': 'Company', 'role': 'Role',
+                                 'relationship': 'Relationship', 'last_updated': 'Last Updated'}
+        self.contact_sort = {'column': None, 'descending': False}
+        for column, text in self.contact_headings.items():
+            self.contact_tree.heading(column, text=text, command=lambda c=column: self.sort_list(
+                self.contact_tree, self.contact_headings, self.contact_sort, c, self.refresh_contacts_list))
+        
+        self.contact_tree.column('name', width=150)
+        self.contact_tree.column('company', width=150)
+        self.contact_tree.column('role', width=150)
+        self.contact_tree.column('relationship', width=120)
+        self.contact_tree.column('last_updated', width=120)
+        
+        scrollbar = ttk.Scrollbar(self.contacts_tab, orient=tk.VERTICAL)
+        self.contact_view = VirtualTreeview(self.contact_tree, scrollbar, lambda contact: (
+            contact['name'],
+            contact['company'],
+            contact['role'],
+            contact['relationship'],
+            contact['last_updated']
+        ))
+        
+        self.contact_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.contact_tree.bind('<Double-1>', self.show_contact_detail)
+        self.contact_store.subscribe(self.contact_view.record_changed)
+        self.contact_store.subscribe(lambda event, record: self.requery(self.contact_view, self.contact_store, self.refresh_contacts_list))
+        self.contact_requery = DelayedCall(self.root, SEARCH_DELAY_MS, lambda: self.refresh_contacts_list(offset=0))
+        self.contact_search_var.trace_add('write', lambda *args: self.contact_requery.schedule())
+        self.refresh_contacts_list()
+    
+    
+    @instrumented('list refresh')
+    def refresh_contacts_list(self, offset=None):
+        self.contact_view.set_records(self.contact_store.query(order_by=self.contact_sort['column'],
+                                                               descending=self.contact_sort['descending'],
+                                                               search=self.contact_search_var.get()), offset)
+    
+    
+    @instrumented('modal open')
+    def show_add_contact_modal(self):
+        modal = tk.Toplevel(self.root)
+        modal.title("Add New Contact")
+        modal.geometry("400x450")
+        modal.transient(self.root)
+        modal.grab_set()
+        modal.geometry("+%d+%d" % (self.root.winfo_x() + 250, self.root.winfo_y() + 75))
+        
+        ttk.Label(modal, text="Add New Contact", font=('Arial', 14, 'bold')).pack(pady=(20, 5))
+        ttk.Label(modal, text="Save a networking contact for your job search", 
+                  font=('Arial', 9), foreground='gray').pack(pady=(0, 15))
+        
+        form_frame = ttk.Frame(modal)
+        form_frame.pack(padx=30, fill=tk.X)
+        
+        ttk.Label(form_frame, text="Name *").pack(anchor=tk.W)
+        name_var = tk.StringVar()
+        name_entry = ttk.Entry(form_frame, textvariable=name_var, width=40)
+        name_entry.pack(fill=tk.X, pady=(0, 10))
+        name_entry.focus()
+        
+        ttk.Label(form_frame, text="Company").pack(anchor=tk.W)
+        company_var = tk.StringVar()
+        ttk.Entry(form_frame, textvariable=company_var, width=40).pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(form_frame, text="Job Title").pack(anchor=tk.W)
+        title_var = tk.StringVar()
+        ttk.Entry(form_frame, textvariable=title_var, width=40).pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(form_frame, text="Relationship").pack(anchor=tk.W)
+        relationship_var = tk.StringVar(value="New Connection")
+        relationship_combo = ttk.Combobox(form_frame, textvariable=relationship_var, width=37,
+                                           values=["New Connection", "Had Coffee Chat", "Warm Contact", 
+                                                   "Referral Source", "Close Contact"])
+        relationship_combo.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(form_frame, text="Notes").pack(anchor=tk.W)
+        notes_text = tk.Text(form_frame, height=3, width=40)
+        notes_text.pack(fill=tk.X, pady=(0, 10))
+        
+        button_frame = ttk.Frame(modal)
+        button_frame.pack(pady=20)
+        
+        def save_contact():
+            if self.contact_store.loading:
+                messagebox.showinfo("Please Wait", "Still loading your contacts - try again in a moment.")
+                return
+            values = {
+                'name': name_var.get(),
+                'company': company_var.get(),
+                'role': title_var.get(),
+                'relationship': relationship_var.get(),
+                'notes': notes_text.get("1.0", tk.END)
+            }
+            errors = contact_errors(values)
+            if errors:
+                messagebox.showerror("Error", errors[0])
+                return
+            
+            self.contact_store.add(new_contact(self.contact_store.allocate_id(), values))
+            
+            full_path = os.path.abspath(CONTACTS_FILE)
+            messagebox.showinfo("Success", f"Contact saved!\n\nData stored in:\n{full_path}")
+            modal.destroy()
+        
+        def cancel():
+            has_data = (name_var.get().strip() or company_var.get().strip() or 
+                       notes_text.get("1.0", tk.END).strip())
+            if has_data:
+                if messagebox.askyesno("Discard Changes?", 
+                                       "You have unsaved changes. Are you sure you want to close?"):
+                    modal.destroy()
+            else:
+                modal.destroy()
+        
+        ttk.Button(button_frame, text="Save", command=save_contact).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Cancel", command=cancel).pack(side=tk.LEFT, padx=5)
+        
+        modal.bind('<Return>', lambda e: save_contact())
+        modal.bind('<Escape>', lambda e: cancel())
+        modal.protocol("WM_DELETE_WINDOW", cancel)
+    
+    
+    @instrumented('modal open')
+    def show_contact_detail(self, event=None):
+        selection = self.contact_tree.selection()
+        if not selection:
+            return
+        
+        contact_id = int(selection[0])
+        contact = self.contact_store.get(contact_id)
+        if not contact:
+            return
+        
+        detail = tk.Toplevel(self.root)
+        detail.title(f"Contact - {contact['name']}")
+        detail.geometry("400x550")
+        detail.transient(self.root)
+        detail.grab_set()
+        detail.geometry("+%d+%d" % (self.root.winfo_x() + 250, self.root.winfo_y() + 75))
+        
+        header = ttk.Frame(detail)
+        header.pack(fill=tk.X, padx=20, pady=(15, 10))
+        ttk.Button(header, text="← Back", command=detail.destroy).pack(side=tk.LEFT)
+        ttk.Label(header, text="Contact Details", font=('Arial', 14, 'bold')).pack(side=tk.LEFT, padx=20)
+        
+        form_frame = ttk.Frame(detail)
+        form_frame.pack(padx=30, fill=tk.X, pady=10)
+        
+        ttk.Label(form_frame, text="Name", font=('Arial', 10, 'bold')).pack(anchor=tk.W, pady=(10, 0))
+        ttk.Label(form_frame, text=contact['name']).pack(anchor=tk.W)
+        
+        ttk.Label(form_frame, text="Company", font=('Arial', 10, 'bold')).pack(anchor=tk.W, pady=(10, 0))
+        ttk.Label(form_frame, text=contact['company'] or "—").pack(anchor=tk.W)
+        
+        ttk.Label(form_frame, text="Job Title", font=('Arial', 10, 'bold')).pack(anchor=tk.W, pady=(10, 0))
+        ttk.Label(form_frame, text=contact['role'] or "—").pack(anchor=tk.W)
+        
+        ttk.Label(form_frame, text="Relationship", font=('Arial', 10, 'bold')).pack(anchor=tk.W, pady=(10, 0))
+        ttk.Label(form_frame, text=contact['relationship']).pack(anchor=tk.W)
+        
+        ttk.Label(form_frame, text="Notes", font=('Arial', 10, 'bold')).pack(anchor=tk.W, pady=(10, 0))
+        ttk.Label(form_frame, text=contact.get('notes', '') or "—", wraplength=300).pack(anchor=tk.W)
+        
+        ttk.Label(form_frame, text="Last Updated", font=('Arial', 10, 'bold')).pack(anchor=tk.W, pady=(10, 0))
+        ttk.Label(form_frame, text=contact['last_updated'], foreground='gray').pack(anchor=tk.W)
+        
+        applications = self.company_links().applications_for(contact)
+        ttk.Label(form_frame, text="Applications at this Company", font=('Arial', 10, 'bold')).pack(anchor=tk.W, pady=(10, 0))
+        ttk.Label(form_frame, text=self.linked_text(applications, lambda app: f"{app['role']} - {app['status']}")).pack(anchor=tk.W)
+        
+        ttk.Label(detail, text="(Editing contacts will be available in Sprint 2)", 
+                  foreground='gray', font=('Arial', 9, 'italic')).pack(pady=20)
+        
+        detail.bind('<Escape>', lambda e: detail.destroy())
+
+
+def run(backend=BACKEND):
+    """Open the main window and run until it is closed."""
+    root = tk.Tk()
+    try:
+        app = JobTrackerApp(root, backend=backend)
+    except ValueError as exc:  # e.g. the records are in two snapshot formats
+        root.withdraw()
+        messagebox.showerror("Job Tracker", str(exc))
+        root.destroy()
+        return
+    root.mainloop()